@@ -7,15 +7,40 @@ try:
 except ImportError:
     from pathlib2 import Path
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
 PY2 = sys.version_info[0] == 2
 PY3K = sys.version_info[0] >= 3
 
 if PY2:
     unicode = unicode
     basestring = basestring
+    _intern = intern
 else:
     unicode = str
     basestring = str
+    _intern = sys.intern
+
+
+def intern(string):
+    """
+    Intern a string so that equal strings share the same object.
+
+    Python 2 cannot intern unicode strings,
+    which are returned as is.
+    """
+    if PY2 and not isinstance(string, str):
+        return string
+
+    return _intern(string)
 
 
 def decode(string, encodings=None):
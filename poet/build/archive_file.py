@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import stat
+import time
+
+from .._compat import encode
+
+
+class ArchiveFile(object):
+    """
+    A file to put in the archives, read once
+    and shared by the sdist and the wheel builders.
+    """
+
+    __slots__ = ('path', 'target', 'content', 'mode', 'mtime', '_sha256')
+
+    def __init__(self, path, content, target=None, mode=0o644, mtime=None):
+        """
+        :param path: The path in the source distribution, in posix form
+        :type path: str
+
+        :param content: The content of the file
+        :type content: bytes or str
+
+        :param target: The path in the wheel, if any
+        :type target: str or None
+
+        :param mode: The permission bits
+        :type mode: int
+
+        :param mtime: The modification time, the current time by default
+        :type mtime: float or None
+        """
+        self.path = path
+        self.target = target
+        self.content = encode(content)
+        self.mode = mode
+        self.mtime = time.time() if mtime is None else mtime
+        self._sha256 = None
+
+    @classmethod
+    def read(cls, base_dir, path, target=None):
+        """
+        Read a project file.
+
+        :param base_dir: The project directory
+        :type base_dir: str
+
+        :param path: The path relative to the project, in posix form
+        :type path: str
+
+        :param target: The path in the wheel, if any
+        :type target: str or None
+
+        :rtype: ArchiveFile
+        """
+        filename = os.path.join(base_dir, *path.split('/'))
+
+        with open(filename, 'rb') as f:
+            content = f.read()
+            st = os.fstat(f.fileno())
+
+        return cls(
+            path, content, target=target,
+            mode=stat.S_IMODE(st.st_mode), mtime=st.st_mtime
+        )
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    @property
+    def normalized_mode(self):
+        """
+        The mode reduced to whether the file is executable or not.
+
+        :rtype: int
+        """
+        if self.mode & 0o111:
+            return 0o755
+
+        return 0o644
+
+    @property
+    def sha256(self):
+        """
+        The SHA256 digest of the content.
+
+        :rtype: bytes
+        """
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.content).digest()
+
+        return self._sha256
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import tempfile
+
+from ..locations import CACHE_DIR
+
+
+class BuildCache(object):
+    """
+    Record of the archives built in a directory,
+    with the fingerprint of the inputs they were built from.
+
+    An archive is reused when its fingerprint did not change
+    and the file is still the one which was built.
+    """
+
+    VERSION = 1
+
+    def __init__(self, dest, cache_dir=None):
+        """
+        :param dest: The directory of the archives
+        :type dest: str
+
+        :param cache_dir: Where to persist the record,
+                          the cache directory by default
+        :type cache_dir: str or None
+        """
+        self._dest = os.path.abspath(dest)
+
+        if cache_dir is None:
+            cache_dir = os.path.join(CACHE_DIR, 'build', 'artifacts')
+
+        self._cache_file = os.path.join(
+            cache_dir,
+            hashlib.sha256(self._dest.encode('utf-8')).hexdigest() + '.json'
+        )
+
+        self._artifacts = None
+
+    def get(self, filename, fingerprint):
+        """
+        Return the path of an up to date archive, if any.
+
+        :param filename: The name of the archive
+        :type filename: str
+
+        :param fingerprint: The fingerprint of the inputs of the archive
+        :type fingerprint: str
+
+        :rtype: str or None
+        """
+        entry = self._load().get(filename)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return
+
+        path = os.path.join(self._dest, filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+
+        # The archive might have been replaced or modified since
+        if st.st_size != entry['size'] or st.st_mtime != entry['mtime']:
+            return
+
+        return path
+
+    def set(self, filename, fingerprint):
+        """
+        Record a freshly built archive.
+
+        :type filename: str
+        :type fingerprint: str
+        """
+        st = os.stat(os.path.join(self._dest, filename))
+
+        self._load()[filename] = {
+            'fingerprint': fingerprint,
+            'size': st.st_size,
+            'mtime': st.st_mtime
+        }
+
+    def save(self):
+        directory = os.path.dirname(self._cache_file)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created concurrently
+                pass
+
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(json.dumps({
+                    'version': self.VERSION,
+                    'artifacts': self._load()
+                }))
+
+            getattr(os, 'replace', os.rename)(tmp, self._cache_file)
+        except (IOError, OSError):
+            # The cache is only an optimization
+            pass
+
+    def _load(self):
+        if self._artifacts is None:
+            self._artifacts = {}
+
+            try:
+                with open(self._cache_file) as f:
+                    data = json.loads(f.read())
+            except (IOError, OSError, ValueError):
+                data = {}
+
+            if data.get('version') == self.VERSION:
+                self._artifacts = data['artifacts']
+
+        return self._artifacts
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import glob
 import os
 import re
+import shutil
 import warnings
 
+from multiprocessing.pool import ThreadPool
 from setuptools.dist import Distribution
 from setuptools.extension import Extension
 from pip.commands.wheel import WheelCommand
@@ -12,6 +15,12 @@ from semantic_version import Spec, Version
 
 from .._compat import Path, PY2, encode
 from ..utils.helpers import template
+from .archive_file import ArchiveFile
+from .build_cache import BuildCache
+from .file_index import FileIndex
+from .metadata import Metadata
+from .sdist import SdistBuilder
+from .wheel import WheelBuilder
 
 
 class Builder(object):
@@ -28,6 +37,12 @@ class Builder(object):
         3: ['3.0', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6']
     }
 
+    # Number of files read at the same time
+    READ_JOBS = 4
+
+    # 1980-01-01T00:00:00Z
+    SOURCE_DATE_EPOCH = 315532800
+
     def __init__(self):
         self._manifest = []
 
@@ -37,9 +52,182 @@ class Builder(object):
 
         :param poet: The poet to build.
         :type poet: poet.poet.Poet
+
+        :return: The paths of the built archives
+        :rtype: list
         """
+        self._manifest = []
         setup_kwargs = self._setup(poet, **options)
 
+        dest = options.get('dist_dir') or os.path.join(poet.base_dir, 'dist')
+        dest = os.path.abspath(dest)
+
+        if setup_kwargs['ext_modules']:
+            # Extensions need to be compiled,
+            # which is left to setuptools
+            return self._build_with_setuptools(
+                poet, setup_kwargs, dest, **options
+            )
+
+        compression_level = options.get('compression_level')
+        mtime = self._source_date(options)
+        metadata = Metadata(setup_kwargs)
+
+        generated = [
+            ArchiveFile('setup.py', self._render_setup(setup_kwargs))
+        ]
+        if self._manifest:
+            # Needed by setuptools to install the data files from the sdist
+            generated.append(ArchiveFile('MANIFEST.in', ''.join(self._manifest)))
+
+        if (poet.has_markdown_readme()
+                and setup_kwargs['long_description']
+                and not os.path.exists(os.path.join(poet.base_dir, 'README.rst'))):
+            generated.append(
+                ArchiveFile('README.rst', setup_kwargs['long_description'])
+            )
+
+        paths = set(f.path for f in generated)
+        files = [
+            f for f in self._files(poet, setup_kwargs)
+            if f[0] not in paths
+        ]
+
+        # Files are read once and shared by both archives
+        files = generated + self._read_files(
+            poet.base_dir, files, options.get('jobs') or self.READ_JOBS
+        )
+
+        builders = [
+            SdistBuilder(
+                metadata, files,
+                compression_level=compression_level,
+                mtime=mtime
+            )
+        ]
+
+        if not options.get('no_wheels'):
+            builders.append(WheelBuilder(
+                metadata, files,
+                universal=options.get('universal', True),
+                compression_level=compression_level,
+                mtime=mtime
+            ))
+
+        # Archives whose inputs did not change since they were built are reused
+        cache = BuildCache(dest)
+        fingerprints = [b.fingerprint() for b in builders]
+        artifacts = [
+            None if options.get('force') else cache.get(b.filename, fingerprint)
+            for b, fingerprint in zip(builders, fingerprints)
+        ]
+
+        stale = [i for i, artifact in enumerate(artifacts) if artifact is None]
+        built = self._run([builders[i] for i in stale], dest)
+
+        for i, artifact in zip(stale, built):
+            artifacts[i] = artifact
+            cache.set(builders[i].filename, fingerprints[i])
+
+        if stale:
+            cache.save()
+
+        return artifacts
+
+    def _source_date(self, options):
+        """
+        Returns the modification time of the entries
+        of reproducible archives, None otherwise.
+
+        It is taken from the SOURCE_DATE_EPOCH environment variable,
+        if set, and defaults to the first date zip files support.
+
+        :rtype: int or None
+        """
+        if not options.get('reproducible'):
+            return
+
+        source_date = os.environ.get('SOURCE_DATE_EPOCH')
+        if not source_date:
+            return self.SOURCE_DATE_EPOCH
+
+        try:
+            return int(source_date)
+        except ValueError:
+            raise Exception(
+                'Invalid SOURCE_DATE_EPOCH [{}]'.format(source_date)
+            )
+
+    def _read_files(self, base_dir, files, jobs):
+        """
+        Reads the files to put in the archives.
+
+        :param base_dir: The project directory
+        :type base_dir: str
+
+        :param files: The (project path, wheel path) of the files
+        :type files: list
+
+        :param jobs: The number of files to read at the same time
+        :type jobs: int
+
+        :rtype: list[ArchiveFile]
+        """
+        def read(file):
+            return ArchiveFile.read(base_dir, *file)
+
+        if jobs < 2 or len(files) < 2:
+            return [read(f) for f in files]
+
+        pool = ThreadPool(min(jobs, len(files)))
+        try:
+            return pool.map(read, files)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _run(self, builders, dest):
+        """
+        Writes the archives at the same time,
+        compression being done outside of the GIL.
+
+        :return: The paths of the archives
+        :rtype: list
+        """
+        if len(builders) < 2:
+            return [b.build(dest) for b in builders]
+
+        pool = ThreadPool(len(builders))
+        try:
+            return pool.map(lambda b: b.build(dest), builders)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _build_with_setuptools(self, poet, setup_kwargs, dest, **options):
+        """
+        Builds the archives of a package with extensions.
+
+        Archives are always built again, setuptools
+        not supporting the archive options.
+        """
+        if options.get('reproducible'):
+            raise Exception(
+                'Reproducible archives are not supported '
+                'for packages with extensions'
+            )
+
+        if options.get('compression_level') is not None:
+            raise Exception(
+                'The compression level cannot be set '
+                'for packages with extensions'
+            )
+
+        # A stale egg-info would make setuptools reuse its old file list
+        egg_info = os.path.join(poet.base_dir, '{}.egg-info'.format(poet.name))
+        if os.path.exists(egg_info):
+            shutil.rmtree(egg_info)
+
         setup = os.path.join(poet.base_dir, 'setup.py')
         manifest = os.path.join(poet.base_dir, 'MANIFEST.in')
         self._write_setup(setup_kwargs, setup)
@@ -58,6 +246,7 @@ class Builder(object):
 
         try:
             dist = Distribution(setup_kwargs)
+            dist.get_option_dict('sdist')['dist_dir'] = ('poet', dest)
             dist.run_command('sdist')
         except Exception:
             raise
@@ -68,6 +257,9 @@ class Builder(object):
             if readme:
                 os.unlink(readme)
 
+        sdist = os.path.join(dest, poet.archive)
+        artifacts = [sdist]
+
         # Building wheel if necessary
         if not options.get('no_wheels'):
             command = WheelCommand()
@@ -75,8 +267,8 @@ class Builder(object):
                 '--no-index',
                 '--no-deps',
                 '-q',
-                '--wheel-dir', 'dist',
-                'dist/{}'.format(poet.archive)
+                '--wheel-dir', dest,
+                sdist
             ]
 
             if options.get('universal', True):
@@ -89,6 +281,14 @@ class Builder(object):
             if status != SUCCESS:
                 raise Exception('An error occurred while executing command.')
 
+            metadata = Metadata(setup_kwargs)
+            artifacts += glob.glob(os.path.join(
+                dest,
+                '{}-{}-*.whl'.format(metadata.escaped_name, metadata.escaped_version)
+            ))
+
+        return artifacts
+
     def _setup(self, poet, **options):
         """
         Builds the setup kwargs base on the Poet instance
@@ -306,21 +506,21 @@ class Builder(object):
         packages = []
         modules = []
         package_dirs = {}
-        crawled = []
-        excluded = []
+        crawled = set()
+        excluded = set()
         root = Path(poet.base_dir)
+        index = FileIndex(root)
 
-        for exclude in poet.exclude + poet.ignore:
+        for exclude in poet.exclude:
             if not exclude:
                 continue
 
             if exclude.startswith('/'):
                 exclude = exclude[1:]
 
-            for exc in root.glob(exclude):
+            for exc in index.select(root, exclude)[1]:
                 if exc.suffix == '.py':
-                    exc = exc.relative_to(root)
-                    excluded.append('.'.join(exc.with_suffix('').parts))
+                    excluded.add('.'.join(exc.with_suffix('').parts))
 
         if not isinstance(includes, list):
             includes = [includes]
@@ -333,7 +533,9 @@ class Builder(object):
                     include['include'],
                     include.get('as', ''),
                     excluded=excluded,
-                    crawled=crawled
+                    crawled=crawled,
+                    index=index,
+                    ignore=poet.ignore
                 )
             else:
                 settings = self._find_packages_from(
@@ -341,13 +543,17 @@ class Builder(object):
                     '',
                     include,
                     excluded=excluded,
-                    crawled=crawled
+                    crawled=crawled,
+                    index=index,
+                    ignore=poet.ignore
                 )
 
             packages += settings['packages']
             modules += settings['modules']
             package_dirs.update(settings.get('package_dirs', {}))
 
+        index.save()
+
         packages = [p for p in packages if p not in excluded]
         modules = [m for m in modules if m not in excluded]
 
@@ -366,7 +572,8 @@ class Builder(object):
         return settings
 
     def _find_packages_from(self, root, base_dir, includes,
-                            package_name=None, excluded=None, crawled=None):
+                            package_name=None, excluded=None, crawled=None,
+                            index=None, ignore=None):
         package_dirs = {}
         packages = []
         modules = []
@@ -375,10 +582,13 @@ class Builder(object):
             package_dirs[package_name] = Path(base_dir)
 
         if excluded is None:
-            excluded = []
+            excluded = set()
 
         if crawled is None:
-            crawled = []
+            crawled = set()
+
+        if index is None:
+            index = FileIndex(root)
 
         if not isinstance(includes, list):
             includes = [includes]
@@ -388,15 +598,14 @@ class Builder(object):
 
         base_path = root / base_dir
 
-        for include in includes:
-            dirs = []
-            others = []
+        def ignored(path, is_dir=False):
+            # Ignore rules apply to paths relative to the project
+            return ignore is not None and ignore.ignored(
+                base_dir.parts + path.parts, is_dir
+            )
 
-            for element in base_path.glob(include):
-                if element.is_dir():
-                    dirs.append(element.relative_to(base_path))
-                else:
-                    others.append(element.relative_to(base_path))
+        for include in includes:
+            dirs, others = index.select(base_path, include)
 
             m = re.match('^([^./]+)/\*\*/\*(\..+)?$', include)
             if m:
@@ -405,55 +614,64 @@ class Builder(object):
                 dirs.insert(0, Path(m.group(1)))
 
             for dir in dirs:
-                if dir in crawled:
+                real_dir = base_path / dir
+                if real_dir in crawled or ignored(dir, True):
                     continue
 
                 package = '.'.join(dir.parts)
 
                 # We have a package
-                real_dir = base_path / dir
-                if (real_dir / '__init__.py').exists():
-                    children = [
-                        c.relative_to(base_path) for c in real_dir.glob('*.py')
+                if index.exists(real_dir / '__init__.py'):
+                    _, children = index.select(
+                        real_dir, '*.py', relative_to=base_path
+                    )
+
+                    filtered_children = [
+                        c for c in children
+                        if '.'.join(c.with_suffix('').parts) not in excluded
+                        and not ignored(c)
                     ]
-
-                    filtered_children = [c for c in children if '.'.join(c.parts) not in excluded]
                     if children == filtered_children:
                         # If none of the children are excluded
                         # We have a full package
                         packages.append(package)
                     else:
-                        modules += ['.'.join(c.parts) for c in filtered_children]
+                        modules += [
+                            '.'.join(c.with_suffix('').parts)
+                            for c in filtered_children
+                        ]
 
-                    crawled += [base_path / child for child in children]
+                    crawled.update(base_path / child for child in children)
 
-                crawled.append(real_dir)
+                crawled.add(real_dir)
 
             for element in others:
-                if base_path / element in crawled or element.suffix == '.pyc':
+                if (base_path / element in crawled or element.suffix == '.pyc'
+                        or ignored(element)):
                     continue
 
                 if element.suffix == '.py' and element.name != '__init__.py':
                     modules.append('.'.join(element.with_suffix('').parts))
                 elif element.suffix not in ['.py', '.pyc'] and '__pycache__' not in element.parts:
                     # Non Python file, add them to data
-                    self._manifest.append('include {}\n'.format(element.as_posix()))
+                    self._manifest.append(
+                        'include {}\n'.format((base_dir / element).as_posix())
+                    )
                 elif element.name == '__init__.py':
                     dir = element.parent
                     real_dir = base_path / dir
-                    children = [
-                        c.relative_to(base_path)
-                        for c in real_dir.glob('*.py')
-                        if c.name != '__init__.py'
-                    ]
+                    _, children = index.select(
+                        real_dir, '*.py', relative_to=base_path
+                    )
+                    children = [c for c in children if c.name != '__init__.py']
 
-                    if not children and dir not in crawled:
+                    if not children and real_dir not in crawled:
                         # We actually have a package
                         packages.append('.'.join(dir.parts))
 
-                        crawled.append(base_path / dir)
+                        crawled.add(real_dir)
 
-                crawled.append(base_path / element)
+                crawled.add(base_path / element)
 
         packages = [p for p in packages if p not in excluded]
         modules = [m for m in modules if m not in excluded]
@@ -497,7 +715,87 @@ class Builder(object):
             'ext_modules': extensions
         }
 
-    def _write_setup(self, setup, dest):
+    def _files(self, poet, setup):
+        """
+        Lists the files to put in the archives.
+
+        :param poet: The Poet instance for which to build.
+        :type poet: poet.poet.Poet
+
+        :param setup: The setup kwargs.
+        :type setup: dict
+
+        :return: Sorted (project path, wheel path) tuples,
+                 the wheel path being None for files
+                 which only belong to the source distribution
+        :rtype: list
+        """
+        root = Path(poet.base_dir)
+        index = FileIndex(root)
+        package_dir = setup.get('package_dir', {})
+        package_paths = {}
+        files = {}
+
+        for package in setup['packages']:
+            directory = self._package_path(package, package_dir)
+            package_paths[directory] = package.replace('.', '/')
+
+            for child in index.select(root / directory, '*.py')[1]:
+                files[self._join(directory, child.name)] = '{}/{}'.format(
+                    package_paths[directory], child.name
+                )
+
+        for module in setup['py_modules']:
+            package, _, name = module.rpartition('.')
+            path = self._join(
+                self._package_path(package, package_dir), name + '.py'
+            )
+
+            files[path] = module.replace('.', '/') + '.py'
+
+        for entry in self._manifest:
+            path = entry[len('include '):].strip()
+
+            # Data files are installed with the closest package
+            target = None
+            for directory in sorted(package_paths, key=len, reverse=True):
+                if path.startswith(directory + '/'):
+                    target = package_paths[directory] + path[len(directory):]
+
+                    break
+
+            files[path] = target
+
+        index.save()
+
+        readmes = [poet.readme_file]
+        if poet.has_markdown_readme():
+            readmes.append('README.rst')
+
+        for readme in readmes:
+            if readme not in files and os.path.exists(os.path.join(poet.base_dir, readme)):
+                files[readme] = None
+
+        return sorted(files.items())
+
+    def _package_path(self, package, package_dir):
+        """
+        Returns the directory of a package, relative to the project,
+        following the package_dir mapping like setuptools does.
+        """
+        parts = package.split('.') if package else []
+
+        for i in range(len(parts), -1, -1):
+            prefix = '.'.join(parts[:i])
+            if prefix in package_dir:
+                return self._join(package_dir[prefix], *parts[i:])
+
+        return '/'.join(parts)
+
+    def _join(self, *parts):
+        return '/'.join(p for p in parts if p not in ('', '.'))
+
+    def _render_setup(self, setup):
         parameters = setup.copy()
 
         for key in parameters.keys():
@@ -507,8 +805,12 @@ class Builder(object):
                 parameters[key] = repr(value)
 
         setup_template = template('setup.py')
+
+        return setup_template.render(**parameters)
+
+    def _write_setup(self, setup, dest):
         with open(dest, 'w') as f:
-            f.write(setup_template.render(**parameters))
+            f.write(self._render_setup(setup))
 
     def _write_manifest(self, manifest):
         with open(manifest, 'w') as f:
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from .._compat import Path
+from ..locations import CACHE_DIR
+
+
+class FileIndex(object):
+    """
+    Index of the files and directories of a project.
+
+    Each directory is listed at most once, whatever the number
+    of patterns looked up, and the listings are persisted with
+    the modification time of their directory so that the next
+    build only lists again the directories which changed.
+
+    Patterns follow the semantics of Path.glob().
+    """
+
+    VERSION = 1
+
+    # Version control directories are never part of a package
+    SKIPPED_DIRECTORIES = frozenset(['.git', '.hg', '.svn', '.bzr'])
+
+    # Directories modified this recently are not persisted
+    # since a change within the same mtime tick would go unnoticed
+    RACY_DELAY = 2
+
+    def __init__(self, root, cache_dir=None):
+        """
+        :param root: The project directory
+        :type root: str or Path
+
+        :param cache_dir: Where to persist listings,
+                          the cache directory by default
+        :type cache_dir: str or None
+        """
+        self._root = Path(os.path.abspath(str(root)))
+        self._root_prefix = os.path.join(str(self._root), '')
+
+        if cache_dir is None:
+            cache_dir = os.path.join(CACHE_DIR, 'build', 'index')
+
+        self._cache_file = os.path.join(
+            cache_dir,
+            hashlib.sha256(
+                str(self._root).encode('utf-8')
+            ).hexdigest() + '.json'
+        )
+
+        # Listings of the current build, keyed by relative path:
+        # (mtime, files, directories)
+        self._listings = {}
+        self._persisted = None
+        self._patterns = {}
+
+    @property
+    def root(self):
+        return self._root
+
+    def glob(self, base, pattern):
+        """
+        Return the paths under base matching a pattern, sorted.
+
+        :param base: The directory the pattern is relative to
+        :type base: Path
+
+        :type pattern: str
+
+        :rtype: list[Path]
+        """
+        directories, files = self.select(base, pattern, relative_to=self._root)
+
+        return [self._root / p for p in sorted(directories + files)]
+
+    def select(self, base, pattern, relative_to=None):
+        """
+        Return the directories and the files under base
+        matching a pattern, sorted.
+
+        :param base: The directory the pattern is relative to
+        :type base: Path
+
+        :type pattern: str
+
+        :param relative_to: The directory returned paths are relative to,
+                            base by default
+        :type relative_to: Path or None
+
+        :rtype: tuple
+        """
+        base = self._relative(base)
+        if relative_to is None:
+            start = len(base)
+        else:
+            start = len(self._relative(relative_to))
+
+        segments = [s for s in pattern.split('/') if s not in ('', '.')]
+        if not segments:
+            return [], []
+
+        found = set()
+        self._select(base, segments, found)
+
+        directories = []
+        files = []
+        for path in sorted(found):
+            relative = Path(os.path.join(*path[start:])) if len(path) > start else Path('.')
+            if self._is_dir(path):
+                directories.append(relative)
+            else:
+                files.append(relative)
+
+        return directories, files
+
+    def is_dir(self, path):
+        return self._is_dir(self._relative(path))
+
+    def exists(self, path):
+        relative = self._relative(path)
+        if not relative:
+            return True
+
+        listing = self._listing(relative[:-1])
+
+        return listing is not None and (
+            relative[-1] in listing[1] or relative[-1] in listing[2]
+        )
+
+    def save(self):
+        """
+        Persist the directory listings for the next build.
+        """
+        limit = time.time() - self.RACY_DELAY
+        listings = dict(
+            ('/'.join(directory), list(listing))
+            for directory, listing in self._listings.items()
+            if listing is not None and listing[0] < limit
+        )
+
+        directory = os.path.dirname(self._cache_file)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created concurrently
+                pass
+
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(json.dumps({'version': self.VERSION, 'dirs': listings}))
+
+            getattr(os, 'replace', os.rename)(tmp, self._cache_file)
+        except (IOError, OSError):
+            # The index is only an optimization
+            pass
+
+    def _is_dir(self, relative):
+        if not relative:
+            return True
+
+        listing = self._listing(relative[:-1])
+
+        return listing is not None and relative[-1] in listing[2]
+
+    def _select(self, directory, segments, found):
+        segment, rest = segments[0], segments[1:]
+        listing = self._listing(directory)
+        if listing is None:
+            return
+
+        if segment == '**':
+            # The directory itself and all its subdirectories
+            for subdirectory in self._walk(directory):
+                if rest:
+                    self._select(subdirectory, rest, found)
+                else:
+                    found.add(subdirectory)
+
+            return
+
+        _, files, directories = listing
+
+        if not self._has_magic(segment):
+            names = [segment] if segment in files or segment in directories else []
+        else:
+            regex = self._compile(segment)
+            names = [
+                name for name in files + directories
+                if regex.match(name)
+            ]
+
+        for name in names:
+            path = directory + (name,)
+
+            if not rest:
+                found.add(path)
+            elif name in directories:
+                self._select(path, rest, found)
+
+    def _walk(self, directory):
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            listing = self._listing(current)
+            if listing is None:
+                continue
+
+            yield current
+
+            for name in reversed(listing[2]):
+                if os.path.islink(os.path.join(str(self._root), *(current + (name,)))):
+                    # Like Path.glob(), symbolic links
+                    # are not followed to avoid cycles
+                    continue
+
+                stack.append(current + (name,))
+
+    def _listing(self, directory):
+        """
+        Return the (mtime, files, directories) listing of a directory,
+        reusing the persisted one when the directory did not change.
+        """
+        if directory in self._listings:
+            return self._listings[directory]
+
+        path = os.path.join(str(self._root), *directory)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._listings[directory] = None
+
+            return
+
+        listing = self._load().get('/'.join(directory))
+        if listing is None or listing[0] != mtime:
+            files = []
+            directories = []
+
+            try:
+                names = sorted(os.listdir(path))
+            except OSError:
+                names = []
+
+            for name in names:
+                if os.path.isdir(os.path.join(path, name)):
+                    if name not in self.SKIPPED_DIRECTORIES:
+                        directories.append(name)
+                else:
+                    files.append(name)
+
+            listing = (mtime, files, directories)
+        else:
+            listing = tuple(listing)
+
+        self._listings[directory] = listing
+
+        return listing
+
+    def _load(self):
+        if self._persisted is None:
+            self._persisted = {}
+
+            try:
+                with open(self._cache_file) as f:
+                    data = json.loads(f.read())
+            except (IOError, OSError, ValueError):
+                data = {}
+
+            if data.get('version') == self.VERSION:
+                self._persisted = data['dirs']
+
+        return self._persisted
+
+    def _relative(self, path):
+        path = str(path)
+        if not path.startswith(self._root_prefix) or '..' in path:
+            path = os.path.abspath(str(self._root / path))
+            if path == str(self._root):
+                return ()
+
+            if not path.startswith(self._root_prefix):
+                raise ValueError(
+                    '[{}] is not in the project directory'.format(path)
+                )
+
+        return tuple(path[len(self._root_prefix):].split(os.sep))
+
+    def _has_magic(self, segment):
+        return any(c in segment for c in '*?[')
+
+    def _compile(self, segment):
+        if segment not in self._patterns:
+            self._patterns[segment] = re.compile(fnmatch.translate(segment))
+
+        return self._patterns[segment]
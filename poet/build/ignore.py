@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+from .._compat import Path
+
+
+class IgnoreRule(object):
+    """
+    A compiled .gitignore pattern.
+    """
+
+    __slots__ = ('pattern', 'negated', 'directory_only', 'regex')
+
+    def __init__(self, pattern, base=''):
+        """
+        :param pattern: The pattern, as written in the ignore file
+        :type pattern: str
+
+        :param base: The directory of the ignore file,
+                     relative to the project, in posix form
+        :type base: str
+        """
+        self.pattern = pattern
+        self.negated = False
+        self.directory_only = False
+
+        if pattern.startswith('!'):
+            self.negated = True
+            pattern = pattern[1:]
+
+        if pattern.endswith('/'):
+            self.directory_only = True
+            pattern = pattern.rstrip('/')
+
+        # A slash anywhere but at the end anchors the pattern
+        # to the directory of the ignore file
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+
+        prefix = re.escape(base + '/') if base else ''
+        if not anchored:
+            prefix += '(?:.*/)?'
+
+        self.regex = prefix + self._translate(pattern)
+
+    @classmethod
+    def parse(cls, line, base=''):
+        """
+        Parse a line of an ignore file.
+
+        :rtype: IgnoreRule or None
+        """
+        line = line.rstrip('\n\r')
+
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+
+        line = stripped
+        if not line or line.startswith('#'):
+            return
+
+        # Escaped "#" and "!" are handled as any escaped character
+        if line in ('!', '/'):
+            return
+
+        return cls(line, base)
+
+    def _translate(self, pattern):
+        regex = ''
+        i, n = 0, len(pattern)
+
+        while i < n:
+            c = pattern[i]
+
+            if pattern.startswith('**/', i) and (i == 0 or pattern[i - 1] == '/'):
+                # Leading or middle "**/": zero or more directories
+                regex += '(?:.*/)?'
+                i += 3
+            elif pattern.startswith('**', i) and i + 2 == n and i > 0 and pattern[i - 1] == '/':
+                # Trailing "/**": everything inside
+                regex += '.*'
+                i += 2
+            elif c == '*':
+                regex += '[^/]*'
+                while i < n and pattern[i] == '*':
+                    i += 1
+            elif c == '?':
+                regex += '[^/]'
+                i += 1
+            elif c == '[':
+                j = i + 1
+                if j < n and pattern[j] in '!^':
+                    j += 1
+
+                if j < n and pattern[j] == ']':
+                    j += 1
+
+                while j < n and pattern[j] != ']':
+                    j += 1
+
+                if j >= n:
+                    regex += '\\['
+                    i += 1
+                else:
+                    content = pattern[i + 1:j].replace('\\', '\\\\')
+                    if content[0] in '!^':
+                        content = '^' + content[1:]
+
+                    regex += '[{}]'.format(content)
+                    i = j + 1
+            elif c == '\\' and i + 1 < n:
+                regex += re.escape(pattern[i + 1])
+                i += 2
+            else:
+                regex += re.escape(c)
+                i += 1
+
+        return regex
+
+
+class IgnoreMatcher(object):
+    """
+    Decide which paths of a project are ignored by its .gitignore files,
+    including nested ones and .git/info/exclude.
+
+    The rules are combined into a few regular expressions,
+    the last matching rule winning like in git, and nested ignore files
+    are loaded the first time a path under their directory is checked.
+    Each directory is only evaluated once and everything
+    inside an ignored directory is ignored.
+    """
+
+    IGNORE_FILE = '.gitignore'
+
+    # Python 2 does not support more than 100 named groups
+    GROUP_SIZE = 90
+
+    def __init__(self, root):
+        """
+        :param root: The project directory
+        :type root: str or Path
+        """
+        self._root = str(root)
+        self._rules = []
+        self._compiled = None
+        self._loaded = set()
+        self._directories = {(): False}
+
+        # Rules of ignore files take precedence over the excluded ones
+        self._load(os.path.join(self._root, '.git', 'info', 'exclude'), '')
+        self._load(os.path.join(self._root, self.IGNORE_FILE), '')
+
+    @property
+    def rules(self):
+        return list(self._rules)
+
+    def ignored(self, path, is_dir=False):
+        """
+        Check whether a path is ignored.
+
+        :param path: The path, relative to the project, or its parts
+        :type path: str or Path or tuple
+
+        :param is_dir: Whether the path is a directory
+        :type is_dir: bool
+
+        :rtype: bool
+        """
+        if isinstance(path, tuple):
+            parts = path
+        else:
+            parts = Path(path).parts
+
+        if not parts:
+            return False
+
+        if is_dir:
+            return self._directory_ignored(tuple(parts))
+
+        if self._directory_ignored(tuple(parts[:-1])):
+            return True
+
+        return self._match('/'.join(parts), False)
+
+    def _directory_ignored(self, parts):
+        if parts in self._directories:
+            return self._directories[parts]
+
+        ignored = self._directory_ignored(parts[:-1])
+        if not ignored:
+            ignored = self._match('/'.join(parts), True)
+
+        if not ignored:
+            # Only the ignore files of directories which
+            # are not ignored themselves are taken into account
+            self._load(
+                os.path.join(self._root, *(parts + (self.IGNORE_FILE,))),
+                '/'.join(parts)
+            )
+
+        self._directories[parts] = ignored
+
+        return ignored
+
+    def _match(self, path, is_dir):
+        if self._compiled is None:
+            self._compiled = (self._compile(True), self._compile(False))
+
+        for regex, rules in self._compiled[0 if is_dir else 1]:
+            m = regex.match(path)
+            if m:
+                return not rules[int(m.lastgroup[1:])].negated
+
+        return False
+
+    def _compile(self, is_dir):
+        """
+        Combine the rules applying to directories or files
+        into groups of alternations, the last rules first.
+        """
+        rules = [
+            r for r in reversed(self._rules)
+            if is_dir or not r.directory_only
+        ]
+
+        compiled = []
+        for i in range(0, len(rules), self.GROUP_SIZE):
+            group = rules[i:i + self.GROUP_SIZE]
+            regex = '|'.join(
+                '(?P<r{}>{})'.format(j, rule.regex)
+                for j, rule in enumerate(group)
+            )
+
+            compiled.append((re.compile('(?:{})\\Z'.format(regex)), group))
+
+        return compiled
+
+    def _load(self, path, base):
+        if path in self._loaded:
+            return
+
+        self._loaded.add(path)
+
+        try:
+            with open(path) as f:
+                lines = f.readlines()
+        except (IOError, OSError):
+            return
+
+        rules = []
+        for line in lines:
+            rule = IgnoreRule.parse(line, base)
+            if rule is not None:
+                rules.append(rule)
+
+        if rules:
+            self._rules += rules
+            self._compiled = None
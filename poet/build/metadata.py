@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+from .._compat import PY2, decode
+
+
+class Metadata(object):
+    """
+    Core metadata of a distribution,
+    built from the setup() keyword arguments.
+    """
+
+    VERSION = '2.1'
+
+    def __init__(self, setup):
+        """
+        :param setup: The setup() keyword arguments
+        :type setup: dict
+        """
+        self._setup = setup
+
+    @property
+    def name(self):
+        return self._setup['name']
+
+    @property
+    def version(self):
+        return self._setup['version']
+
+    @property
+    def escaped_name(self):
+        """
+        The name as used in wheel and dist-info names.
+        """
+        return re.sub('[^\w\d.]+', '_', self.name, flags=re.UNICODE)
+
+    @property
+    def escaped_version(self):
+        return re.sub('[^\w\d.]+', '_', self.version, flags=re.UNICODE)
+
+    def render(self):
+        """
+        Render the metadata in the PKG-INFO and METADATA format.
+
+        :rtype: str
+        """
+        setup = self._setup
+        fields = [
+            ('Metadata-Version', self.VERSION),
+            ('Name', self.name),
+            ('Version', self.version),
+            ('Summary', setup.get('description')),
+            ('Home-page', setup.get('url')),
+            ('Author', setup.get('author')),
+            ('Author-email', setup.get('author_email')),
+            ('License', setup.get('license')),
+            ('Keywords', setup.get('keywords')),
+        ]
+
+        for classifier in setup.get('classifiers') or []:
+            fields.append(('Classifier', classifier))
+
+        for requirement in setup.get('install_requires') or []:
+            fields.append(('Requires-Dist', requirement))
+
+        for extra in sorted(setup.get('extras_require') or {}):
+            fields.append(('Provides-Extra', extra))
+
+            for requirement in setup['extras_require'][extra]:
+                fields.append(
+                    ('Requires-Dist', '{}; extra == "{}"'.format(requirement, extra))
+                )
+
+        description = setup.get('long_description')
+        if description:
+            # README files are given to setup() as reStructuredText
+            fields.append(('Description-Content-Type', 'text/x-rst'))
+
+        lines = [
+            u'{}: {}'.format(key, self._text(value))
+            for key, value in fields
+            if value
+        ]
+
+        content = u'\n'.join(lines) + u'\n'
+        if description:
+            content += u'\n' + self._text(description)
+
+        return content
+
+    def entry_points(self):
+        """
+        Render the entry points in the entry_points.txt format.
+
+        :rtype: str
+        """
+        sections = []
+        entry_points = self._setup.get('entry_points') or {}
+        for category in sorted(entry_points):
+            if not entry_points[category]:
+                continue
+
+            sections.append(
+                u'[{}]\n{}\n'.format(category, u'\n'.join(entry_points[category]))
+            )
+
+        return u'\n'.join(sections)
+
+    def _text(self, value):
+        if PY2 and isinstance(value, str):
+            return decode(value)
+
+        return value
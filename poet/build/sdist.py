@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import binascii
+import gzip
+import hashlib
+import io
+import os
+import tarfile
+import uuid
+
+from .._compat import encode
+from .archive_file import ArchiveFile
+
+
+class SdistBuilder(object):
+    """
+    Write the source distribution of a package
+    without going through setuptools.
+    """
+
+    DEFAULT_COMPRESSION_LEVEL = 9
+
+    def __init__(self, metadata, files, compression_level=None, mtime=None):
+        """
+        :param metadata: The metadata of the package
+        :type metadata: poet.build.metadata.Metadata
+
+        :param files: The files to include
+        :type files: list[poet.build.archive_file.ArchiveFile]
+
+        :param compression_level: The gzip compression level, from 0 to 9
+        :type compression_level: int or None
+
+        :param mtime: The modification time of all the entries,
+                      to make the archive reproducible
+        :type mtime: int or None
+        """
+        if compression_level is None:
+            compression_level = self.DEFAULT_COMPRESSION_LEVEL
+
+        self._metadata = metadata
+        self._files = files
+        self._compression_level = compression_level
+        self._mtime = mtime
+
+    @property
+    def base_name(self):
+        return '{}-{}'.format(self._metadata.name, self._metadata.version)
+
+    @property
+    def filename(self):
+        return '{}.tar.gz'.format(self.base_name)
+
+    def fingerprint(self):
+        """
+        Return a hash of everything the archive is built from.
+
+        :rtype: str
+        """
+        from .. import __version__
+
+        fingerprint = hashlib.sha256()
+        parts = [
+            __version__, self.filename, self._metadata.render(),
+            repr(self._compression_level), repr(self._mtime)
+        ]
+        parts += [
+            '{}:{:o}:{}'.format(
+                f.path, f.mode, binascii.hexlify(f.sha256).decode('ascii')
+            )
+            for f in self._files
+        ]
+
+        for part in parts:
+            fingerprint.update(encode(part) + b'\0')
+
+        return fingerprint.hexdigest()
+
+    def build(self, dest):
+        """
+        Write the archive in the dest directory.
+
+        :type dest: str
+
+        :return: The path of the archive
+        :rtype: str
+        """
+        if not os.path.exists(dest):
+            try:
+                os.makedirs(dest)
+            except OSError:
+                # Created concurrently by the other archive builder
+                if not os.path.isdir(dest):
+                    raise
+
+        path = os.path.join(dest, self.filename)
+
+        # The archive is written aside and moved
+        # so that a failed build does not leave a partial one.
+        # It is created with open() to get the permissions
+        # allowed by the umask, mkstemp() would restrict them to the owner
+        tmp = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+        try:
+            with open(tmp, 'wb') as f:
+                # The gzip header would otherwise hold
+                # the current time and the name of the temporary file
+                with gzip.GzipFile(filename='', mode='wb', fileobj=f,
+                                   compresslevel=self._compression_level,
+                                   mtime=self._mtime) as gz:
+                    with tarfile.open(fileobj=gz, mode='w',
+                                      format=tarfile.PAX_FORMAT) as tar:
+                        self._write(tar)
+
+            getattr(os, 'replace', os.rename)(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+            raise
+
+        return path
+
+    def _write(self, tar):
+        files = [ArchiveFile('PKG-INFO', self._metadata.render())] + self._files
+
+        for file in sorted(files, key=lambda f: f.path):
+            # Ownership is left empty
+            info = tarfile.TarInfo('{}/{}'.format(self.base_name, file.path))
+            info.size = file.size
+
+            if self._mtime is None:
+                info.mtime = file.mtime
+                info.mode = file.mode
+            else:
+                info.mtime = self._mtime
+                info.mode = file.normalized_mode
+
+            tar.addfile(info, io.BytesIO(file.content))
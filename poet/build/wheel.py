@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import os
+import sys
+import time
+import uuid
+import zipfile
+
+from .._compat import encode
+from .archive_file import ArchiveFile
+
+
+class WheelBuilder(object):
+    """
+    Write the pure Python wheel (PEP 427) of a package
+    without going through setuptools and pip.
+    """
+
+    WHEEL_VERSION = '1.0'
+
+    # Compression levels can only be chosen for zip files since Python 3.7
+    SUPPORTS_COMPRESSION_LEVEL = sys.version_info >= (3, 7)
+
+    def __init__(self, metadata, files, universal=True, compression_level=None,
+                 mtime=None):
+        """
+        :param metadata: The metadata of the package
+        :type metadata: poet.build.metadata.Metadata
+
+        :param files: The files to include,
+                      files without a wheel path being skipped
+        :type files: list[poet.build.archive_file.ArchiveFile]
+
+        :param universal: Whether the wheel supports Python 2 and 3
+        :type universal: bool
+
+        :param compression_level: The deflate compression level, from 0 to 9,
+                                  0 storing the files uncompressed
+        :type compression_level: int or None
+
+        :param mtime: The modification time of all the entries,
+                      to make the wheel reproducible
+        :type mtime: int or None
+        """
+        self._metadata = metadata
+        self._files = [f for f in files if f.target]
+        self._universal = universal
+        self._compression_level = compression_level
+        self._mtime = mtime
+
+    @property
+    def tags(self):
+        if self._universal:
+            return ['py2-none-any', 'py3-none-any']
+
+        return ['py{}-none-any'.format(sys.version_info[0])]
+
+    @property
+    def filename(self):
+        if self._universal:
+            tag = 'py2.py3-none-any'
+        else:
+            tag = self.tags[0]
+
+        return '{}-{}-{}.whl'.format(
+            self._metadata.escaped_name, self._metadata.escaped_version, tag
+        )
+
+    @property
+    def dist_info(self):
+        return '{}-{}.dist-info'.format(
+            self._metadata.escaped_name, self._metadata.escaped_version
+        )
+
+    def build(self, dest):
+        """
+        Write the wheel in the dest directory.
+
+        :type dest: str
+
+        :return: The path of the wheel
+        :rtype: str
+        """
+        if not os.path.exists(dest):
+            try:
+                os.makedirs(dest)
+            except OSError:
+                # Created concurrently by the other archive builder
+                if not os.path.isdir(dest):
+                    raise
+
+        path = os.path.join(dest, self.filename)
+
+        # Created with the permissions allowed by the umask,
+        # unlike with mkstemp()
+        tmp = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+        try:
+            with zipfile.ZipFile(tmp, 'w') as wheel:
+                self._write(wheel)
+
+            getattr(os, 'replace', os.rename)(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+            raise
+
+        return path
+
+    def fingerprint(self):
+        """
+        Return a hash of everything the wheel is built from.
+
+        :rtype: str
+        """
+        from .. import __version__
+
+        fingerprint = hashlib.sha256()
+        parts = [
+            __version__, self.filename, self._metadata.render(),
+            self._metadata.entry_points(), repr(self._compression_level),
+            repr(self._mtime)
+        ]
+        parts += [
+            '{}:{:o}:{}'.format(f.target, f.mode, self._hash(f.sha256))
+            for f in self._files
+        ]
+
+        for part in parts:
+            fingerprint.update(encode(part) + b'\0')
+
+        return fingerprint.hexdigest()
+
+    def _write(self, wheel):
+        records = []
+
+        for file in self._files:
+            self._add(wheel, file.target, file)
+            records.append((file.target, self._hash(file.sha256), file.size))
+
+        for name, content in self._dist_info_files():
+            file = ArchiveFile(name, content)
+            target = '{}/{}'.format(self.dist_info, name)
+
+            self._add(wheel, target, file)
+            records.append((target, self._hash(file.sha256), file.size))
+
+        record = '{}/RECORD'.format(self.dist_info)
+        lines = ['{},sha256={},{}'.format(*r) for r in records]
+        lines.append('{},,'.format(record))
+
+        self._add(wheel, record, ArchiveFile('RECORD', '\n'.join(lines) + '\n'))
+
+    def _add(self, wheel, target, file):
+        # Zip files cannot store dates before 1980
+        if self._mtime is None:
+            date_time = time.localtime(max(file.mtime, 315619200))[:6]
+            mode = file.mode
+        else:
+            # Dates are stored without time zone
+            date_time = time.gmtime(max(self._mtime, 315532800))[:6]
+            mode = file.normalized_mode
+
+        info = zipfile.ZipInfo(target, date_time=date_time)
+        info.external_attr = (0o100000 | mode) << 16
+        info.create_system = 3
+
+        options = {'compress_type': zipfile.ZIP_DEFLATED}
+        if self._compression_level == 0:
+            options['compress_type'] = zipfile.ZIP_STORED
+        elif (self._compression_level is not None
+                and self.SUPPORTS_COMPRESSION_LEVEL):
+            options['compresslevel'] = self._compression_level
+
+        wheel.writestr(info, file.content, **options)
+
+    def _dist_info_files(self):
+        from .. import __version__
+
+        wheel = [
+            'Wheel-Version: {}'.format(self.WHEEL_VERSION),
+            'Generator: poet ({})'.format(__version__),
+            'Root-Is-Purelib: true'
+        ]
+        wheel += ['Tag: {}'.format(tag) for tag in self.tags]
+
+        files = [
+            ('METADATA', self._metadata.render()),
+            ('WHEEL', '\n'.join(wheel) + '\n'),
+        ]
+
+        entry_points = self._metadata.entry_points()
+        if entry_points:
+            files.append(('entry_points.txt', entry_points))
+
+        top_level = sorted(set(
+            os.path.splitext(f.target.split('/')[0])[0]
+            for f in self._files
+        ))
+        files.append(('top_level.txt', ''.join(t + '\n' for t in top_level)))
+
+        return files
+
+    def _hash(self, digest):
+        # RECORD hashes are urlsafe base64 without padding
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
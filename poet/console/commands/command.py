@@ -4,15 +4,45 @@ import os
 import sys
 import glob
 import distutils
+import json
 import re
 
 from cleo import Command as BaseCommand
+from packaging.markers import default_environment
 from semantic_version import Version
 
 from ...poet import Poet
 from ...utils.helpers import call
 
 
+# Prints the PEP 508 marker environment of the Python running it,
+# which may not have packaging installed
+MARKER_ENVIRONMENT_SCRIPT = """
+import json, os, platform, sys
+
+def version(info):
+    v = '{0}.{1}.{2}'.format(info[0], info[1], info[2])
+    if info[3] != 'final':
+        v += info[3][0] + str(info[4])
+    return v
+
+implementation = getattr(sys, 'implementation', None)
+print(json.dumps({
+    'implementation_name': implementation.name if implementation else '',
+    'implementation_version': version(implementation.version) if implementation else '0',
+    'os_name': os.name,
+    'platform_machine': platform.machine(),
+    'platform_release': platform.release(),
+    'platform_system': platform.system(),
+    'platform_version': platform.version(),
+    'python_full_version': platform.python_version(),
+    'platform_python_implementation': platform.python_implementation(),
+    'python_version': '.'.join(platform.python_version_tuple()[:2]),
+    'sys_platform': sys.platform
+}))
+"""
+
+
 class Command(BaseCommand):
     
     def __init__(self):
@@ -23,6 +53,8 @@ class Command(BaseCommand):
 
         self._python_version = None
 
+        self._marker_environment = None
+
     @property
     def poet_file(self):
         return os.path.join(os.getcwd(), 'poetry.toml')
@@ -128,3 +160,21 @@ class Command(BaseCommand):
             self._python_version = Version.coerce(m.group(1))
 
         return self._python_version
+
+    @property
+    def marker_environment(self):
+        """
+        Return the PEP 508 marker environment of the target Python,
+        the one of the virtualenv if any.
+
+        :rtype: dict
+        """
+        if self._marker_environment is None:
+            try:
+                output = call([self.python(), '-c', MARKER_ENVIRONMENT_SCRIPT])
+                self._marker_environment = json.loads(output.strip().splitlines()[-1])
+            except Exception:
+                # Falling back to the Python running poet
+                self._marker_environment = default_environment()
+
+        return self._marker_environment
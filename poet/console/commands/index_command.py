@@ -24,10 +24,21 @@ class IndexCommand(Command):
             'The index to use'
         )
 
-    def execute(self, i, o):
-        super(IndexCommand, self).execute(i, o)
+        # Adding --offline option
+        self.add_option(
+            'offline', None,
+            InputOption.VALUE_NONE,
+            'Only use cached index metadata'
+        )
 
+    def execute(self, i, o):
         index = self.option('index')
+        offline = self.option('offline')
+
+        if index or offline:
+            self._repository = PyPiRepository(
+                index or PyPiRepository.DEFAULT_URL,
+                offline=offline
+            )
 
-        if index:
-            self._repository = PyPiRepository(index)
+        return super(IndexCommand, self).execute(i, o)
@@ -194,6 +194,13 @@ in the current directory.
             requires = self._normalize_requirements(requires)
             result = []
 
+            # Looking up all versions at once
+            # rather than one after another
+            self._repository.release_indexes([
+                requirement['name'] for requirement in requires
+                if 'version' not in requirement
+            ])
+
             for requirement in requires:
                 if 'version' not in requirement:
                     # determine the best version automatically
@@ -211,37 +218,9 @@ in the current directory.
         question = self.create_question('Search for a package:')
         package = self.ask(question)
         while package is not None:
-            matches = self._find_packages(package)
-
-            if not matches:
+            if not self._repository.find_projects([package])[package]:
                 self.line('<error>Unable to find package</>')
                 package = False
-            else:
-                exact_match = None
-                choices = []
-
-                for found_package in matches:
-                    choices.append(found_package['name'])
-
-                    # Removing exact match feature for now
-                    # if found_package['name'] == package:
-                    #     exact_match = True
-                    #     break
-
-                if not exact_match:
-                    self.line(
-                        'Found <info>{}</info> packages matching <info>{}</info>'
-                        .format(
-                            len(matches),
-                            package
-                        )
-                    )
-
-                    package = self.choice(
-                        '\nEnter package # to add, or the complete package name if it is not listed',
-                        choices,
-                        attempts=3
-                    )
 
             # no constraint yet, determine the best version automatically
             if package is not False and ' ' not in package:
@@ -286,9 +265,6 @@ in the current directory.
 
         return author
 
-    def _find_packages(self, package):
-        return self._repository.search(package, 1)
-
     def _find_best_version_for_package(self, package):
         selector = VersionSelector(self._repository)
         package = selector.find_best_candidate(package)
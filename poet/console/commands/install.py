@@ -13,6 +13,8 @@ class InstallCommand(IndexCommand):
         { --f|features=* : Features to install. }
         { --no-dev : Do not install dev dependencies. }
         { --no-progress : Do not output download progress. }
+        { --j|jobs=1 : Number of packages to install in parallel. }
+        { --batch : Install all hash-checked packages with a single pip call. }
     """
 
     def handle(self):
@@ -27,7 +29,9 @@ class InstallCommand(IndexCommand):
 
         installer = Installer(
             self, self._repository,
-            with_progress=not self.option('no-progress')
+            with_progress=not self.option('no-progress'),
+            jobs=int(self.option('jobs')),
+            batch=self.option('batch')
         )
 
         installer.install(features=features, dev=dev)
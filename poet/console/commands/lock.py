@@ -10,17 +10,17 @@ class LockCommand(IndexCommand):
     Lock the dependencies specified in <comment>poetry.toml</comment>.
 
     lock
-        {--f|force : Force locking}
+        {--f|force : Resolve all dependencies again}
         { --no-progress : Do not output download progress. }
     """
 
     def handle(self):
-        if self.has_lock() and not self.option('force'):
-            return
-
         installer = Installer(
             self, self._repository,
             with_progress=not self.option('no-progress')
         )
 
-        installer.lock(self.poet)
+        # An existing lock file is updated incrementally,
+        # and recent resolutions reused, unless a full resolution is forced
+        force = self.option('force')
+        installer.lock(incremental=not force, use_cache=not force)
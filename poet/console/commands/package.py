@@ -1,9 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import os
-import shutil
 
-from ..._compat import Path
 from .command import Command
 
 
@@ -15,41 +13,50 @@ class PackageCommand(Command):
         { --no-universal : Do not build a universal package. }
         { --no-wheels : Build only the source package. }
         { --no-progress : Do not output download progress. }
+        { --j|jobs=4 : Number of files to read in parallel. }
+        { --compression-level= : Compression level of the archives, from 0 to 9. }
+        { --force : Rebuild the archives even if they are up to date. }
+        { --reproducible : Build byte for byte reproducible archives. }
     """
 
     def handle(self):
         poet = self.poet
 
-        # Cleaning egg-info
-        egg_info = os.path.join(poet.base_dir, '{}.egg-info'.format(poet.name))
-
-        if os.path.exists(egg_info):
-            shutil.rmtree(egg_info)
-
         self.line('')
 
         if self.option('no-progress'):
             self.line('Building <info>{}</> (<comment>{}</>)'.format(poet.name, poet.version))
 
-            self._build(poet)
+            artifacts = self._build(poet)
         else:
             with self.spin(
                 'Building <info>{}</> (<comment>{}</>)'.format(poet.name, poet.version),
                 'Built <info>{}</> (<comment>{}</>)'.format(poet.name, poet.version)
             ):
-                self._build(poet)
+                artifacts = self._build(poet)
 
         self.line('')
 
-        dist = Path(self.poet_file).parent / 'dist'
-        releases = dist.glob('{}-{}*'.format(self.poet.name, self.poet.normalized_version))
-        for release in releases:
-            self.line('  - Created <info>{}</>'.format(release.name))
+        for artifact in artifacts:
+            self.line('  - Created <info>{}</>'.format(os.path.basename(artifact)))
 
         self.line('')
 
     def _build(self, poet):
-        poet.build(
+        compression_level = self.option('compression-level')
+        if compression_level is not None:
+            compression_level = int(compression_level)
+
+            if not 0 <= compression_level <= 9:
+                raise ValueError(
+                    'Invalid compression level [{}]'.format(compression_level)
+                )
+
+        return poet.build(
             universal=not self.option('no-universal'),
-            no_wheels=self.option('no-wheels')
+            no_wheels=self.option('no-wheels'),
+            jobs=int(self.option('jobs')),
+            compression_level=compression_level,
+            force=self.option('force'),
+            reproducible=self.option('reproducible')
         )
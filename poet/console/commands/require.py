@@ -24,42 +24,21 @@ class RequireCommand(IndexCommand):
 
         requires = []
 
+        # Looking up all packages at once
+        # rather than one after another
+        names = [package.split(' ')[0] for package in packages]
+        found = self._repository.find_projects(names)
+        self._repository.release_indexes([name for name in names if found[name]])
+
         for package in packages:
             constraint = None
 
             if ' ' in package:
                 package, constraint = package.split(' ')
 
-            matches = self._repository.search(package, 1)
-
-            if not matches:
+            if not found[package]:
                 self.line('<error>Unable to find package [{}]</>'.format(package))
                 package = False
-            else:
-                exact_match = None
-                choices = []
-
-                for found_package in matches:
-                    choices.append(found_package['name'])
-
-                    if found_package['name'] == package:
-                        exact_match = True
-                        break
-
-                if not exact_match:
-                    self.line(
-                        'Found <info>{}</info> packages matching <info>{}</info>'
-                        .format(
-                            len(matches),
-                            package
-                        )
-                    )
-
-                    package = self.choice(
-                        '\nEnter package # to add, or the complete package name if it is not listed: ',
-                        choices,
-                        attempts=3
-                    )
 
             # no constraint yet, determine the best version automatically
             if package is not False and ' ' not in package:
@@ -13,6 +13,10 @@ class UpdateCommand(IndexCommand):
         { packages?* : The packages to update }
         { --f|features=* : Features to install }
         { --no-progress : Do not output download progress. }
+        { --batch : Install all hash-checked packages with a single pip call. }
+        { --dry-run : Only output the planned operations. }
+        { --plan= : Write the planned operations to this file when doing a dry run,
+                    apply the ones written in it otherwise. }
     """
 
     def handle(self):
@@ -30,7 +34,13 @@ class UpdateCommand(IndexCommand):
 
         installer = Installer(
             self, self._repository,
-            with_progress=not self.option('no-progress')
+            with_progress=not self.option('no-progress'),
+            batch=self.option('batch')
         )
 
-        installer.update(packages=self.argument('packages'), features=features)
+        installer.update(
+            packages=self.argument('packages'),
+            features=features,
+            dry_run=self.option('dry-run'),
+            plan=self.option('plan')
+        )
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+
+class ResolverError(Exception):
+
+    pass
+
+
+class SolverProblemError(ResolverError):
+
+    def __init__(self, name, criteria, versions, pins=None):
+        self._name = name
+        self._criteria = criteria
+        self._versions = versions
+        self._pins = pins or {}
+
+        super(SolverProblemError, self).__init__(self._explain())
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def criteria(self):
+        return self._criteria
+
+    @property
+    def pinned(self):
+        """
+        Names of the pinned packages involved in the conflict.
+
+        :rtype: list
+        """
+        names = set()
+        if self._name in self._pins:
+            names.add(self._name)
+
+        for criterion in self._criteria:
+            if criterion.parent is not None and criterion.parent[0] in self._pins:
+                names.add(criterion.parent[0])
+
+        return sorted(names)
+
+    def _explain(self):
+        lines = [
+            'Unable to find a version of [{}] '
+            'satisfying every requirement:'.format(self._name)
+        ]
+
+        for criterion in self._criteria:
+            if criterion.parent is None:
+                parent = 'Your project'
+            elif criterion.parent[0] in self._pins:
+                parent = '{} ({}, pinned)'.format(*criterion.parent)
+            else:
+                parent = '{} ({})'.format(*criterion.parent)
+
+            lines.append(
+                '  - {} requires {}{}'.format(
+                    parent, self._name, criterion.specifier or ' (any version)'
+                )
+            )
+
+        if self._name in self._pins:
+            lines.append(
+                '  - {} is pinned to {}'.format(self._name, self._pins[self._name])
+            )
+
+        if self._versions:
+            lines.append(
+                'Available versions: {}'.format(', '.join(self._versions))
+            )
+        else:
+            lines.append('No version of [{}] is available'.format(self._name))
+
+        return '\n'.join(lines)
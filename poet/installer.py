@@ -1,22 +1,33 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
+import json
 import tempfile
 
 import os
-import shutil
 import subprocess
 
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
 from packaging.utils import canonicalize_name
-from pip.download import unpack_url
-from pip.index import Link
-from piptools.resolver import Resolver
+from piptools.resolver import Resolver as PipToolsResolver
 from piptools.repositories import PyPIRepository
 from piptools.scripts.compile import get_pip_command
 from piptools.cache import DependencyCache
+from piptools.exceptions import PipToolsError
 from piptools.utils import is_pinned_requirement, key_from_req
 
+from ._compat import queue
+from .exceptions.resolver import SolverProblemError
 from .locations import CACHE_DIR
 from .package.pip_dependency import PipDependency
+from .repositories import InstalledRepository
+from .resolver import DependencyGraph, ResolutionCache, Resolver
+from .update_plan import UpdatePlan
+from .vcs import GitMirrors
+from .utils import transport
 from .utils.helpers import call, template
 
 
@@ -24,11 +35,20 @@ class Installer(object):
 
     UNSAFE = ['setuptools']
 
-    def __init__(self, command, repository, with_progress=False):
+    def __init__(self, command, repository, with_progress=False, jobs=1,
+                 batch=False, resolution_cache=None):
         self._command = command
         self._poet = command.poet
         self._repository = repository
         self._with_progress = with_progress
+        self._jobs = max(1, jobs)
+        self._batch = batch
+        self._vcs = GitMirrors()
+
+        if resolution_cache is None:
+            resolution_cache = ResolutionCache(getattr(repository, 'cache', None))
+
+        self._resolution_cache = resolution_cache
 
     def install(self, features=None, dev=True):
         """
@@ -82,6 +102,7 @@ class Installer(object):
                 for package in packages:
                     featured_packages.add(canonicalize_name(package))
 
+        selected = []
         for dep in deps:
             name = dep.name
 
@@ -104,7 +125,31 @@ class Installer(object):
                         )
                     continue
 
+            selected.append(dep)
+
+        # Only packages which are not already installed
+        # with the locked version need to be installed
+        actions = self._resolve_update_actions(
+            selected, self._installed_dependencies(), delete=False
+        )
+        pending = [dep for _, _, dep in actions]
+
+        if self._command.output.is_verbose():
+            for dep in selected:
+                if dep not in pending:
+                    self._command.line(
+                        ' - Skipping <info>{}</> (<comment>{}</>) (Already installed)'
+                        .format(dep.name, dep.constraint)
+                    )
 
+        if selected and not pending:
+            self._command.line(' - <info>Dependencies already installed!</info>')
+
+            return
+
+        operations = []
+        for dep in pending:
+            name = dep.name
             cmd = [self._command.pip(), 'install', dep.normalized_name]
 
             if dep.is_vcs_dependency():
@@ -115,6 +160,12 @@ class Installer(object):
             else:
                 constraint = dep.constraint.replace('==', '')
 
+            if self._jobs > 1:
+                # The lock file holds the full dependency tree
+                # and installations are ordered so we do not let
+                # concurrent pip processes install the same package
+                cmd.append('--no-deps')
+
             message = (
                 ' - Installing <info>{}</> (<comment>{}</>)'
                 .format(name, constraint)
@@ -125,9 +176,35 @@ class Installer(object):
             )
             error_message = 'Error while installing [{}]'.format(name)
 
-            self._progress(cmd, message[3:], end_message, message, error_message)
+            operations.append(
+                (dep, cmd, message[3:], end_message, message, error_message)
+            )
+
+        if self._batch:
+            batched = [o[0] for o in operations if self._is_batchable(o[0])]
+            operations = [o for o in operations if not self._is_batchable(o[0])]
+
+            if batched:
+                self._install_batch(batched)
+
+        if self._jobs > 1:
+            return self._execute_parallel(operations)
+
+        for _, cmd, start_message, end_message, message, error_message in operations:
+            self._progress(cmd, start_message, end_message, message, error_message)
+
+    def update(self, packages=None, features=None, dev=True, dry_run=False,
+               plan=None):
+        """
+        Update dependencies.
+
+        :param dry_run: Only plan the update
+        :type dry_run: bool
 
-    def update(self, packages=None, features=None, dev=True):
+        :param plan: Path of the update plan to write, when doing
+                     a dry run, or to apply instead of resolving again
+        :type plan: str or None
+        """
         if self._poet.is_lock():
             raise Exception('Update is only available with a poetry.toml file.')
 
@@ -138,6 +215,90 @@ class Installer(object):
         self._command.line('<info>Updating dependencies</>')
         self._command.line('')
 
+        if plan and not dry_run:
+            update_plan = UpdatePlan.load(plan)
+
+            if update_plan.lock_hash != self._lock_hash():
+                raise Exception(
+                    'The lock file changed since the plan [{}] '
+                    'was made'.format(plan)
+                )
+        else:
+            update_plan = self._plan_update(
+                packages=packages, features=features, dev=dev
+            )
+
+        if not update_plan:
+            self._command.line(' - <info>Dependencies already up-to-date!</info>')
+
+            return
+
+        installs = update_plan.count(UpdatePlan.INSTALL)
+        updates = update_plan.count(UpdatePlan.UPDATE)
+        uninstalls = update_plan.count(UpdatePlan.REMOVE)
+
+        summary = []
+        if updates:
+            summary.append('<comment>{}</> updates'.format(updates))
+
+        if installs:
+            summary.append('<comment>{}</> installations'.format(installs))
+
+        if uninstalls:
+            summary.append('<comment>{}</> uninstallations'.format(uninstalls))
+
+        if len(summary) > 1:
+            summary = ', '.join(summary)
+        else:
+            summary = summary[0]
+
+        self._command.line(' - Summary: {}'.format(summary))
+
+        if dry_run:
+            for action, from_, dep in update_plan:
+                self._command.line(self._update_messages(action, from_, dep)[0])
+
+            if plan:
+                update_plan.dump(plan)
+
+                self._command.line(
+                    ' - Plan written to <comment>{}</>'.format(plan)
+                )
+
+            return
+
+        actions = update_plan.actions
+        if self._batch:
+            actions = self._execute_batch_actions(actions)
+
+        error = False
+        for action, from_, dep in actions:
+            cmd = [self._command.pip()]
+
+            if action == 'remove':
+                cmd += ['uninstall', dep.normalized_name, '-y']
+            elif action == 'update':
+                cmd += ['install', dep.normalized_name, '-U']
+            else:
+                cmd += ['install', dep.normalized_name]
+
+            message, end_message, error_message = self._update_messages(
+                action, from_, dep
+            )
+            start_message = message[3:]
+
+            self._progress(cmd, start_message, end_message, message, error_message)
+
+        if not error:
+            # If everything went well, we write down the lock file
+            self._write_lock(update_plan.packages, update_plan.features)
+
+    def _plan_update(self, packages=None, features=None, dev=True):
+        """
+        Resolve dependencies again and plan the update.
+
+        :rtype: UpdatePlan
+        """
         # Reading current lock
         lock = self._poet.lock
         current_deps = lock.pip_dependencies
@@ -163,90 +324,96 @@ class Installer(object):
                or dep.optional and dep.name in featured_packages
         ]
 
+        delete = not packages and not features
+
         if packages:
-            packages = [p for p in self.resolve(deps) if p['name'] in packages]
+            # Only the given packages and their dependencies
+            # are resolved again, the rest of the lock is kept
+            pins, _ = self._locked_pins(deps, lock, refresh=packages)
+            # Updates look for new releases so a cached resolution,
+            # possibly older than them, cannot be used
+            resolved = self.resolve(deps, pins=pins, use_cache=False)
+            packages = [canonicalize_name(p) for p in packages]
+            updated = [p for p in resolved if canonicalize_name(p['name']) in packages]
         else:
-            packages = self.resolve(deps)
-
-        deps = [PipDependency(p['name'], p['version']) for p in packages]
+            resolved = self.resolve(deps, use_cache=False)
+            updated = resolved
 
-        delete = not packages and not features
-        actions = self._resolve_update_actions(deps, current_deps, delete=delete)
+        deps = [
+            PipDependency(
+                p['name'], p['version'],
+                checksum=p['checksum'],
+                dependencies=p.get('dependencies')
+            )
+            for p in updated
+        ]
 
-        if not actions:
-            self._command.line(' - <info>Dependencies already up-to-date!</info>')
+        locked_features = {}
+        for name, featured_packages in self._poet.features.items():
+            name = canonicalize_name(name)
+            locked_features[name] = [canonicalize_name(p) for p in featured_packages]
 
-            return
+        return UpdatePlan.compute(
+            deps, current_deps, delete=delete,
+            packages=resolved, features=locked_features,
+            lock_hash=self._lock_hash()
+        )
 
-        installs = len([a for a in actions if a[0] == 'install'])
-        updates = len([a for a in actions if a[0] == 'update'])
-        uninstalls = len([a for a in actions if a[0] == 'remove'])
+    def _lock_hash(self):
+        with open(self._poet.lock_file, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
 
-        summary = []
-        if updates:
-            summary.append('<comment>{}</> updates'.format(updates))
+    def _update_messages(self, action, from_, dep):
+        """
+        Return the default, end and error messages of an update action.
 
-        if installs:
-            summary.append('<comment>{}</> installations'.format(installs))
+        :rtype: tuple
+        """
+        description = 'Installing'
+        if action == 'remove':
+            description = 'Removing'
+        elif action == 'update':
+            description = 'Updating'
 
-        if uninstalls:
-            summary.append('<comment>{}</> uninstallations'.format(uninstalls))
+        name = dep.name
 
-        if len(summary) > 1:
-            summary = ', '.join(summary)
+        if dep.is_vcs_dependency():
+            constraint = dep.pretty_constraint
         else:
-            summary = summary[0]
-
-        self._command.line(' - Summary: {}'.format(summary))
-
-        error = False
-        for action, from_, dep in actions:
-            cmd = [self._command.pip()]
-            description = 'Installing'
+            constraint = dep.constraint.replace('==', '')
 
-            if action == 'remove':
-                description = 'Removing'
-                cmd += ['uninstall', dep.normalized_name, '-y']
-            elif action == 'update':
-                description = 'Updating'
-                cmd += ['install', dep.normalized_name, '-U']
-            else:
-                cmd += ['install', dep.normalized_name]
-
-            name = dep.name
+        version = '<comment>{}</>'.format(constraint)
 
-            if dep.is_vcs_dependency():
-                constraint = dep.pretty_constraint
+        if from_:
+            if from_.is_vcs_dependency():
+                constraint = from_.pretty_constraint
             else:
-                constraint = dep.constraint.replace('==', '')
+                constraint = from_.constraint.replace('==', '')
 
-            version = '<comment>{}</>'.format(constraint)
+            version = '<comment>{}</> -> '.format(constraint) + version
 
-            if from_:
-                if from_.is_vcs_dependency():
-                    constraint = from_.pretty_constraint
-                else:
-                    constraint = from_.constraint.replace('==', '')
+        message = ' - {} <info>{}</> ({})'.format(description, name, version)
+        end_message = '{} <info>{}</> ({})'.format(description.replace('ing', 'ed'), name, version)
+        error_message = 'Error while {} [{}]'.format(description.lower(), name)
 
-                version = '<comment>{}</> -> '.format(constraint) + version
+        return message, end_message, error_message
 
-            message = ' - {} <info>{}</> ({})'.format(description, name, version)
-            start_message = message[3:]
-            end_message = '{} <info>{}</> ({})'.format(description.replace('ing', 'ed'), name, version)
-            error_message = 'Error while {} [{}]'.format(description.lower(), name)
+    def lock(self, dev=True, incremental=False, use_cache=True):
+        """
+        Lock dependencies defined in the configuration file.
 
-            self._progress(cmd, start_message, end_message, message, error_message)
+        :param dev: Whether to lock dev dependencies or not
+        :type dev: bool
 
-        if not error:
-            # If everything went well, we write down the lock file
-            features = {}
-            for name, featured_packages in self._poet.features.items():
-                name = canonicalize_name(name)
-                features[name] = [canonicalize_name(p) for p in featured_packages]
+        :param incremental: Whether to keep the versions of the existing
+                            lock file which still satisfy their constraints
+        :type incremental: bool
 
-            self._write_lock(packages, features)
+        :param use_cache: Whether to reuse a cached resolution or not
+        :type use_cache: bool
 
-    def lock(self, dev=True):
+        :rtype: None
+        """
         if self._poet.is_lock():
             return
 
@@ -259,27 +426,194 @@ class Installer(object):
         if dev:
             deps += self._poet.pip_dev_dependencies
 
-        packages = self.resolve(deps)
         features = {}
         for name, featured_packages in self._poet.features.items():
             name = canonicalize_name(name)
             features[name] = [canonicalize_name(p) for p in featured_packages]
 
+        pins = None
+        if incremental and os.path.exists(self._poet.lock_file):
+            lock = self._poet.lock
+            pins, changed = self._locked_pins(deps, lock)
+
+            locked = lock.pip_dependencies + lock.pip_dev_dependencies
+            locked_features = dict(
+                (name, sorted(packages)) for name, packages in lock.features.items()
+            )
+            if (not changed
+                    and len(pins) == len(locked)
+                    and not self._markers_changed(deps, locked)
+                    and locked_features == dict(
+                        (name, sorted(packages)) for name, packages in features.items()
+                    )):
+                self._command.line(' - <info>Dependencies already locked!</info>')
+
+                return
+
+        packages = self.resolve(deps, pins=pins, use_cache=use_cache)
+
         self._write_lock(packages, features)
 
-    def resolve(self, deps):
+    def resolve(self, deps, pins=None, use_cache=True):
+        """
+        Resolve dependencies, reusing the result of
+        a recent resolution of the same dependencies.
+
+        :param use_cache: Whether to reuse a cached resolution or not
+        :type use_cache: bool
+
+        :rtype: list[dict]
+        """
         if not self._with_progress:
             self._command.line(' - <info>Resolving dependencies</>')
 
-            return self._resolve(deps)
+            return self._cached_resolve(deps, pins=pins, use_cache=use_cache)
 
         with self._spin(
             '<info>Resolving dependencies</>',
             '<info>Resolving dependencies</>'
         ):
-            return self._resolve(deps)
+            return self._cached_resolve(deps, pins=pins, use_cache=use_cache)
+
+    def _cached_resolve(self, deps, pins=None, use_cache=True):
+        fingerprint = self._resolution_cache.fingerprint(
+            deps, pins=pins, index_url=getattr(self._repository, 'url', None),
+            environment=self._command.marker_environment
+        )
+
+        if use_cache:
+            packages = self._resolution_cache.get(fingerprint)
+            if packages is not None:
+                return packages
+
+        packages = self._resolve(deps, pins=pins)
+        self._resolution_cache.put(fingerprint, packages)
+
+        return packages
+
+    def _resolve(self, deps, pins=None):
+        """
+        Resolve dependencies.
+
+        :param deps: The dependencies to resolve
+        :type deps: list[poet.package.PipDependency]
+
+        :param pins: Locked dependencies to keep, keyed by name
+        :type pins: dict or None
+
+        :rtype: list[dict]
+        """
+        pins = pins or {}
+
+        if any(dep.is_vcs_dependency() for dep in deps):
+            # The requirements of VCS dependencies
+            # are only known once they are built
+            resolved, reversed_dependencies = self._resolve_with_piptools(
+                deps, pins
+            )
+        else:
+            resolved, reversed_dependencies = self._resolve_natively(
+                deps, pins
+            )
+
+        # Direct dependencies of each package
+        dependencies = {}
+        for child, parents in reversed_dependencies.items():
+            for parent in parents:
+                parent = canonicalize_name(parent)
+                if parent not in dependencies:
+                    dependencies[parent] = set()
+
+                dependencies[parent].add(canonicalize_name(child))
+
+        graph = DependencyGraph(dependencies, deps)
+
+        packages = []
+        for name, version, checksum in resolved:
+            if name in self.UNSAFE:
+                continue
+
+            if not isinstance(checksum, list):
+                checksum = [checksum]
+
+            package = {
+                'name': name,
+                'version': version,
+                'checksum': checksum,
+                'category': graph.category(name),
+                'optional': graph.optional(name),
+                'python': graph.python(name),
+                'dependencies': sorted(
+                    d for d in dependencies.get(canonicalize_name(name), set())
+                    if d not in self.UNSAFE
+                )
+            }
+
+            packages.append(package)
 
-    def _resolve(self, deps):
+        return sorted(packages, key=lambda p: p['name'].lower())
+
+    def _resolve_natively(self, deps, pins):
+        """
+        Resolve dependencies with poet's own resolver.
+
+        :return: The (name, version, checksum) of the resolved packages
+                 and the packages requiring each one
+        :rtype: tuple
+        """
+        # Checking if we should active prereleases
+        prereleases = any(dep.accepts_prereleases() for dep in deps)
+
+        # Markers and Python requirements are evaluated
+        # for the Python the packages will be installed for
+        resolver = Resolver(
+            self._repository, prereleases=prereleases,
+            environment=self._command.marker_environment
+        )
+        pins = dict(pins)
+
+        while True:
+            try:
+                resolution = resolver.resolve(
+                    deps,
+                    constraints=dict(
+                        (name, pin.constraint) for name, pin in pins.items()
+                    )
+                )
+
+                break
+            except SolverProblemError as e:
+                if not pins:
+                    raise
+
+                # Locked versions may not suit changed dependencies
+                # so the conflicting ones, or all of them if the conflict
+                # does not involve them directly, are resolved again
+                for name in e.pinned or list(pins.keys()):
+                    del pins[name]
+
+        resolved = []
+        for name, version in resolution.packages.items():
+            pin = pins.get(name)
+            if pin is not None and pin.checksum and pin.constraint == version:
+                # Hashes of kept pins are already known
+                checksum = pin.checksum
+            else:
+                checksum = self._repository.hashes(name, version)
+
+            resolved.append((name, version, checksum))
+
+        return resolved, resolution.reverse_dependencies()
+
+    def _resolve_with_piptools(self, deps, pins):
+        """
+        Resolve dependencies with pip-tools,
+        which builds VCS dependencies to find their requirements.
+
+        :return: The (name, version, checksum) of the resolved packages
+                 and the packages requiring each one
+        :rtype: tuple
+        """
         # Checking if we should active prereleases
         prereleases = False
         for dep in deps:
@@ -287,17 +621,38 @@ class Installer(object):
                 prereleases = True
                 break
 
-        constraints = [dep.as_requirement() for dep in deps]
+        constraints = []
+        for dep in deps:
+            if dep.name in pins:
+                constraints.append(self._pin_requirement(pins[dep.name]))
+            else:
+                constraints.append(dep.as_requirement())
+
+        names = set(dep.name for dep in deps)
+        for name in sorted(pins.keys()):
+            if name not in names:
+                constraints.append(self._pin_requirement(pins[name]))
 
         command = get_pip_command()
-        opts, _ = command.parse_args([])
+        opts, _ = command.parse_args([
+            '--retries', str(transport.RETRIES),
+            '--timeout', str(transport.TIMEOUT)
+        ])
 
-        resolver = Resolver(
+        resolver = PipToolsResolver(
             constraints, PyPIRepository(opts, command._build_session(opts)),
             cache=DependencyCache(CACHE_DIR),
             prereleases=prereleases
         )
-        matches = resolver.resolve()
+        try:
+            matches = resolver.resolve()
+        except PipToolsError:
+            if not pins:
+                raise
+
+            # Locked versions may not suit changed dependencies
+            return self._resolve_with_piptools(deps, {})
+
         pinned = [m for m in matches if not m.editable and is_pinned_requirement(m)]
         unpinned = [m for m in matches if m.editable or not is_pinned_requirement(m)]
         reversed_dependencies = resolver.reverse_dependencies(matches)
@@ -317,12 +672,22 @@ class Installer(object):
 
                 reversed_dependencies[dep].add(canonicalize_name(name))
 
-        hashes = resolver.resolve_hashes(pinned)
-        packages = []
+        # Hashes of kept pins are already known
+        known_hashes = {}
+        for m in pinned:
+            pin = pins.get(canonicalize_name(key_from_req(m.req)))
+            if (pin is not None and pin.checksum
+                    and str(m.req.specifier).replace('==', '') == pin.constraint):
+                known_hashes[m] = pin.checksum
+
+        hashes = resolver.resolve_hashes(
+            [m for m in pinned if m not in known_hashes]
+        )
+        hashes.update(known_hashes)
+
+        resolved = []
         for m in matches:
             name = key_from_req(m.req)
-            if name in self.UNSAFE:
-                continue
 
             version = str(m.req.specifier)
             if m in unpinned:
@@ -335,79 +700,128 @@ class Installer(object):
                 version = version.replace('==', '')
                 checksum = list(hashes[m])
 
-            # Figuring out category and optionality
-            category = None
-            optional = False
+            resolved.append((name, version, checksum))
 
-            # Checking if it's a main dependency
-            for dep in deps:
-                if dep.name == name:
-                    category = dep.category
-                    optional = dep.optional
-                    break
+        return resolved, reversed_dependencies
 
-            if not category:
-                def _category(child):
-                    opt = False
-                    cat = None
-                    parents = reversed_dependencies.get(child, set())
-                    for parent in parents:
-                        for dep in deps:
-                            if dep.name != parent:
-                                continue
+    def _locked_pins(self, deps, lock, refresh=None):
+        """
+        Determine which locked dependencies can be kept as is.
 
-                            opt = dep.optional
+        A locked dependency is kept if it is only required
+        by dependencies whose constraint is still satisfied
+        by the locked version.
 
-                            if dep.category == 'main':
-                                # Dependency is given by at least one main package
-                                # We flag it as main
-                                return 'main', opt
+        :param deps: The dependencies to lock
+        :type deps: list[poet.package.PipDependency]
 
-                            return 'dev', opt
+        :param lock: The current lock
+        :type lock: poet.lock.Lock
 
-                        cat, op = _category(parent)
+        :param refresh: Names of packages to resolve again anyway
+        :type refresh: list or None
 
-                        if cat is not None:
-                            return cat, opt
+        :return: The pins keyed by name and the names of
+                 the dependencies which changed
+        :rtype: tuple
+        """
+        locked = {}
+        for dep in lock.pip_dependencies + lock.pip_dev_dependencies:
+            locked[dep.name] = dep
 
-                    return cat, opt
+        changed = set(canonicalize_name(name) for name in refresh or [])
+        for dep in deps:
+            current = locked.get(dep.name)
 
-                category, optional = _category(name)
+            if current is None or not self._satisfies(current, dep):
+                changed.add(dep.name)
 
-            # If category is still None at this point
-            # The dependency must have come from a VCS
-            # dependency. To avoid missing packages
-            # we assume "main" category and not optional
-            if category is None:
-                category = 'main'
-                optional = False
+        # Everything required by a changed dependency is resolved again
+        released = self._dependency_closure(changed, locked)
+        kept = self._dependency_closure(
+            [dep.name for dep in deps if dep.name not in changed],
+            locked
+        )
 
-            if not isinstance(checksum, list):
-                checksum = [checksum]
+        pins = {}
+        for name in kept - released:
+            current = locked.get(name)
 
-            # Retrieving Python restriction if any
-            python = self._get_pythons_for_package(
-                name, reversed_dependencies, deps
-            )
-            python = list(python)
+            # VCS dependencies always need to be checked again
+            if current is not None and not current.is_vcs_dependency():
+                pins[name] = current
 
-            if '*' in python:
-                # If at least one parent gave a wildcard
-                # Then it should be installed for any Python version
-                python = ['*']
+        return pins, changed
 
-            package = {
-                'name': name,
-                'version': version,
-                'checksum': checksum,
-                'category': category,
-                'optional': optional,
-                'python': python
-            }
+    def _satisfies(self, locked, dep):
+        """
+        Return whether a locked dependency
+        still satisfies a dependency definition.
 
-            packages.append(package)
+        :type locked: poet.package.PipDependency
+        :type dep: poet.package.PipDependency
 
-        return sorted(packages, key=lambda p: p['name'].lower())
+        :rtype: bool
+        """
+        if dep.is_vcs_dependency() or locked.is_vcs_dependency():
+            return False
+
+        if not dep.normalized_constraint:
+            return True
+
+        try:
+            specifier = SpecifierSet(dep.normalized_constraint)
+        except InvalidSpecifier:
+            return False
+
+        return specifier.contains(locked.constraint, prereleases=True)
+
+    def _markers_changed(self, deps, locked):
+        """
+        Return whether the category, optionality or Python restrictions
+        of a locked package differ from the ones the dependencies give it.
+
+        :type deps: list[poet.package.PipDependency]
+        :type locked: list[poet.package.PipDependency]
+
+        :rtype: bool
+        """
+        graph = DependencyGraph(
+            dict((dep.name, dep.dependencies) for dep in locked), deps
+        )
+
+        for dep in locked:
+            if (dep.category != graph.category(dep.name)
+                    or dep.optional != graph.optional(dep.name)
+                    or sorted(str(p) for p in dep.python) != graph.python(dep.name)):
+                return True
+
+        return False
+
+    def _dependency_closure(self, names, locked):
+        """
+        Return the given packages and the locked packages
+        they depend on, directly or not.
+
+        :rtype: set
+        """
+        closure = set()
+        stack = list(names)
+
+        while stack:
+            name = stack.pop()
+            if name in closure:
+                continue
+
+            closure.add(name)
+
+            if name in locked:
+                stack.extend(locked[name].dependencies)
+
+        return closure
+
+    def _pin_requirement(self, pin):
+        return PipDependency(pin.name, pin.constraint).as_requirement()
 
     def _resolve_update_actions(self, deps, current_deps, delete=True):
         """
@@ -425,82 +839,37 @@ class Installer(object):
         :return: List of actions to execute
         :type: list[tuple]
         """
-        actions = []
-        for dep in deps:
-            action = None
-            from_ = None
-            found = False
-
-            for current_dep in current_deps:
-                name = dep.name
-                current_name = current_dep.name
-                version = dep.normalized_constraint
-                current_version = current_dep.normalized_constraint
-
-                if name == current_name:
-                    # Existing dependency
-                    found = True
-
-                    if version == current_version:
-                        break
-
-                    # If version is different we mark it
-                    # as to be updated
-                    action = 'update'
-                    from_ = current_dep
-                    break
-
-            if not found:
-                # New dependency. We mark it as to be installed.
-                action = 'install'
-
-            if action:
-                actions.append((action, from_, dep))
-
-        if not delete:
-            return actions
+        return UpdatePlan.compute(deps, current_deps, delete=delete).actions
 
-        # We need to check if we have to remove
-        # any dependency
-        for dep in current_deps:
-            found = False
-
-            for new_dep in deps:
-                if dep.name == new_dep.name:
-                    found = True
-
-                    break
+    def _installed_dependencies(self):
+        """
+        Return the packages installed in the target environment.
 
-            if not found:
-                actions.append(('remove', None, dep))
+        :rtype: list[poet.package.PipDependency]
+        """
+        if self._command.virtual_env:
+            packages = InstalledRepository([self._command.virtual_env]).packages
+        else:
+            # Asking the pip which installs the packages,
+            # which may not run with the interpreter of poet
+            output = call([self._command.pip(), 'list', '--format=json'])
+            packages = OrderedDict(
+                (canonicalize_name(package['name']), package['version'])
+                for package in json.loads(output.strip().splitlines()[-1])
+            )
 
-        return actions
+        # Versions we can't understand differ from the locked ones
+        # so they will be installed again
+        return [
+            PipDependency(name, version)
+            for name, version in packages.items()
+        ]
 
     def _get_vcs_version(self, url, rev):
-        tmp_dir = tempfile.mkdtemp()
-        current_dir = self._poet.base_dir
-
-        try:
-            unpack_url(Link(url), tmp_dir, download_dir=tmp_dir, only_download=True)
-
-            os.chdir(tmp_dir)
-            call(['git', 'checkout', rev])
-
-            revision = call(['git', 'rev-parse', rev])
-            # Getting info
-            revision = revision.strip()
-            version = {
-                'git': url,
-                'rev': revision
-            }
-        except Exception:
-            raise
-        finally:
-            shutil.rmtree(tmp_dir)
-            # Going back to current directory
-            os.chdir(current_dir)
-
-        return version
+        return {
+            'git': url,
+            'rev': self._vcs.resolve(url, rev)
+        }
 
     def _write_lock(self, packages, features):
         self._command.line(' - <info>Writing dependencies</>')
@@ -520,36 +889,6 @@ class Installer(object):
             features=features
         )
 
-    def _get_pythons_for_package(self, name, reversed_dependencies, deps):
-        pythons = set()
-        if name not in reversed_dependencies:
-            # Main dependency
-            for dep in deps:
-                if name == dep.name:
-                    for p in dep.python:
-                        pythons.add(str(p))
-
-                    break
-
-            if not len(pythons):
-                pythons.add('*')
-
-            return pythons
-
-        parents = reversed_dependencies[name]
-
-        for parent in parents:
-            parent_pythons = self._get_pythons_for_package(
-                parent, reversed_dependencies, deps
-            )
-
-            pythons = pythons.union(parent_pythons)
-
-        if not len(pythons):
-            pythons.add('*')
-
-        return pythons
-
     def _call(self, cmd, error_message):
         try:
             return call(cmd)
@@ -565,5 +904,178 @@ class Installer(object):
         with self._spin(start_message, end_message):
             return self._call(cmd, error_message)
 
+    def _is_batchable(self, dep):
+        """
+        Return whether a dependency can be installed
+        as part of a hash-checked batch.
+
+        :type dep: poet.package.PipDependency
+
+        :rtype: bool
+        """
+        return not dep.is_vcs_dependency() and bool(dep.checksum)
+
+    def _execute_batch_actions(self, actions):
+        """
+        Execute, with a single pip invocation per kind,
+        the update actions that can be batched.
+
+        :param actions: The actions to execute
+        :type actions: list[tuple]
+
+        :return: The actions that could not be batched
+        :rtype: list[tuple]
+        """
+        removals = [dep for action, _, dep in actions if action == 'remove']
+        installs = [
+            dep for action, _, dep in actions
+            if action != 'remove' and self._is_batchable(dep)
+        ]
+
+        if removals:
+            cmd = [self._command.pip(), 'uninstall', '-y']
+            cmd += [dep.name for dep in removals]
+
+            message = ' - Removing <comment>{}</> packages'.format(len(removals))
+            end_message = 'Removed <comment>{}</> packages'.format(len(removals))
+            error_message = 'Error while removing packages'
+
+            if self._command.output.is_verbose():
+                for dep in removals:
+                    self._command.line('   - <info>{}</>'.format(dep.name))
+
+            self._progress(cmd, message[3:], end_message, message, error_message)
+
+        if installs:
+            self._install_batch(installs)
+
+        return [
+            (action, from_, dep) for action, from_, dep in actions
+            if action != 'remove' and dep not in installs
+        ]
+
+    def _install_batch(self, deps):
+        """
+        Install pinned dependencies with a single pip invocation
+        over a temporary requirements file holding their hashes.
+
+        :param deps: The dependencies to install
+        :type deps: list[poet.package.PipDependency]
+
+        :rtype: None
+        """
+        fd, requirements = tempfile.mkstemp(prefix='poet_', suffix='.txt')
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for dep in deps:
+                    hashes = ' '.join(
+                        '--hash={}'.format(h) for h in dep.checksum
+                    )
+
+                    f.write('{}=={} {}\n'.format(dep.name, dep.constraint, hashes))
+
+            cmd = [
+                self._command.pip(), 'install',
+                '--require-hashes', '--no-deps',
+                '-r', requirements
+            ]
+
+            message = ' - Installing <comment>{}</> packages'.format(len(deps))
+            end_message = 'Installed <comment>{}</> packages'.format(len(deps))
+            error_message = 'Error while installing packages'
+
+            if self._command.output.is_verbose():
+                for dep in deps:
+                    self._command.line(
+                        '   - <info>{}</> (<comment>{}</>)'
+                        .format(dep.name, dep.constraint.replace('==', ''))
+                    )
+
+            self._progress(cmd, message[3:], end_message, message, error_message)
+        finally:
+            os.unlink(requirements)
+
+    def _execute_parallel(self, operations):
+        """
+        Execute operations concurrently with a pool of workers.
+
+        An operation is only started once the operations
+        of the packages it depends on have finished.
+
+        :param operations: The operations to execute
+        :type operations: list[tuple]
+
+        :rtype: None
+        """
+        pending = OrderedDict(
+            (operation[0].name, operation) for operation in operations
+        )
+        end_messages = {}
+        waiting_for = {}
+        for name, operation in pending.items():
+            end_messages[name] = operation[3]
+            waiting_for[name] = set(
+                d for d in operation[0].dependencies
+                if d in pending and d != name
+            )
+
+        total = len(pending)
+        done = 0
+        running = 0
+        error = None
+        results = queue.Queue()
+
+        def work(name, cmd, error_message):
+            try:
+                self._call(cmd, error_message)
+                results.put((name, None))
+            except Exception as e:
+                results.put((name, e))
+
+        pool = ThreadPool(min(self._jobs, total or 1))
+        try:
+            while pending or running:
+                if error is None:
+                    ready = [n for n in pending if not waiting_for[n]]
+                    if not ready and not running:
+                        # Circular dependencies: we start the package
+                        # with the fewest unmet dependencies
+                        ready = [min(pending, key=lambda n: len(waiting_for[n]))]
+
+                    for name in ready:
+                        _, cmd, _, _, message, error_message = pending.pop(name)
+                        running += 1
+
+                        if self._command.output.is_verbose():
+                            self._command.line(message)
+
+                        pool.apply_async(work, (name, cmd, error_message))
+
+                if not running:
+                    break
+
+                name, e = results.get()
+                running -= 1
+
+                if e is not None:
+                    error = error or e
+
+                    continue
+
+                done += 1
+                for waiting in waiting_for.values():
+                    waiting.discard(name)
+
+                self._command.line(
+                    ' - <comment>[{}/{}]</> {}'.format(done, total, end_messages[name])
+                )
+        finally:
+            pool.close()
+            pool.join()
+
+        if error is not None:
+            raise error
+
     def _spin(self, start_message, end_message):
         return self._command.spin(start_message, end_message)
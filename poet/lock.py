@@ -1,49 +1,174 @@
 # -*- coding: utf-8 -*-
 
+import os
+import toml
+
 from .package import PipDependency, Dependency
-from .poet import Poet
+from .utils.lru import LRUCache
 
 
-class Lock(Poet):
+class LockedPackage(object):
+    """
+    A package of a lock file.
 
-    def is_lock(self):
-        return True
+    Dependency objects, whose constraint parsing is costly,
+    are only built the first time they are needed.
+    """
 
-    def load(self):
-        root = self._config['root']
-        self._name = root['name']
-        self._version = root['version']
+    def __init__(self, data):
+        self._data = data
+        self._dependency = None
+        self._pip_dependency = None
+
+    @property
+    def name(self):
+        return self._data['name']
+
+    @property
+    def version(self):
+        return self._data['version']
+
+    @property
+    def category(self):
+        return self._data['category']
+
+    @property
+    def optional(self):
+        return self._data.get('optional', False)
+
+    @property
+    def python(self):
+        return self._data.get('python', ['*'])
+
+    @property
+    def checksum(self):
+        return self._data.get('checksum')
 
-        packages = self._config['package']
-
-        for package in packages:
-            constraint = {
-                'optional': package.get('optional', False),
-                'python': package.get('python', ['*'])
-            }
-            version = package['version']
-            if isinstance(version, dict):
-                constraint.update(version)
-            else:
-                constraint['version'] = version
-
-            dep = Dependency(
-                package['name'],
-                constraint,
-                category=package['category']
+    @property
+    def dependencies(self):
+        return self._data.get('dependencies', [])
+
+    @property
+    def constraint(self):
+        constraint = {
+            'optional': self.optional,
+            'python': self.python
+        }
+
+        version = self.version
+        if isinstance(version, dict):
+            constraint.update(version)
+        else:
+            constraint['version'] = version
+
+        return constraint
+
+    @property
+    def dependency(self):
+        if self._dependency is None:
+            self._dependency = Dependency(
+                self.name, self.constraint, category=self.category
             )
-            pip_dep = PipDependency(
-                package['name'],
-                constraint,
-                category=package['category'],
-                checksum=package.get('checksum')
+
+        return self._dependency
+
+    @property
+    def pip_dependency(self):
+        if self._pip_dependency is None:
+            self._pip_dependency = PipDependency(
+                self.name,
+                self.constraint,
+                category=self.category,
+                checksum=self.checksum,
+                dependencies=self.dependencies
             )
 
-            if package['category'] == 'dev':
-                self._dev_dependencies.append(dep)
-                self._pip_dev_dependencies.append(pip_dep)
-            else:
-                self._dependencies.append(dep)
-                self._pip_dependencies.append(pip_dep)
+        return self._pip_dependency
+
+
+class Lock(object):
+    """
+    A lock file.
+
+    Only the root metadata, the features and the packages
+    are read from it, the packages being wrapped lazily.
+    """
+
+    # Lock files already read, keyed by path and by
+    # the file status they were read with
+    _locks = LRUCache(16)
 
-        self._features = self._get_features()
+    def __init__(self, path):
+        self._path = path
+
+        with open(path) as f:
+            config = toml.loads(f.read())
+
+        root = config['root']
+        self._name = root['name']
+        self._version = root['version']
+        self._features = config.get('features', {})
+        self._packages = [
+            LockedPackage(package)
+            for package in config.get('package', [])
+        ]
+
+    @classmethod
+    def read(cls, path):
+        """
+        Return the lock for a file, reusing the one
+        already read if the file did not change since.
+
+        :param path: The path of the lock file
+        :type path: str
+
+        :rtype: Lock
+        """
+        stat = os.stat(path)
+
+        return cls._locks.get(
+            (path, stat.st_mtime, stat.st_size, stat.st_ino),
+            lambda _: cls(path)
+        )
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def features(self):
+        return self._features
+
+    @property
+    def packages(self):
+        """
+        :rtype: list[LockedPackage]
+        """
+        return self._packages
+
+    @property
+    def dependencies(self):
+        return [p.dependency for p in self._packages if p.category != 'dev']
+
+    @property
+    def dev_dependencies(self):
+        return [p.dependency for p in self._packages if p.category == 'dev']
+
+    @property
+    def pip_dependencies(self):
+        return [p.pip_dependency for p in self._packages if p.category != 'dev']
+
+    @property
+    def pip_dev_dependencies(self):
+        return [p.pip_dependency for p in self._packages if p.category == 'dev']
+
+    def is_lock(self):
+        return True
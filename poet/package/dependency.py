@@ -1,19 +1,39 @@
 # -*- coding: utf-8 -*-
 
-from semantic_version import Spec, SpecItem, Version
+from semantic_version import Spec
 
+from .._compat import intern
 from ..version_parser import VersionParser
 
 
+# Shared by every dependency without Python restriction
+ANY_PYTHON = Spec('*')
+
+
 class Dependency(object):
+    """
+    A dependency on a package.
+
+    Since many of them can be held at once, the state is kept
+    in slots, names are interned, parsed specifications are shared
+    and the constraint is only normalized when first needed.
+    """
+
+    __slots__ = (
+        '_name', '_constraint', '_optional',
+        '_accepts_prereleases', '_is_prerelease', '_category',
+        '_python', '_normalized_constraint'
+    )
 
     def __init__(self, name, constraint, category='main'):
-        self._name = name
+        self._name = intern(name)
         self._constraint = constraint
         self._optional = False
         self._accepts_prereleases = False
-        self._category = category
-        self._python = [Spec('*')]
+        self._is_prerelease = False
+        self._category = intern(category)
+        self._python = None
+        self._normalized_constraint = None
 
         if isinstance(constraint, dict):
             if 'python' in constraint:
@@ -22,7 +42,9 @@ class Dependency(object):
                 if not isinstance(python, list):
                     python = [python]
 
-                self._python = [Spec(p) for p in python]
+                self._python = tuple(
+                    VersionParser().parse_constraints(p) for p in python
+                )
 
             if 'optional' in constraint:
                 self._optional = constraint['optional']
@@ -30,8 +52,6 @@ class Dependency(object):
             if 'version' in constraint:
                 self._constraint = constraint['version']
 
-        self._normalized_constraint = self._normalize(constraint)
-
     @property
     def name(self):
         return self._name
@@ -50,7 +70,10 @@ class Dependency(object):
 
     @property
     def python(self):
-        return self._python
+        if self._python is None:
+            return [ANY_PYTHON]
+
+        return list(self._python)
 
     @property
     def pretty_constraint(self):
@@ -76,6 +99,9 @@ class Dependency(object):
 
     @property
     def normalized_constraint(self):
+        if self._normalized_constraint is None:
+            self._normalized_constraint = self._normalize(self._constraint)
+
         return self._normalized_constraint
     
     @property
@@ -92,10 +118,13 @@ class Dependency(object):
         return isinstance(self._constraint, dict) and 'git' in self._constraint
 
     def accepts_prereleases(self):
+        # Known once the constraint is normalized
+        self.normalized_constraint
+
         return self._accepts_prereleases
 
     def is_python_restricted(self):
-        return self._python != [Spec('*')]
+        return self._python is not None and self._python != (ANY_PYTHON,)
 
     def _normalize(self, constraint):
         """
@@ -113,68 +142,24 @@ class Dependency(object):
 
             return self._normalize_vcs_constraint(constraint)
 
-        version = constraint
-        if isinstance(version, dict):
-            version = version['version']
-
-        constraint = self._spec(version)
-        normalized = []
-
-        for spec in constraint.specs:
-            version = spec.spec
-
-            if VersionParser.parse_stability(version) == 'dev':
-                self._accepts_prereleases = True
-
-            major, minor, patch, prerelease = (
-                version.major, version.minor, version.patch, version.prerelease
-            )
-            current = '{}.{}.{}'.format(major, minor or 0, patch or 0)
-            current = Version(current)
-
-            if spec.kind == SpecItem.KIND_CARET:
-                if current.major != 0 or minor is None:
-                    upper = current.next_major()
-                elif current.minor != 0 or patch is None:
-                    upper = current.next_minor()
-                else:
-                    upper = current.next_patch()
-
-                if prerelease:
-                    current = str(current) + '{}'.format(''.join(prerelease))
-
-                normalized.append('>={},<{}'.format(current, upper))
-            elif spec.kind == SpecItem.KIND_TILDE:
-                if minor is None and patch is None:
-                    upper = current.next_major()
-                else:
-                    upper = current.next_minor()
+        constraint = self.version_constraint
+        self._accepts_prereleases = constraint.accepts_prereleases()
 
-                upper = '{}.{}.{}'.format(*upper)
-
-                normalized.append('>={},<{}'.format(current, upper))
-
-                if prerelease:
-                    current = str(current) + '{}'.format(''.join(prerelease))
-            else:
-                current = spec.kind + str(current)
-                if prerelease:
-                    current += '{}'.format(''.join(prerelease))
-
-                normalized.append(current)
-
-        return ','.join(normalized)
+        return constraint.to_pep440()
 
     def _normalize_vcs_constraint(self, constraint):
         # Neither setuptools nor distutils support VCS constraint
         # So by default we return nothing
         return ''
 
-    def _spec(self, version):
-        try:
-            return Spec(version)
-        except ValueError:
-            return Spec(str(Version.coerce(version)))
+    @property
+    def version_constraint(self):
+        """
+        The compiled version constraint.
+
+        :rtype: poet.version_constraint.VersionConstraint
+        """
+        return VersionParser.parse_constraint(self._constraint)
 
     def __repr__(self):
         return '<{} {}>'.format(self.__class__.__name__, self.normalized_name)
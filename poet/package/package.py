@@ -2,18 +2,24 @@
 
 import re
 
+from .._compat import intern
 from ..version_parser import VersionParser, Version
 
 
 class Package(object):
+    """
+    A version of a package.
+
+    The version is only parsed when first needed.
+    """
+
+    __slots__ = ('_name', '_version', '_pretty_version', '_stability', '_dependencies')
 
     def __init__(self, name, version):
-        self._name = name
-        self._version = Version.coerce(version) if not isinstance(version, Version) else version
+        self._name = intern(name)
+        self._version = version if isinstance(version, Version) else None
         self._pretty_version = str(version)
-
-        self._stability = VersionParser.parse_stability(version)
-        self._dev = self._stability == 'dev'
+        self._stability = None
         self._dependencies = []
 
     @property
@@ -22,6 +28,9 @@ class Package(object):
 
     @property
     def version(self):
+        if self._version is None:
+            self._version = VersionParser.coerce_version(self._pretty_version)
+
         return self._version
 
     @property
@@ -30,6 +39,9 @@ class Package(object):
 
     @property
     def stability(self):
+        if self._stability is None:
+            self._stability = VersionParser.parse_stability(self.version)
+
         return self._stability
 
     @property
@@ -45,4 +57,4 @@ class Package(object):
         return True
 
     def is_dev(self):
-        return self._dev
+        return self.stability == 'dev'
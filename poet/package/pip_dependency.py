@@ -2,23 +2,41 @@
 
 from pip.req import InstallRequirement
 from packaging.utils import canonicalize_name
+
+from .._compat import intern
 from .dependency import Dependency
 
 
 class PipDependency(Dependency):
 
-    def __init__(self, name, constraint, category='main', checksum=None):
+    __slots__ = ('_checksum', '_dependencies')
+
+    def __init__(self, name, constraint, category='main', checksum=None,
+                 dependencies=None):
         # Normalizing name for easier dependencies resolving
         name = canonicalize_name(name)
 
         super(PipDependency, self).__init__(name, constraint, category=category)
 
         self._checksum = checksum
+        self._dependencies = [
+            intern(canonicalize_name(d)) for d in (dependencies or [])
+        ]
 
     @property
     def checksum(self):
         return self._checksum
 
+    @property
+    def dependencies(self):
+        """
+        Names of the packages this dependency requires,
+        as recorded in the lock file.
+
+        :rtype: list
+        """
+        return self._dependencies
+
     @property
     def normalized_name(self):
         normalized_name = self._name
@@ -16,8 +16,10 @@ from packaging.utils import canonicalize_name
 from .exceptions.poet import MissingElement, InvalidElement
 from .version_parser import VersionParser
 from .build import Builder
+from .build.ignore import IgnoreMatcher
 from .package import Dependency, PipDependency
 from .utils.helpers import call
+from .utils.readme_cache import ReadmeCache, pandoc_fingerprint
 
 
 class Poet(object):
@@ -30,6 +32,7 @@ class Poet(object):
         self._dir = os.path.realpath(os.path.dirname(path))
         self._builder = builder
         self._git_config = None
+        self._ignore = None
 
         self._name = None
         self._version = None
@@ -48,6 +51,7 @@ class Poet(object):
         self._entry_points = {}
         self._license = None
         self._readme = None
+        self._readme_loaded = False
         self._include = []
         self._exclude = []
         self._extensions = {}
@@ -79,25 +83,15 @@ class Poet(object):
 
     @property
     def ignore(self):
-        ignore_files = [
-            '.gitignore'
-        ]
-
-        ignore = []
-
-        for filename in ignore_files:
-            filepath = os.path.join(self._dir, filename)
-            if not os.path.exists(filepath):
-                continue
-
-            with open(filepath) as fd:
-                for line in fd.readlines():
-                    if re.match('^\s*#.*$', line):
-                        continue
+        """
+        The rules of the .gitignore files of the project.
 
-                    ignore.append(line.strip())
+        :rtype: poet.build.ignore.IgnoreMatcher
+        """
+        if self._ignore is None:
+            self._ignore = IgnoreMatcher(self._dir)
 
-        return ignore
+        return self._ignore
 
     @property
     def name(self):
@@ -174,8 +168,16 @@ class Poet(object):
 
     @property
     def readme(self):
+        if not self._readme_loaded:
+            self._load_readme()
+            self._readme_loaded = True
+
         return self._readme
 
+    @property
+    def readme_file(self):
+        return self._config['package']['readme']
+
     @property
     def include(self):
         return self._include
@@ -196,7 +198,7 @@ class Poet(object):
     def lock(self):
         from .lock import Lock
 
-        return Lock(self.lock_file)
+        return Lock.read(self.lock_file)
 
     @property
     def path(self):
@@ -227,7 +229,9 @@ class Poet(object):
         self._scripts = self._config.get('scripts', {})
         self._entry_points = self._config.get('entry-points', {})
 
-        self._load_readme()
+        # The README is only read when needed
+        self._readme = None
+        self._readme_loaded = False
 
         self._include = self._config['package'].get('include', []) + list(self.INCLUDES)
         self._exclude = self._config['package'].get('exclude', []) + list(self.EXCLUDES)
@@ -245,11 +249,37 @@ class Poet(object):
                     'and the pypandoc package.'
                 )
             else:
-                self._readme = pypandoc.convert_file(readme_path, 'rst')
+                self._readme = self._convert_readme(readme_path)
         else:
             with open(readme_path) as f:
                 self._readme = f.read()
 
+    def _convert_readme(self, readme_path):
+        """
+        Convert a Markdown README to reStructuredText,
+        reusing the conversion of a previous run if any.
+
+        :rtype: str
+        """
+        with open(readme_path, 'rb') as f:
+            content = f.read()
+
+        # Running pandoc to get its version would cost
+        # about as much as the conversion itself
+        pandoc = pandoc_fingerprint()
+        if pandoc is None:
+            # Only pypandoc knows where pandoc is
+            pandoc = pypandoc.get_pandoc_version()
+
+        cache = ReadmeCache()
+
+        converted = cache.get(content, pandoc)
+        if converted is None:
+            converted = pypandoc.convert_file(readme_path, 'rst')
+            cache.put(content, pandoc, converted)
+
+        return converted
+
     def has_markdown_readme(self):
         """
         Return whether the README is a markdown one.
@@ -267,7 +297,7 @@ class Poet(object):
     def build(self, **options):
         self.check()
 
-        self._builder.build(self, **options)
+        return self._builder.build(self, **options)
 
     def check(self):
         """
@@ -11,6 +11,8 @@ from requests_toolbelt.multipart import (
     MultipartEncoder, MultipartEncoderMonitor
 )
 
+from .utils import transport
+
 
 class Repository(BaseRepository):
 
@@ -19,6 +21,11 @@ class Repository(BaseRepository):
 
         super(Repository, self).__init__(repository_url, username, password)
 
+        # Sharing the connection pool of the other index traffic
+        shared_adapter = transport.adapter()
+        self.session.mount('https://', shared_adapter)
+        self.session.mount('http://', shared_adapter)
+
     def register(self, package):
         data = package.metadata_dictionary()
         data.update({
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
+from .installed_repository import InstalledRepository
 from .pypi_repository import PyPiRepository
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from ..locations import CACHE_DIR
+from ..utils.lru import LRUCache
+
+
+class MetadataCache(object):
+    """
+    On-disk cache for index metadata.
+
+    Entries are keyed by index URL and a key (like a package name),
+    expire after a time-to-live and are evicted, least recently used
+    first, when the cache grows beyond its maximum size.
+
+    The size of the cache is scanned once and then tracked as entries
+    are written, the directory being scanned again only to evict entries.
+    Decoded entries are kept in memory as long as their file is unchanged
+    and handed out as copies, recency being tracked on every read,
+    whether the entry comes from memory or from disk.
+    """
+
+    DEFAULT_TTL = 600
+    DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+    # Number of decoded entries kept in memory
+    DECODED_ENTRIES = 128
+
+    def __init__(self, directory=None, ttl=DEFAULT_TTL,
+                 max_size=DEFAULT_MAX_SIZE):
+        if directory is None:
+            directory = os.path.join(CACHE_DIR, 'metadata')
+
+        self._dir = directory
+        self._ttl = ttl
+        self._max_size = max_size
+        self._size = None
+        self._size_lock = threading.Lock()
+        self._decoded = LRUCache(self.DECODED_ENTRIES)
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def get(self, url, key):
+        """
+        Return the entry stored for a key or None.
+
+        The entry is returned even if it is stale,
+        use is_fresh() to know if it can be used as is.
+
+        :param key: The key parts
+        :type key: tuple
+
+        :rtype: dict or None
+        """
+        path = self._path(url, key)
+
+        try:
+            # Entries are replaced, not modified, so a file
+            # written again has a new inode and modification time
+            stat = os.stat(path)
+
+            entry = self._decoded.get(
+                (path, stat.st_ino, stat.st_size, stat.st_mtime),
+                lambda _: self._read(path)
+            )
+        except (IOError, OSError, ValueError):
+            return
+
+        self._touch(path, stat)
+
+        return _copy(entry)
+
+    def put(self, url, key, data, etag=None, last_modified=None, ttl=None):
+        """
+        Store data for a key.
+
+        :param key: The key parts
+        :type key: tuple
+
+        :rtype: dict
+        """
+        entry = {
+            'created': time.time(),
+            'ttl': self._ttl if ttl is None else ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data
+        }
+
+        self._write(self._path(url, key), entry)
+
+        return entry
+
+    def refresh(self, url, key, entry):
+        """
+        Mark a stale entry as fresh again,
+        typically after a successful revalidation.
+
+        :rtype: dict
+        """
+        entry['created'] = time.time()
+        self._write(self._path(url, key), entry)
+
+        return entry
+
+    def expires(self, url, key):
+        """
+        Return the time at which the entry of a key
+        becomes stale, 0 if there is no such entry.
+
+        :rtype: float
+        """
+        path = self._path(url, key)
+
+        try:
+            stat = os.stat(path)
+
+            entry = self._decoded.get(
+                (path, stat.st_ino, stat.st_size, stat.st_mtime),
+                lambda _: self._read(path)
+            )
+        except (IOError, OSError, ValueError):
+            return 0
+
+        return entry['created'] + entry['ttl']
+
+    def is_fresh(self, entry):
+        return time.time() - entry['created'] < entry['ttl']
+
+    def clear(self):
+        with self._size_lock:
+            for path, _, _ in self._entries():
+                os.unlink(path)
+
+            self._size = 0
+
+    def _path(self, url, key):
+        digest = hashlib.sha256(
+            json.dumps([url] + list(key)).encode('utf-8')
+        ).hexdigest()
+
+        return os.path.join(self._dir, digest[:2], digest + '.json')
+
+    def _write(self, path, entry):
+        directory = os.path.dirname(path)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created concurrently
+                pass
+
+        try:
+            previous_size = os.path.getsize(path)
+        except OSError:
+            previous_size = 0
+
+        content = json.dumps(entry)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+
+        getattr(os, 'replace', os.rename)(tmp, path)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Evicted concurrently
+            return
+
+        self._decoded.get(
+            (path, stat.st_ino, stat.st_size, stat.st_mtime),
+            lambda _: _copy(entry)
+        )
+        self._grow(stat.st_size - previous_size)
+
+    def _read(self, path):
+        with open(path) as f:
+            return json.loads(f.read())
+
+    def _touch(self, path, stat):
+        try:
+            # Marking the entry as recently used through
+            # its access time, its modification time identifying it
+            if hasattr(stat, 'st_mtime_ns'):
+                os.utime(
+                    path, ns=(int(time.time() * 1e9), stat.st_mtime_ns)
+                )
+            else:
+                os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+    def _grow(self, delta):
+        """
+        Account for written data, evicting entries
+        if the cache exceeds its maximum size.
+
+        Entries written by other processes are only
+        taken into account when the cache is scanned.
+        """
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(e[1] for e in self._entries())
+            else:
+                self._size += delta
+
+            if self._size > self._max_size:
+                self._size = self._evict()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self._dir):
+            return entries
+
+        for root, _, files in os.walk(self._dir):
+            for filename in files:
+                if not filename.endswith('.json'):
+                    continue
+
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entries.append((path, stat.st_size, stat.st_atime))
+
+        return entries
+
+    def _evict(self):
+        """
+        Remove the least recently used entries
+        until the cache fits in its maximum size.
+
+        :return: The size of the cache
+        :rtype: int
+        """
+        entries = self._entries()
+        size = sum(e[1] for e in entries)
+        if size <= self._max_size:
+            return size
+
+        # Least recently used first
+        for path, entry_size, _ in sorted(entries, key=lambda e: e[2]):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+
+            size -= entry_size
+            if size <= self._max_size:
+                break
+
+        return size
+
+
+def _copy(value):
+    """
+    Copy a decoded JSON value so that callers
+    cannot alter the entries kept in memory.
+    """
+    if isinstance(value, dict):
+        return dict((k, _copy(v)) for k, v in value.items())
+
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+
+    return value
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+from collections import OrderedDict
+
+from packaging.utils import canonicalize_name
+
+
+class InstalledRepository(object):
+    """
+    Packages installed in an environment,
+    read from the metadata directories of its site-packages.
+    """
+
+    METADATA_DIR_REGEX = re.compile(
+        '(?i)^(?P<name>.+?)(-(?P<version>[^-]+?)(-py[^-]+)?)?\\.(?P<kind>dist|egg)-info$'
+    )
+
+    METADATA_FILES = {
+        'dist': 'METADATA',
+        'egg': 'PKG-INFO'
+    }
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._packages = None
+
+    @property
+    def packages(self):
+        """
+        Return the installed packages.
+
+        Metadata is only read the first time this is accessed.
+
+        :return: Installed versions keyed by canonical name
+        :rtype: OrderedDict
+        """
+        if self._packages is None:
+            self._packages = self._load()
+
+        return self._packages
+
+    def version(self, name):
+        """
+        Return the installed version of a package
+        or None if it is not installed.
+
+        :rtype: str or None
+        """
+        return self.packages.get(canonicalize_name(name))
+
+    def _load(self):
+        packages = OrderedDict()
+
+        for path in self._paths:
+            if not path or not os.path.isdir(path):
+                continue
+
+            for entry in sorted(os.listdir(path)):
+                m = self.METADATA_DIR_REGEX.match(entry)
+                if not m:
+                    continue
+
+                name = canonicalize_name(m.group('name'))
+                if name in packages:
+                    # The first path wins, like for imports
+                    continue
+
+                version = m.group('version')
+                if not version:
+                    version = self._read_version(
+                        os.path.join(path, entry),
+                        self.METADATA_FILES[m.group('kind').lower()]
+                    )
+
+                if version:
+                    packages[name] = version
+
+        return packages
+
+    def _read_version(self, directory, filename):
+        metadata = directory
+        if os.path.isdir(directory):
+            # Egg metadata can also be a single file
+            metadata = os.path.join(directory, filename)
+
+        if not os.path.isfile(metadata):
+            return
+
+        with open(metadata) as f:
+            for line in f:
+                if line.startswith('Version:'):
+                    return line[len('Version:'):].strip()
+
+                if not line.strip():
+                    # End of the headers
+                    break
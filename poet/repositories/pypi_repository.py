@@ -1,82 +1,550 @@
 # -*- coding: utf-8 -*-
 
-import requests
-from pip.models import PyPI
+import tempfile
+import threading
+import time
+import zipfile
 
-try:
-    from xmlrpc.client import ServerProxy
-except ImportError:
-    from xmlrpclib import ServerProxy
+from collections import OrderedDict
+from email.parser import Parser
+from multiprocessing.pool import ThreadPool
 
-from semantic_version import Version
+from packaging.utils import canonicalize_name
+from pip.models import PyPI
 
 from ..version_parser import VersionParser
 from ..package import Package
+from ..utils import transport
+from ..utils.lru import LRUCache
+from . import simple_index
+from .cache import MetadataCache
+from .release_index import ReleaseIndex
 
 
 class PyPiRepository(object):
+    """
+    Repository backed by a PEP 503 index,
+    using the PEP 691 JSON format when the index supports it.
+    """
 
-    DEFAULT_URL = PyPI.pypi_url
+    DEFAULT_URL = PyPI.simple_url
 
     SEARCH_FULLTEXT = 0
     SEARCH_NAME = 1
 
-    def __init__(self, url=DEFAULT_URL):
+    # Number of search results for which
+    # details are retrieved from the JSON API
+    SEARCH_DETAILS_LIMIT = 20
+
+    # Number of packages whose sorted releases are kept in memory,
+    # each one as long as the cached releases it was built from are fresh
+    RELEASE_INDEXES = 256
+
+    # Published releases do not change
+    # so their metadata can be kept longer
+    IMMUTABLE_TTL = 7 * 24 * 3600
+
+    # Size of the chunks in which artifacts are downloaded
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, url=DEFAULT_URL, cache=None, offline=False,
+                 session=None, max_in_flight=None):
+        url = url.rstrip('/')
+        if url.endswith('/pypi'):
+            # Legacy API endpoint
+            url = url[:-len('/pypi')] + '/simple'
+
         self._url = url
 
+        if cache is None:
+            cache = MetadataCache()
+
+        if session is None:
+            session = transport.session()
+
+        self._cache = cache
+        self._offline = offline
+        self._session = session
+        self._max_in_flight = max_in_flight or transport.POOL_SIZE
+        self._release_indexes = LRUCache(self.RELEASE_INDEXES)
+        self._projects_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def cache(self):
+        return self._cache
+
     def find_packages(self, name, constraint=None):
-        packages = []
+        """
+        Return the packages matching a constraint, lowest version first.
 
+        :rtype: list[poet.package.Package]
+        """
         if constraint is not None:
-            version_parser = VersionParser()
-            constraint = version_parser.parse_constraints(constraint)
+            constraint = VersionParser.parse_constraint(constraint)
 
-        with ServerProxy(self._url) as client:
-            versions = client.package_releases(name, True)
+        return [
+            Package(name, version)
+            for version in self.release_index(name).candidates(constraint)
+        ]
 
-        if constraint:
-            versions = constraint.select([Version.coerce(v) for v in versions])
+    def release_index(self, name):
+        """
+        Return the releases of a package sorted by version.
 
-        for version in versions:
-            try:
-                packages.append(Package(name, version))
-            except ValueError:
-                continue
+        :rtype: ReleaseIndex
+        """
+        key = canonicalize_name(name)
+        built = []
 
-        return packages
+        def build(_):
+            built.append(key)
 
-    def search(self, query, mode=0):
-        results = []
+            return self._release_index(name)
 
-        search = {
-            'name': query
-        }
+        expires, index = self._release_indexes.get(key, build)
+        if not built and not self._offline and time.time() >= expires:
+            # The releases are revalidated like the cached metadata
+            self._release_indexes.discard(key)
+            expires, index = self._release_indexes.get(key, build)
 
-        if mode == self.SEARCH_FULLTEXT:
-            search['summary'] = query
+        return index
 
-        client = ServerProxy(self._url)
-        hits = client.search(search, 'or')
+    def release_indexes(self, names):
+        """
+        Build the release indexes of several packages concurrently.
 
-        for hit in hits:
-            results.append({
-                'name': hit['name'],
-                'description': hit['summary'],
-                'version': hit['version']
-            })
+        :rtype: OrderedDict
+        """
+        return self._map(self.release_index, names)
+
+    def find_packages_many(self, names, constraint=None):
+        """
+        Find the packages for several names concurrently.
+
+        :param names: The package names
+        :type names: list
+
+        :return: The packages keyed by name
+        :rtype: OrderedDict
+        """
+        return self._map(lambda name: self.find_packages(name, constraint), names)
+
+    def releases(self, name):
+        """
+        Return the distribution files of every release of a project.
+
+        :param name: The project name
+        :type name: str
+
+        :return: The files keyed by version, in index order
+        :rtype: OrderedDict
+        """
+        releases = self._get(
+            ('files', canonicalize_name(name)),
+            '{}/{}/'.format(self._url, canonicalize_name(name)),
+            lambda response: self._releases(name, response),
+            missing=[]
+        )
+
+        return OrderedDict((version, files) for version, files in releases)
+
+    def hashes(self, name, version):
+        """
+        Return the hashes, in pip format, of the files of a release.
+
+        :rtype: list
+        """
+        hashes = []
+        for f in self.releases(name).get(version, []):
+            for algorithm, value in sorted(f['hashes'].items()):
+                if algorithm == 'sha256':
+                    hashes.append('{}:{}'.format(algorithm, value))
+
+        return sorted(set(hashes))
+
+    def dependencies(self, name, version):
+        """
+        Return the requirements of a release, as PEP 508 strings.
+
+        They are read, in order of preference, from the PEP 658
+        metadata file of a wheel, from the JSON API
+        and, as a last resort, from the wheel itself.
+
+        :rtype: list
+        """
+        return self._cached(
+            ('requires', canonicalize_name(name), version),
+            lambda: self._dependencies(name, version),
+            ttl=self.IMMUTABLE_TTL
+        )
+
+    def search(self, query, mode=SEARCH_FULLTEXT):
+        """
+        Search for projects whose name contains the query.
+
+        Simple indexes do not expose summaries so only names
+        can be searched, the summary and version of the first
+        results being retrieved afterwards.
+
+        This reads the whole project list of the index,
+        use find_projects() to look up known names.
+        """
+        if mode != self.SEARCH_NAME:
+            raise Exception(
+                'Full text search is not supported by simple indexes, '
+                'only project names can be searched'
+            )
+
+        if isinstance(query, list):
+            query = ' '.join(query)
+
+        key = ('search', query)
+        entry = self._cache.get(self._url, key)
+        if entry is not None and (self._offline or self._cache.is_fresh(entry)):
+            return entry['data']
+
+        # Searches can be done offline from the cached project list
+        results = self._search(query)
+
+        details = self._map(
+            self._details,
+            [result['name'] for result in results[:self.SEARCH_DETAILS_LIMIT]]
+        )
+        for result in results:
+            result.update(details.get(result['name']) or {})
+
+        if not self._offline:
+            self._cache.put(self._url, key, results)
 
         return results
 
+    def find_projects(self, names):
+        """
+        Look projects up, concurrently, by their exact name.
+
+        Only the pages of the projects are retrieved,
+        which are then cached for their releases to be used.
+
+        :param names: The project names
+        :type names: list
+
+        :return: Whether each project exists, keyed by name
+        :rtype: OrderedDict
+        """
+        return self._map(lambda name: bool(self.releases(name)), names)
+
+    def projects(self):
+        """
+        Return the names of the projects of the index.
+
+        The list is large so it is cached like
+        the other index pages and revalidated when stale.
+        Concurrent calls wait for a single download.
+
+        :rtype: list
+        """
+        with self._projects_lock:
+            return self._get(
+                ('projects',),
+                self._url + '/',
+                lambda response: list(simple_index.iter_projects(response))
+            )
+
     def package_name(self, name):
-        url = 'https://pypi.python.org/pypi/{}/json'.format(name)
+        return self._get(
+            ('json', canonicalize_name(name)),
+            self._json_url(name),
+            lambda response: response.json()['info']['name'],
+            stream=False
+        )
+
+    def _releases(self, name, response):
+        releases = OrderedDict()
+
+        for link in simple_index.iter_links(response):
+            if link.get('yanked'):
+                continue
+
+            version = simple_index.version_from_filename(name, link['filename'])
+            if not version:
+                continue
+
+            releases.setdefault(version, []).append({
+                'filename': link['filename'],
+                'url': link['url'],
+                'hashes': link.get('hashes') or {},
+                'requires-python': link.get('requires-python'),
+                'core-metadata': link.get('core-metadata', False)
+            })
+
+        # Pairs, since the order is lost in JSON objects
+        return list(releases.items())
+
+    def _dependencies(self, name, version):
+        files = self.releases(name).get(version)
+        if files is None:
+            raise Exception(
+                'Release [{} ({})] not found'.format(name, version)
+            )
+
+        wheels = [f for f in files if f['filename'].endswith('.whl')]
+        # Pure Python wheels are the most likely
+        # to have the same requirements everywhere
+        wheels.sort(key=lambda f: '-none-any.whl' not in f['filename'])
+
+        for wheel in wheels:
+            if wheel['core-metadata']:
+                response = self._request(wheel['url'] + '.metadata')
+                try:
+                    if response.status_code == 200:
+                        return self._requires_dist(response.text)
+                finally:
+                    response.close()
+
+        # Whole wheels are only downloaded if the JSON API,
+        # which is not provided by every index, does not know
+        info = self._release_info(name, version)
+        if info is not None and info.get('requires_dist') is not None:
+            return info['requires_dist']
+
+        if wheels:
+            return self._requires_dist(self._wheel_metadata(wheels[0]['url']))
+
+        if info is not None:
+            # Only source distributions, without requirements
+            return []
+
+        raise Exception(
+            'Unable to determine the dependencies '
+            'of [{} ({})]'.format(name, version)
+        )
+
+    def _release_info(self, name, version):
+        try:
+            response = self._request(self._json_url(name, version))
+        except Exception:
+            return
+
+        try:
+            response.raise_for_status()
+
+            return response.json()['info']
+        except Exception:
+            return
+        finally:
+            response.close()
+
+    def _wheel_metadata(self, url):
+        """
+        Return the METADATA file of a wheel.
+
+        The wheel is streamed to a temporary file
+        rather than held in memory.
+
+        :rtype: str
+        """
+        response = self._request(url, stream=True)
+        try:
+            response.raise_for_status()
+
+            with tempfile.TemporaryFile() as f:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    f.write(chunk)
+
+                f.seek(0)
+
+                with zipfile.ZipFile(f) as wheel:
+                    for filename in wheel.namelist():
+                        parts = filename.split('/')
+                        if (len(parts) == 2
+                                and parts[0].endswith('.dist-info')
+                                and parts[1] == 'METADATA'):
+                            return wheel.read(filename).decode('utf-8')
+        finally:
+            response.close()
+
+        return ''
+
+    def _requires_dist(self, metadata):
+        return Parser().parsestr(metadata).get_all('Requires-Dist') or []
+
+    def _search(self, query):
+        tokens = [canonicalize_name(t) for t in query.split()]
+        hits = []
+
+        for project in self.projects():
+            normalized = canonicalize_name(project)
+
+            if any(token in normalized for token in tokens):
+                hits.append((project, normalized))
+
+        # Exact matches first, then prefix matches
+        hits.sort(key=lambda hit: (
+            hit[1] not in tokens,
+            not any(hit[1].startswith(token) for token in tokens),
+            hit[1]
+        ))
+
+        return [{'name': project} for project, _ in hits]
+
+    def _details(self, name):
+        if self._offline:
+            return
+
+        try:
+            response = self._request(self._json_url(name))
+            response.raise_for_status()
+
+            info = response.json()['info']
+        except Exception:
+            # Not every index provides the JSON API
+            return
+
+        return {
+            'description': info['summary'],
+            'version': info['version']
+        }
+
+    def _json_url(self, name, version=None):
+        base = self._url
+        if base.endswith('/simple'):
+            base = base[:-len('/simple')]
+
+        if version is not None:
+            return '{}/pypi/{}/{}/json'.format(base, name, version)
+
+        return '{}/pypi/{}/json'.format(base, name)
+
+    def _release_index(self, name):
+        """
+        Build the release index of a package along with
+        the time at which its cached releases become stale.
+
+        :rtype: tuple
+        """
+        releases = self.releases(name)
+        expires = self._cache.expires(
+            self._url, ('files', canonicalize_name(name))
+        )
+
+        return expires, ReleaseIndex(releases)
+
+    def _get(self, key, url, parse, stream=True, missing=None):
+        """
+        Return the cached data for a key, revalidating
+        stale entries with the index and storing new ones.
+
+        :param key: The key parts
+        :type key: tuple
+
+        :param url: The URL of the data
+        :type url: str
+
+        :param parse: Callable extracting the data from the response
+        :type parse: callable
+
+        :param missing: Data to return if the URL does not exist,
+                        if None an error is raised
+        """
+        entry = self._cache.get(self._url, key)
+        if entry is not None and (self._offline or self._cache.is_fresh(entry)):
+            return entry['data']
+
+        self._check_offline(key[-1], entry)
+
+        headers = {}
+        if entry is not None:
+            # Revalidating the stale entry
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._request(url, headers=headers, stream=stream)
+
+        try:
+            if response.status_code == 304 and entry is not None:
+                return self._cache.refresh(self._url, key, entry)['data']
+
+            if response.status_code == 404:
+                if missing is not None:
+                    return missing
+
+                raise Exception('Package [{}] not found'.format(key[-1]))
+
+            response.raise_for_status()
+
+            data = parse(response)
+        finally:
+            response.close()
+
+        self._cache.put(
+            self._url, key, data,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+
+        return data
+
+    def _cached(self, key, fetch, ttl=None):
+        """
+        Return the cached data for a key,
+        fetching and storing it if it is missing or stale.
+
+        :param key: The key parts
+        :type key: tuple
+
+        :param fetch: Callable retrieving the data from the index
+        :type fetch: callable
+
+        :param ttl: The time-to-live of the data,
+                    defaults to the one of the cache
+        :type ttl: int or None
+        """
+        entry = self._cache.get(self._url, key)
+        if entry is not None and (self._offline or self._cache.is_fresh(entry)):
+            return entry['data']
+
+        self._check_offline(key[-1], entry)
+
+        data = fetch()
+        self._cache.put(self._url, key, data, ttl=ttl)
+
+        return data
+
+    def _request(self, url, headers=None, stream=False):
+        headers = dict(headers or {})
+        headers.setdefault('Accept', simple_index.ACCEPT)
+
+        return self._session.get(url, headers=headers, stream=stream)
 
-        response = requests.get(url)
+    def _map(self, func, items):
+        """
+        Apply a lookup to items with at most
+        max_in_flight requests at the same time.
 
-        if response.status_code == 404:
-            raise Exception('Package [{}] not found'.format(name))
+        :rtype: OrderedDict
+        """
+        items = list(OrderedDict.fromkeys(items))
+        if len(items) < 2:
+            return OrderedDict((item, func(item)) for item in items)
 
-        response.raise_for_status()
+        pool = ThreadPool(min(self._max_in_flight, len(items)))
+        try:
+            results = pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
 
-        info = response.json()['info']
+        return OrderedDict(zip(items, results))
 
-        return info['name']
+    def _check_offline(self, name, entry):
+        if self._offline and entry is None:
+            raise Exception(
+                'No cached metadata for [{}] (offline mode)'.format(name)
+            )
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+
+from ..version_parser import VersionParser
+
+
+class ReleaseIndex(object):
+    """
+    The releases of a package sorted by version.
+
+    Each version is parsed once and given a precomputed sort key,
+    so that the versions matching a constraint are found
+    by a binary search over its bounds rather than by
+    comparing every version.
+    """
+
+    __slots__ = ('_keys', '_versions', '_pretty_versions')
+
+    def __init__(self, versions):
+        """
+        :param versions: The version strings, invalid ones being ignored
+        :type versions: iterable
+        """
+        entries = []
+        for pretty_version in versions:
+            try:
+                version = VersionParser.coerce_version(pretty_version)
+            except ValueError:
+                continue
+
+            entries.append((self.sort_key(version), version, pretty_version))
+
+        # Sorting is stable so equal versions keep the index order
+        entries.sort(key=lambda e: e[0])
+
+        self._keys = [e[0] for e in entries]
+        self._versions = [e[1] for e in entries]
+        self._pretty_versions = [e[2] for e in entries]
+
+    @classmethod
+    def sort_key(cls, version):
+        """
+        Return a tuple ordering versions like semantic versioning does:
+        a prerelease comes before its release and numeric identifiers
+        come before alphanumeric ones.
+
+        :type version: semantic_version.Version
+
+        :rtype: tuple
+        """
+        if not version.prerelease:
+            return version.major, version.minor, version.patch, (1,)
+
+        identifiers = tuple(
+            (0, int(i), '') if i.isdigit() else (1, 0, i)
+            for i in version.prerelease
+        )
+
+        return version.major, version.minor, version.patch, (0, identifiers)
+
+    def candidates(self, constraint=None):
+        """
+        Return the version strings matching a constraint, lowest first.
+
+        :type constraint: poet.version_constraint.VersionConstraint or None
+
+        :rtype: list
+        """
+        start, end = self._range(constraint)
+
+        return [
+            self._pretty_versions[i] for i in range(start, end)
+            if constraint is None or constraint.contains(self._versions[i])
+        ]
+
+    def best(self, constraint=None):
+        """
+        Return the highest version string matching a constraint, if any.
+
+        :type constraint: poet.version_constraint.VersionConstraint or None
+
+        :rtype: str or None
+        """
+        start, end = self._range(constraint)
+
+        for i in range(end - 1, start - 1, -1):
+            if constraint is None or constraint.contains(self._versions[i]):
+                return self._pretty_versions[i]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _range(self, constraint):
+        """
+        Return the slice of versions within the bounds of a constraint.
+        Excluded versions are checked by the caller.
+        """
+        start, end = 0, len(self._keys)
+        if constraint is None:
+            return start, end
+
+        if constraint.lower is not None:
+            version, inclusive = constraint.lower
+            search = bisect_left if inclusive else bisect_right
+            start = search(self._keys, self.sort_key(version))
+
+        if constraint.upper is not None:
+            version, inclusive = constraint.upper
+            search = bisect_right if inclusive else bisect_left
+            end = search(self._keys, self.sort_key(version))
+
+        return start, max(start, end)
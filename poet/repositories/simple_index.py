@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+import re
+
+try:
+    from html.parser import HTMLParser
+except ImportError:
+    from HTMLParser import HTMLParser
+
+try:
+    from urllib.parse import urljoin, urldefrag
+except ImportError:
+    from urlparse import urljoin, urldefrag
+
+from packaging.utils import canonicalize_name
+
+
+JSON_CONTENT_TYPE = 'application/vnd.pypi.simple.v1+json'
+
+ACCEPT = '{}, text/html;q=0.1'.format(JSON_CONTENT_TYPE)
+
+ARCHIVE_EXTENSIONS = ('.tar.gz', '.tar.bz2', '.tar.xz', '.tgz', '.zip', '.egg')
+
+
+def is_json(response):
+    return response.headers.get('Content-Type', '').startswith(JSON_CONTENT_TYPE)
+
+
+def iter_text(response, chunk_size=16384):
+    """
+    Decode the body of a streamed response chunk by chunk.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(
+        errors='replace'
+    )
+
+    for chunk in response.iter_content(chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_links(response):
+    """
+    Yield the links of an index page as dictionaries
+    mirroring the PEP 691 ones, with absolute URLs.
+
+    :param response: A streamed response
+    :type response: requests.Response
+    """
+    if is_json(response):
+        links = iter_json_array(iter_text(response), 'files')
+    else:
+        links = iter_html_links(iter_text(response))
+
+    for link in links:
+        url, fragment = urldefrag(urljoin(response.url, link['url']))
+        link['url'] = url
+
+        if not link.get('hashes') and '=' in fragment:
+            # PEP 503 hashes are given in the URL fragment
+            algorithm, value = fragment.split('=', 1)
+            link['hashes'] = {algorithm: value}
+
+        if 'core-metadata' not in link:
+            # PEP 714 renamed the PEP 658 key
+            link['core-metadata'] = bool(link.get('dist-info-metadata'))
+        else:
+            link['core-metadata'] = bool(link['core-metadata'])
+
+        yield link
+
+
+def iter_projects(response):
+    """
+    Yield the project names of an index root page.
+
+    :param response: A streamed response
+    :type response: requests.Response
+    """
+    if is_json(response):
+        for element in iter_json_array(iter_text(response), 'projects'):
+            yield element['name']
+
+        return
+
+    for element in iter_html_links(iter_text(response)):
+        yield element['text']
+
+
+def iter_json_array(chunks, key):
+    """
+    Yield, one by one, the elements of the top level array
+    stored under a key of a JSON document without loading
+    the whole document.
+
+    :param chunks: The document text, in chunks
+    :type chunks: iterable
+
+    :param key: The key of the array
+    :type key: str
+    """
+    decoder = json.JSONDecoder()
+    start = re.compile('"{}"\\s*:\\s*\\['.format(re.escape(key)))
+    separator = re.compile('\\s*,?\\s*')
+    buffer = ''
+    found = False
+
+    for chunk in chunks:
+        buffer += chunk
+
+        if not found:
+            m = start.search(buffer)
+            if not m:
+                # Keeping enough to match a key split across chunks
+                buffer = buffer[-(len(key) + 32):]
+
+                continue
+
+            found = True
+            buffer = buffer[m.end():]
+
+        while True:
+            buffer = buffer[separator.match(buffer).end():]
+
+            if buffer.startswith(']'):
+                return
+
+            try:
+                element, end = decoder.raw_decode(buffer)
+            except ValueError:
+                # Incomplete element, waiting for more data
+                break
+
+            buffer = buffer[end:]
+
+            yield element
+
+
+def iter_html_links(chunks):
+    """
+    Yield the anchors of a PEP 503 page as dictionaries.
+
+    :param chunks: The page text, in chunks
+    :type chunks: iterable
+    """
+    parser = _LinkParser()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+
+        for link in parser.flush():
+            yield link
+
+    parser.close()
+
+    for link in parser.flush():
+        yield link
+
+
+def version_from_filename(name, filename):
+    """
+    Extract the version from a distribution filename.
+
+    :param name: The project name
+    :type name: str
+
+    :param filename: The distribution filename
+    :type filename: str
+
+    :rtype: str or None
+    """
+    name = canonicalize_name(name)
+
+    if filename.endswith('.whl'):
+        parts = filename[:-4].split('-')
+        if len(parts) < 5 or canonicalize_name(parts[0]) != name:
+            return
+
+        return parts[1]
+
+    for extension in ARCHIVE_EXTENSIONS:
+        if filename.endswith(extension):
+            stem = filename[:-len(extension)]
+            break
+    else:
+        return
+
+    if extension == '.egg':
+        # name-version-pyX.Y
+        stem = stem.rsplit('-', 1)[0]
+
+    # Project names can contain dashes so we look
+    # for the one separating the name from the version
+    position = stem.find('-')
+    while position != -1:
+        if canonicalize_name(stem[:position]) == name:
+            return stem[position + 1:] or None
+
+        position = stem.find('-', position + 1)
+
+
+class _LinkParser(HTMLParser):
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+
+        self._links = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a':
+            return
+
+        attrs = dict(attrs)
+        metadata = attrs.get(
+            'data-core-metadata', attrs.get('data-dist-info-metadata')
+        )
+
+        self._current = {
+            'url': attrs.get('href', ''),
+            'yanked': 'data-yanked' in attrs,
+            'requires-python': attrs.get('data-requires-python'),
+            'core-metadata': metadata is not None and metadata != 'false',
+            'text': ''
+        }
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current['text'] += data
+
+    def handle_endtag(self, tag):
+        if tag != 'a' or self._current is None:
+            return
+
+        self._current['text'] = self._current['text'].strip()
+        self._current['filename'] = self._current['text']
+        self._links.append(self._current)
+        self._current = None
+
+    def flush(self):
+        links = self._links
+        self._links = []
+
+        return links
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from .cache import ResolutionCache
+from .graph import DependencyGraph
+from .resolution import Resolution
+from .resolver import Resolver
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+
+from packaging.markers import default_environment
+
+from ..repositories.cache import MetadataCache
+
+
+class ResolutionCache(object):
+    """
+    Cache of resolved packages, keyed by a fingerprint
+    of everything the resolution depends on.
+    """
+
+    DEFAULT_TTL = 600
+
+    # To change when the format of resolved packages changes
+    FORMAT = 1
+
+    def __init__(self, cache=None, ttl=DEFAULT_TTL):
+        if cache is None:
+            cache = MetadataCache()
+
+        self._cache = cache
+        self._ttl = ttl
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+    def fingerprint(self, deps, pins=None, index_url=None, environment=None):
+        """
+        Return the fingerprint of a resolution.
+
+        :param deps: The dependencies to resolve
+        :type deps: list[poet.package.PipDependency]
+
+        :param pins: Locked dependencies to keep, keyed by name
+        :type pins: dict or None
+
+        :param index_url: The URL of the index
+        :type index_url: str or None
+
+        :param environment: The markers of the target Python,
+                            defaults to the current one
+        :type environment: dict or None
+
+        :rtype: str
+        """
+        data = {
+            'format': self.FORMAT,
+            'dependencies': sorted(
+                [
+                    dep.normalized_name,
+                    dep.category,
+                    dep.optional,
+                    sorted(str(p) for p in dep.python)
+                ]
+                for dep in deps
+            ),
+            'pins': sorted(
+                [name, pin.constraint, pin.checksum]
+                for name, pin in (pins or {}).items()
+            ),
+            'prereleases': any(dep.accepts_prereleases() for dep in deps),
+            'index': index_url,
+            'environment': environment or default_environment()
+        }
+
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, fingerprint):
+        """
+        Return the packages of a fresh resolution or None.
+
+        :rtype: list[dict] or None
+        """
+        entry = self._cache.get('resolutions', ('resolution', fingerprint))
+        if entry is None or not self._cache.is_fresh(entry):
+            return
+
+        return entry['data']
+
+    def put(self, fingerprint, packages):
+        self._cache.put(
+            'resolutions', ('resolution', fingerprint), packages, ttl=self._ttl
+        )
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+from packaging.utils import canonicalize_name
+
+
+class _Reach(object):
+    """
+    What is known of the root dependencies leading to a package.
+    """
+
+    def __init__(self):
+        self.reached = False
+        self.required = False
+        self.categories = set()
+        self.pythons = set()
+
+    def add_root(self, dependency):
+        self.reached = True
+        self.required = self.required or not dependency.optional
+        self.categories.add(dependency.category)
+        self.pythons.update(str(p) for p in dependency.python)
+
+    def merge(self, other):
+        if not other.reached:
+            return
+
+        self.reached = True
+        self.required = self.required or other.required
+        self.categories |= other.categories
+        self.pythons |= other.pythons
+
+
+class DependencyGraph(object):
+    """
+    Graph of resolved packages propagating the category,
+    optionality and Python restrictions of the root dependencies
+    to every package they require.
+
+    A package is a main one if at least one main root dependency
+    leads to it, optional if only optional ones do and it is
+    installed for every Python version required by them.
+
+    Everything is computed in a single pass, in topological order,
+    packages depending on each other being handled as one.
+    """
+
+    def __init__(self, dependencies, roots):
+        """
+        :param dependencies: The names of the packages required by each package
+        :type dependencies: dict
+
+        :param roots: The root dependencies
+        :type roots: list[poet.package.Dependency]
+        """
+        self._children = {}
+        for parent, children in dependencies.items():
+            self._children.setdefault(canonicalize_name(parent), set()).update(
+                canonicalize_name(child) for child in children
+            )
+
+        self._roots = {}
+        for root in roots:
+            self._roots.setdefault(canonicalize_name(root.name), []).append(root)
+
+        self._reach = None
+
+    def category(self, name):
+        reach = self._get(name)
+        if not reach.reached or 'main' in reach.categories:
+            # Packages only reached through VCS dependencies
+            # are considered main ones to avoid missing them
+            return 'main'
+
+        return 'dev'
+
+    def optional(self, name):
+        reach = self._get(name)
+
+        return reach.reached and not reach.required
+
+    def python(self, name):
+        pythons = self._get(name).pythons
+        if not pythons or '*' in pythons:
+            # If at least one parent gave a wildcard
+            # Then it should be installed for any Python version
+            return ['*']
+
+        return sorted(pythons)
+
+    def _get(self, name):
+        if self._reach is None:
+            self._reach = self._propagate()
+
+        return self._reach.get(canonicalize_name(name)) or _Reach()
+
+    def _propagate(self):
+        components = self._components()
+
+        component_of = {}
+        for i, component in enumerate(components):
+            for name in component:
+                component_of[name] = i
+
+        reaches = [_Reach() for _ in components]
+
+        # Components are found children first
+        for i in reversed(range(len(components))):
+            reach = reaches[i]
+
+            for name in components[i]:
+                for root in self._roots.get(name, []):
+                    reach.add_root(root)
+
+            for name in components[i]:
+                for child in self._children.get(name, ()):
+                    j = component_of[child]
+                    if j != i:
+                        reaches[j].merge(reach)
+
+        return dict(
+            (name, reaches[component_of[name]]) for name in component_of
+        )
+
+    def _components(self):
+        """
+        Return the strongly connected components of the graph,
+        each component appearing after the ones it requires.
+
+        This is an iterative version of Tarjan's algorithm
+        so that deep graphs do not hit the recursion limit.
+        """
+        nodes = set(self._roots) | set(self._children)
+        for children in self._children.values():
+            nodes |= children
+
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for start in sorted(nodes):
+            if start in index:
+                continue
+
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(sorted(self._children.get(start, ()))))]
+
+            while work:
+                node, children = work[-1]
+
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append(
+                            (child, iter(sorted(self._children.get(child, ()))))
+                        )
+
+                        break
+
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            name = stack.pop()
+                            on_stack.discard(name)
+                            component.append(name)
+
+                            if name == node:
+                                break
+
+                        components.append(component)
+
+        return components
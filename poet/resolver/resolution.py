@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+
+class Resolution(object):
+    """
+    The result of a resolution: the selected version
+    of each package and the packages each one requires.
+    """
+
+    def __init__(self, packages, dependencies=None):
+        self._packages = OrderedDict(sorted(packages.items()))
+        self._dependencies = dict(
+            (name, set(children))
+            for name, children in (dependencies or {}).items()
+        )
+
+    @property
+    def packages(self):
+        """
+        :return: The versions keyed by name
+        :rtype: OrderedDict
+        """
+        return self._packages
+
+    @property
+    def dependencies(self):
+        """
+        :return: The names of the packages required by each package
+        :rtype: dict
+        """
+        return self._dependencies
+
+    def reverse_dependencies(self):
+        """
+        :return: The names of the packages requiring each package
+        :rtype: dict
+        """
+        reversed_dependencies = {}
+        for parent, children in self._dependencies.items():
+            for child in children:
+                reversed_dependencies.setdefault(child, set()).add(parent)
+
+        return reversed_dependencies
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+from packaging.markers import default_environment
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
+from packaging.utils import canonicalize_name
+from packaging.version import Version, InvalidVersion
+
+from ..exceptions.resolver import ResolverError, SolverProblemError
+from .resolution import Resolution
+
+
+class Criterion(object):
+    """
+    A requirement on a package, with the package requiring it.
+    """
+
+    def __init__(self, name, specifier, extras=None, parent=None):
+        self.name = name
+        self.specifier = specifier
+        self.extras = frozenset(extras or [])
+        self.parent = parent
+
+    def __repr__(self):
+        return '<Criterion {}{} from {}>'.format(
+            self.name, self.specifier, self.parent or 'root'
+        )
+
+
+class Resolver(object):
+    """
+    Backtracking dependency resolver.
+
+    Packages are decided one at a time, the most constrained first,
+    by trying their highest acceptable version and going back
+    to the previous decision when no version is left.
+
+    Versions of a package are indexed once and the candidates
+    matching a given set of constraints are memoized so that
+    backtracking does not compare the same versions again.
+    Requirements of each release come from the repository,
+    which reads them from wheel metadata.
+    """
+
+    # Maximum number of versions tried before giving up
+    MAX_ROUNDS = 20000
+
+    def __init__(self, repository, prereleases=False, environment=None):
+        self._repository = repository
+        self._prereleases = prereleases
+        self._environment = environment or default_environment()
+
+        try:
+            self._python = Version(self._environment['python_full_version'])
+        except InvalidVersion:
+            self._python = Version(self._environment['python_version'])
+
+        # Sorted, highest first, versions of each package
+        self._versions = {}
+
+        # Candidates for a package and a set of specifiers
+        self._matches = {}
+
+        # Requirements of a release with a set of extras
+        self._requirements = {}
+
+    def resolve(self, dependencies, constraints=None):
+        """
+        Resolve dependencies.
+
+        :param dependencies: The dependencies to resolve
+        :type dependencies: list[poet.package.Dependency]
+
+        :param constraints: Versions to use, keyed by name,
+                            if the packages are required
+        :type constraints: dict or None
+
+        :rtype: Resolution
+        """
+        self._criteria = OrderedDict()
+        self._decisions = OrderedDict()
+        self._extras = {}
+        self._failures = {}
+        self._rounds = 0
+
+        self._pins = {}
+        self._constraints = {}
+        for name, version in (constraints or {}).items():
+            name = canonicalize_name(name)
+
+            self._pins[name] = version
+            self._constraints[name] = SpecifierSet('=={}'.format(version))
+
+        for dependency in dependencies:
+            if dependency.is_vcs_dependency():
+                raise ResolverError(
+                    'VCS dependency [{}] cannot be resolved '
+                    'from an index'.format(dependency.name)
+                )
+
+            name = canonicalize_name(dependency.name)
+            criterion = Criterion(
+                name, self._specifier(dependency.normalized_constraint)
+            )
+
+            self._criteria.setdefault(name, []).append(criterion)
+
+        for name in self._criteria:
+            if not self._candidates(name):
+                self._fail(name, conflict=True)
+
+                raise self._problem()
+
+        if not self._solve():
+            raise self._problem()
+
+        dependencies = {}
+        for name, criteria in self._criteria.items():
+            for criterion in criteria:
+                if criterion.parent is None:
+                    continue
+
+                dependencies.setdefault(criterion.parent[0], set()).add(name)
+
+        return Resolution(self._decisions, dependencies)
+
+    def _solve(self):
+        """
+        Decide a version for every required package, backtracking
+        on conflicts.
+
+        Decisions are tracked with an explicit stack of
+        [name, extras, candidates, changes to undo] frames
+        so that deep dependency trees do not hit the recursion limit.
+        """
+        name = self._next()
+        if name is None:
+            return True
+
+        stack = [self._frame(name)]
+
+        while stack:
+            frame = stack[-1]
+            name, extras, candidates, undo = frame
+
+            if undo is not None:
+                # The decisions made after this one failed
+                self._undo(name, undo)
+                frame[3] = None
+
+            version = next(candidates, None)
+            if version is None:
+                self._fail(name)
+                stack.pop()
+
+                continue
+
+            self._rounds += 1
+            if self._rounds > self.MAX_ROUNDS:
+                raise ResolverError(
+                    'Unable to resolve dependencies '
+                    'after trying {} versions'.format(self.MAX_ROUNDS)
+                )
+
+            requirements = self._requirements_for(name, version, extras)
+            undo, conflict = self._decide(name, version, extras, requirements)
+
+            if conflict is not None:
+                self._fail(conflict, conflict=True)
+                self._undo(name, undo)
+
+                continue
+
+            frame[3] = undo
+
+            name = self._next()
+            if name is None:
+                return True
+
+            stack.append(self._frame(name))
+
+        return False
+
+    def _frame(self, name):
+        return [
+            name,
+            self._requested_extras(name),
+            iter(self._candidates(name)),
+            None
+        ]
+
+    def _next(self):
+        """
+        Return the undecided package with the fewest candidates.
+        """
+        best = None
+        best_count = None
+
+        for name, criteria in self._criteria.items():
+            if not criteria or name in self._decisions:
+                continue
+
+            count = len(self._candidates(name))
+            if best is None or (count, name) < (best_count, best):
+                best, best_count = name, count
+
+        return best
+
+    def _decide(self, name, version, extras, requirements):
+        """
+        Select a version and register its requirements.
+
+        :return: The changes to undo and the name of
+                 the package in conflict, if any
+        :rtype: tuple
+        """
+        self._decisions[name] = version
+        self._extras[name] = extras
+
+        added = []
+        previous_extras = []
+        pending = [(r, (name, version)) for r in requirements]
+
+        while pending:
+            criterion, parent = pending.pop(0)
+            criterion.parent = parent
+
+            self._criteria.setdefault(criterion.name, []).append(criterion)
+            added.append(criterion.name)
+
+            decided = self._decisions.get(criterion.name)
+            if decided is None:
+                if not self._candidates(criterion.name):
+                    return (added, previous_extras), criterion.name
+
+                continue
+
+            if not self._accepts(criterion.specifier, decided):
+                return (added, previous_extras), criterion.name
+
+            decided_extras = self._extras[criterion.name]
+            if criterion.extras - decided_extras:
+                # The extras of an already decided package
+                # bring new requirements
+                new_extras = decided_extras | criterion.extras
+                known = self._requirements_for(
+                    criterion.name, decided, decided_extras
+                )
+                known = set((r.name, str(r.specifier)) for r in known)
+
+                for requirement in self._requirements_for(criterion.name, decided, new_extras):
+                    if (requirement.name, str(requirement.specifier)) not in known:
+                        pending.append((requirement, (criterion.name, decided)))
+
+                previous_extras.append((criterion.name, decided_extras))
+                self._extras[criterion.name] = new_extras
+
+        return (added, previous_extras), None
+
+    def _undo(self, name, undo):
+        added, previous_extras = undo
+
+        for criterion_name in reversed(added):
+            self._criteria[criterion_name].pop()
+
+        for extras_name, extras in reversed(previous_extras):
+            self._extras[extras_name] = extras
+
+        del self._decisions[name]
+        del self._extras[name]
+
+    def _candidates(self, name):
+        """
+        Return the versions of a package matching
+        every criterion on it, highest first.
+
+        :rtype: tuple
+        """
+        specifiers = set(str(c.specifier) for c in self._criteria.get(name, []))
+        if name in self._constraints:
+            specifiers.add(str(self._constraints[name]))
+
+        key = (name, tuple(sorted(specifiers)))
+        if key not in self._matches:
+            specifiers = [SpecifierSet(s) for s in key[1]]
+            prereleases = self._prereleases or any(
+                s.prereleases for s in specifiers
+            )
+
+            self._matches[key] = tuple(
+                pretty for version, pretty in self._versions_of(name)
+                if (prereleases or not version.is_prerelease)
+                and all(s.contains(version, prereleases=True) for s in specifiers)
+            )
+
+        return self._matches[key]
+
+    def _versions_of(self, name):
+        if name not in self._versions:
+            versions = []
+
+            for pretty, files in self._repository.releases(name).items():
+                try:
+                    version = Version(pretty)
+                except InvalidVersion:
+                    continue
+
+                if not self._supports_python(files):
+                    continue
+
+                versions.append((version, pretty))
+
+            self._versions[name] = sorted(versions, reverse=True)
+
+        return self._versions[name]
+
+    def _supports_python(self, files):
+        for f in files:
+            requires_python = f.get('requires-python')
+            if not requires_python:
+                return True
+
+            try:
+                if self._python in SpecifierSet(requires_python):
+                    return True
+            except InvalidSpecifier:
+                return True
+
+        return not files
+
+    def _requirements_for(self, name, version, extras):
+        """
+        Return the criteria that a release imposes.
+
+        :rtype: list[Criterion]
+        """
+        key = (name, version, extras)
+        if key not in self._requirements:
+            self._requirements[key] = self._parse_requirements(
+                name, version, extras
+            )
+
+        # Criteria are completed with their parent when added,
+        # so copies are returned
+        return [
+            Criterion(r.name, r.specifier, r.extras)
+            for r in self._requirements[key]
+        ]
+
+    def _parse_requirements(self, name, version, extras):
+        requirements = []
+        for line in self._repository.dependencies(name, version):
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                continue
+
+            requirement_name = canonicalize_name(requirement.name)
+            if requirement_name == name:
+                # Extras depending on other extras
+                continue
+
+            if requirement.marker is not None:
+                environments = [
+                    dict(self._environment, extra=extra)
+                    for extra in [''] + sorted(extras)
+                ]
+
+                if not any(requirement.marker.evaluate(e) for e in environments):
+                    continue
+
+            requirements.append(
+                Criterion(
+                    requirement_name, requirement.specifier,
+                    extras=requirement.extras
+                )
+            )
+
+        return requirements
+
+    def _requested_extras(self, name):
+        extras = set()
+        for criterion in self._criteria.get(name, []):
+            extras |= criterion.extras
+
+        return frozenset(extras)
+
+    def _accepts(self, specifier, version):
+        return specifier.contains(Version(version), prereleases=True)
+
+    def _specifier(self, constraint):
+        try:
+            return SpecifierSet(constraint or '')
+        except InvalidSpecifier:
+            raise ResolverError(
+                'Invalid constraint [{}]'.format(constraint)
+            )
+
+    def _fail(self, name, conflict=False):
+        """
+        Record a failure on a package: a conflict between
+        its requirements or the exhaustion of its versions.
+        """
+        count, exhausted, _ = self._failures.get(name, (0, 0, None))
+
+        if conflict:
+            count += 1
+        else:
+            exhausted += 1
+
+        self._failures[name] = (
+            count, exhausted, list(self._criteria.get(name, []))
+        )
+
+    def _problem(self):
+        """
+        Explain the failure using the package that caused
+        the most conflicts, which is usually the one
+        whose requirements cannot be met together.
+        """
+        name = sorted(
+            self._failures.items(),
+            key=lambda f: (-f[1][0], -f[1][1], f[0])
+        )[0][0]
+
+        criteria = self._failures[name][2]
+        versions = [pretty for _, pretty in self._versions_of(name)]
+
+        return SolverProblemError(name, criteria, versions[:10], pins=self._pins)
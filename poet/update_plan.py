@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import json
+
+from packaging.version import Version, InvalidVersion
+
+from .package import PipDependency
+
+
+class UpdatePlan(object):
+    """
+    Ordered actions bringing installed dependencies
+    to their newly resolved versions.
+
+    Actions are (action, from, dependency) tuples where action
+    is one of "install", "update" or "remove". Installations
+    and updates come first, the dependencies of a package before it,
+    followed by removals, a package before its dependencies.
+    """
+
+    INSTALL = 'install'
+    UPDATE = 'update'
+    REMOVE = 'remove'
+
+    VERSION = 1
+
+    def __init__(self, actions, packages=None, features=None, lock_hash=None):
+        self._actions = actions
+        self._packages = packages
+        self._features = features
+        self._lock_hash = lock_hash
+
+    @classmethod
+    def compute(cls, deps, current_deps, delete=True,
+                packages=None, features=None, lock_hash=None):
+        """
+        Plan the actions needed to go from
+        the current dependencies to the new ones.
+
+        :param deps: New dependencies
+        :type deps: list[poet.package.PipDependency]
+
+        :param current_deps: Current dependencies
+        :type current_deps: list[poet.package.PipDependency]
+
+        :param delete: Whether to add remove actions or not
+        :type delete: bool
+
+        :param packages: The resolved packages to lock once applied
+        :type packages: list[dict] or None
+
+        :param features: The features to lock once applied
+        :type features: dict or None
+
+        :param lock_hash: The hash of the lock file the plan starts from
+        :type lock_hash: str or None
+
+        :rtype: UpdatePlan
+        """
+        current = dict((dep.name, dep) for dep in current_deps)
+        names = set(dep.name for dep in deps)
+
+        changes = []
+        for dep in deps:
+            from_ = current.get(dep.name)
+
+            if from_ is None:
+                # New dependency. We mark it as to be installed.
+                changes.append((cls.INSTALL, None, dep))
+            elif cls._changed(from_, dep):
+                # If version is different we mark it
+                # as to be updated
+                changes.append((cls.UPDATE, from_, dep))
+
+        removals = []
+        if delete:
+            removals = [
+                (cls.REMOVE, None, dep)
+                for dep in current_deps
+                if dep.name not in names
+            ]
+
+        actions = (
+            cls._order(changes)
+            + list(reversed(cls._order(list(reversed(removals)))))
+        )
+
+        return cls(
+            actions,
+            packages=packages, features=features, lock_hash=lock_hash
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a plan written by dump().
+
+        :rtype: UpdatePlan
+        """
+        with open(path) as f:
+            data = json.loads(f.read())
+
+        if data.get('version') != cls.VERSION:
+            raise Exception(
+                'Unsupported update plan version [{}]'.format(data.get('version'))
+            )
+
+        actions = []
+        for action in data['actions']:
+            from_ = action.get('from')
+            if from_ is not None:
+                from_ = cls._load_dependency(from_)
+
+            actions.append(
+                (action['action'], from_, cls._load_dependency(action['to']))
+            )
+
+        return cls(
+            actions,
+            packages=data.get('packages'),
+            features=data.get('features'),
+            lock_hash=data.get('lock_hash')
+        )
+
+    @property
+    def actions(self):
+        return self._actions
+
+    @property
+    def packages(self):
+        return self._packages
+
+    @property
+    def features(self):
+        return self._features
+
+    @property
+    def lock_hash(self):
+        return self._lock_hash
+
+    def count(self, action):
+        return len([a for a in self._actions if a[0] == action])
+
+    def dump(self, path):
+        """
+        Write the plan, as JSON, so that it can be applied later.
+        """
+        data = {
+            'version': self.VERSION,
+            'actions': [
+                {
+                    'action': action,
+                    'from': self._dump_dependency(from_) if from_ else None,
+                    'to': self._dump_dependency(dep)
+                }
+                for action, from_, dep in self._actions
+            ],
+            'packages': self._packages,
+            'features': self._features,
+            'lock_hash': self._lock_hash
+        }
+
+        with open(path, 'w') as f:
+            f.write(json.dumps(data, indent=2, sort_keys=True))
+
+    def __iter__(self):
+        return iter(self._actions)
+
+    def __len__(self):
+        return len(self._actions)
+
+    @classmethod
+    def _changed(cls, from_, dep):
+        """
+        Return whether two pinned dependencies differ.
+
+        Versions are compared as is, since normalizing them
+        as constraints would, for instance, make 3.7.4.2
+        and 3.7.4.3 or 1.0 and 1.0.post1 look the same.
+
+        :type from_: poet.package.PipDependency
+        :type dep: poet.package.PipDependency
+
+        :rtype: bool
+        """
+        if from_.is_vcs_dependency() or dep.is_vcs_dependency():
+            return from_.normalized_constraint != dep.normalized_constraint
+
+        try:
+            return Version(from_.constraint) != Version(dep.constraint)
+        except InvalidVersion:
+            return from_.constraint != dep.constraint
+
+    @classmethod
+    def _order(cls, actions):
+        """
+        Order actions so that the ones on the dependencies
+        of a package come before the one on the package,
+        keeping the given order otherwise.
+        """
+        position = dict((a[2].name, i) for i, a in enumerate(actions))
+
+        # Number of planned dependencies of each package
+        waiting = [0] * len(actions)
+        dependents = [[] for _ in actions]
+        for i, (_, _, dep) in enumerate(actions):
+            for name in set(dep.dependencies):
+                j = position.get(name)
+                if j is not None and j != i:
+                    waiting[i] += 1
+                    dependents[j].append(i)
+
+        ready = [i for i, count in enumerate(waiting) if not count]
+        heapq.heapify(ready)
+
+        ordered = []
+        while ready:
+            i = heapq.heappop(ready)
+            ordered.append(i)
+
+            for j in dependents[i]:
+                waiting[j] -= 1
+                if not waiting[j]:
+                    heapq.heappush(ready, j)
+
+        if len(ordered) < len(actions):
+            # Packages depending on each other
+            # keep their relative order
+            done = set(ordered)
+            ordered += [i for i in range(len(actions)) if i not in done]
+
+        return [actions[i] for i in ordered]
+
+    @classmethod
+    def _dump_dependency(cls, dep):
+        return {
+            'name': dep.name,
+            'constraint': dep.constraint,
+            'category': dep.category,
+            'checksum': dep.checksum,
+            'dependencies': dep.dependencies
+        }
+
+    @classmethod
+    def _load_dependency(cls, data):
+        return PipDependency(
+            data['name'],
+            data['constraint'],
+            category=data.get('category', 'main'),
+            checksum=data.get('checksum'),
+            dependencies=data.get('dependencies')
+        )
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Thread-safe in-memory cache holding at most max_size entries,
+    the least recently used ones being evicted first.
+
+    Hits and misses are counted so that the cache size
+    can be tuned for a given workload.
+    """
+
+    def __init__(self, max_size=1024):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def get(self, key, factory):
+        """
+        Return the value cached for a key,
+        creating it with factory(key) if needed.
+
+        The factory is called outside of the lock, so that
+        a slow factory does not block other threads. If it raises,
+        nothing is cached.
+
+        :param key: The key
+        :type key: hashable
+
+        :param factory: Callable creating the value from the key
+        :type factory: callable
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries[key] = value
+
+                return value
+
+        value = factory(key)
+
+        with self._lock:
+            # Another thread may have stored it meanwhile,
+            # in which case its value is kept
+            value = self._entries.pop(key, value)
+            self._entries[key] = value
+            self._shrink()
+
+        return value
+
+    def resize(self, max_size):
+        """
+        Change the maximum number of entries,
+        evicting the ones exceeding it.
+
+        :type max_size: int
+        """
+        with self._lock:
+            self._max_size = max_size
+            self._shrink()
+
+    def discard(self, key):
+        """
+        Remove the entry of a key, if any.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self):
+        """
+        :return: The hits, misses, maximum size and current size
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'max_size': self._max_size,
+                'size': len(self._entries)
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _shrink(self):
+        while len(self._entries) > max(self._max_size, 0):
+            self._entries.popitem(last=False)
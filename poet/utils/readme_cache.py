@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import os
+import tempfile
+
+from .._compat import encode, which
+from ..locations import CACHE_DIR
+
+
+def pandoc_fingerprint():
+    """
+    Identify the pandoc executable without running it,
+    by its path, modification time and size.
+
+    :return: The fingerprint or None if pandoc is not on the PATH
+    :rtype: str or None
+    """
+    path = os.environ.get('PYPANDOC_PANDOC') or which('pandoc')
+    if not path:
+        return
+
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+
+    return '{}:{}:{}'.format(path, st.st_mtime, st.st_size)
+
+
+class ReadmeCache(object):
+    """
+    On-disk cache for the reStructuredText conversion
+    of Markdown README files.
+
+    Entries are keyed by the content of the README
+    and the pandoc executable which converted it.
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.path.join(CACHE_DIR, 'readme')
+
+        self._dir = directory
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def get(self, content, pandoc):
+        """
+        Return the converted README or None.
+
+        :param content: The content of the Markdown README
+        :type content: bytes
+
+        :param pandoc: Identifies the pandoc executable
+        :type pandoc: str
+
+        :rtype: str or None
+        """
+        try:
+            with io.open(self._path(content, pandoc),
+                         encoding='utf-8', newline='') as f:
+                return f.read()
+        except (IOError, OSError, ValueError):
+            return
+
+    def put(self, content, pandoc, converted):
+        """
+        Store the converted README.
+
+        :param content: The content of the Markdown README
+        :type content: bytes
+
+        :param pandoc: Identifies the pandoc executable
+        :type pandoc: str
+
+        :param converted: The reStructuredText README
+        :type converted: str
+        """
+        if not os.path.exists(self._dir):
+            try:
+                os.makedirs(self._dir)
+            except OSError:
+                # Created concurrently
+                pass
+
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(encode(converted, ['utf-8']))
+
+            getattr(os, 'replace', os.rename)(
+                tmp, self._path(content, pandoc)
+            )
+        except (IOError, OSError):
+            # The cache is only an optimization
+            pass
+
+    def _path(self, content, pandoc):
+        key = hashlib.sha256(encode(content))
+        key.update(b'\0' + encode(pandoc or ''))
+
+        return os.path.join(self._dir, key.hexdigest() + '.rst')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+
+POOL_SIZE = 10
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+TIMEOUT = 15
+
+_lock = threading.Lock()
+_adapter = None
+_session = None
+
+
+class Session(requests.Session):
+    """
+    Session applying a default timeout to every request.
+    """
+
+    def __init__(self, timeout=TIMEOUT):
+        super(Session, self).__init__()
+
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        return super(Session, self).request(method, url, **kwargs)
+
+
+def configure(pool_size=None, retries=None, backoff_factor=None, timeout=None):
+    """
+    Change the settings of the shared transport.
+
+    The shared session and adapter are created again
+    the next time they are needed.
+    """
+    global POOL_SIZE, RETRIES, BACKOFF_FACTOR, TIMEOUT, _adapter, _session
+
+    with _lock:
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+
+        if retries is not None:
+            RETRIES = retries
+
+        if backoff_factor is not None:
+            BACKOFF_FACTOR = backoff_factor
+
+        if timeout is not None:
+            TIMEOUT = timeout
+
+        _adapter = None
+        _session = None
+
+
+def adapter():
+    """
+    Return the shared, connection-pooled, HTTP adapter.
+
+    :rtype: requests.adapters.HTTPAdapter
+    """
+    global _adapter
+
+    with _lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE,
+                pool_maxsize=POOL_SIZE,
+                max_retries=_retry()
+            )
+
+    return _adapter
+
+
+def session():
+    """
+    Return the shared session used for index traffic.
+
+    :rtype: Session
+    """
+    global _session
+
+    shared_adapter = adapter()
+
+    with _lock:
+        if _session is None:
+            _session = Session(timeout=TIMEOUT)
+            _session.mount('https://', shared_adapter)
+            _session.mount('http://', shared_adapter)
+
+    return _session
+
+
+def _retry():
+    # Only idempotent requests are retried
+    return Retry(
+        total=RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504)
+    )
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from ..locations import CACHE_DIR
+from ..utils.helpers import call
+
+
+class GitMirrors(object):
+    """
+    Cache of bare mirrors of git repositories,
+    used to resolve revisions without checking them out.
+
+    Branches and tags are resolved with "git ls-remote",
+    without any clone. Other revisions, like abbreviated commits,
+    are looked up in a mirror kept under the cache directory
+    and only fetched again when the revision is not found in it.
+    """
+
+    FULL_COMMIT = re.compile('^[0-9a-f]{40}$')
+
+    _locks = {}
+    _locks_lock = threading.Lock()
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.path.join(CACHE_DIR, 'vcs', 'git')
+
+        self._dir = directory
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def resolve(self, url, rev):
+        """
+        Return the commit a revision of a repository points to.
+
+        :param url: The repository URL, optionally prefixed with "git+"
+        :type url: str
+
+        :param rev: A branch, a tag or a commit
+        :type rev: str
+
+        :rtype: str
+        """
+        url = self._url(url)
+
+        if not self.FULL_COMMIT.match(rev):
+            commit = self._ls_remote(url, rev)
+            if commit is not None:
+                return commit
+
+        with self._lock(url):
+            mirror = self.mirror_path(url)
+
+            if os.path.isdir(mirror):
+                commit = self._rev_parse(mirror, rev)
+                if commit is not None:
+                    return commit
+
+                self._git('--git-dir', mirror, 'fetch', '--prune', '--tags', 'origin')
+            else:
+                self._clone(url, mirror)
+
+            commit = self._rev_parse(mirror, rev)
+
+        if commit is None:
+            raise Exception(
+                'Revision [{}] not found in repository [{}]'.format(rev, url)
+            )
+
+        return commit
+
+    def mirror_path(self, url):
+        url = self._url(url)
+        name = url.rstrip('/').rsplit('/', 1)[-1]
+        if not name.endswith('.git'):
+            name += '.git'
+
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(self._dir, '{}-{}'.format(digest, name))
+
+    def _ls_remote(self, url, rev):
+        output = self._git('ls-remote', url, rev, rev + '^{}')
+
+        refs = {}
+        for line in output.splitlines():
+            if '\t' not in line:
+                continue
+
+            commit, ref = line.split('\t', 1)
+            refs[ref.strip()] = commit.strip()
+
+        # Annotated tags are peeled to the commit they point to
+        for ref in ['refs/heads/' + rev,
+                    'refs/tags/{}^{{}}'.format(rev),
+                    'refs/tags/' + rev,
+                    rev]:
+            if ref in refs:
+                return refs[ref]
+
+    def _rev_parse(self, mirror, rev):
+        try:
+            return self._git(
+                '--git-dir', mirror,
+                'rev-parse', '--verify', '--quiet', '{}^{{commit}}'.format(rev)
+            ).strip()
+        except subprocess.CalledProcessError:
+            return
+
+    def _clone(self, url, mirror):
+        directory = os.path.dirname(mirror)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created concurrently
+                pass
+
+        # Cloning next to the mirror, so that an interrupted
+        # clone does not leave a broken mirror behind
+        tmp = '{}.{}.tmp'.format(mirror, os.getpid())
+        try:
+            self._git('clone', '--mirror', '--quiet', url, tmp)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+            raise
+
+        try:
+            os.rename(tmp, mirror)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+            # Another process created the mirror first
+            if not self._is_mirror(mirror):
+                raise
+
+    def _is_mirror(self, path):
+        return (
+            os.path.isdir(path)
+            and os.path.isfile(os.path.join(path, 'HEAD'))
+        )
+
+    def _git(self, *args):
+        return call(['git'] + list(args))
+
+    def _url(self, url):
+        if url.startswith('git+'):
+            url = url[len('git+'):]
+
+        return url
+
+    def _lock(self, url):
+        with self._locks_lock:
+            if url not in self._locks:
+                self._locks[url] = threading.Lock()
+
+            return self._locks[url]
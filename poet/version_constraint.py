@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+from semantic_version import SpecItem, Version
+
+
+class VersionConstraint(object):
+    """
+    A compiled version constraint.
+
+    Caret, tilde and compatible release specifications
+    are turned into explicit bounds once, so that checking versions,
+    combining constraints and converting them to PEP 440
+    do not require to parse or normalize anything again.
+
+    Constraints are shared through the VersionParser cache
+    and must be considered immutable.
+    """
+
+    __slots__ = (
+        '_items', '_lower', '_upper', '_excluded', '_accepts_prereleases'
+    )
+
+    def __init__(self, items, accepts_prereleases=False):
+        """
+        :param items: The (operator, version, PEP 440 representation)
+                      tuples making the constraint
+        :type items: tuple
+
+        :param accepts_prereleases: Whether a prerelease was explicitly given
+        :type accepts_prereleases: bool
+        """
+        self._items = items
+        self._lower = None
+        self._upper = None
+        self._excluded = set()
+        self._accepts_prereleases = accepts_prereleases
+
+        for operator, version, _ in items:
+            if version.prerelease:
+                self._accepts_prereleases = True
+
+            if operator in ('>=', '>', '=='):
+                self._lower = self._tightest(
+                    self._lower, (version, operator != '>'), 1
+                )
+
+            if operator in ('<=', '<', '=='):
+                self._upper = self._tightest(
+                    self._upper, (version, operator != '<'), -1
+                )
+
+            if operator == '!=':
+                self._excluded.add(version)
+
+        self._excluded = frozenset(self._excluded)
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Compile a parsed specification.
+
+        :type spec: semantic_version.Spec
+
+        :rtype: VersionConstraint
+        """
+        items = []
+        accepts_prereleases = False
+        for spec_item in spec.specs:
+            items.extend(cls._compile(spec_item))
+
+            if spec_item.kind != SpecItem.KIND_ANY and spec_item.spec.prerelease:
+                accepts_prereleases = True
+
+        return cls(tuple(items), accepts_prereleases)
+
+    @property
+    def lower(self):
+        """
+        :return: The lower bound and whether it is inclusive, if any
+        :rtype: tuple or None
+        """
+        return self._lower
+
+    @property
+    def upper(self):
+        """
+        :return: The upper bound and whether it is inclusive, if any
+        :rtype: tuple or None
+        """
+        return self._upper
+
+    @property
+    def excluded(self):
+        return self._excluded
+
+    def accepts_prereleases(self):
+        return self._accepts_prereleases
+
+    def is_any(self):
+        return not self._items
+
+    def is_empty(self):
+        if self._lower is None or self._upper is None:
+            return False
+
+        lower, lower_inclusive = self._lower
+        upper, upper_inclusive = self._upper
+
+        if lower != upper:
+            return lower > upper
+
+        return not (lower_inclusive and upper_inclusive) or lower in self._excluded
+
+    def contains(self, version):
+        """
+        Check whether a version satisfies the constraint.
+
+        Like in PEP 440, an exclusive upper bound
+        excludes the prereleases of the bound itself.
+
+        :type version: Version
+        """
+        if self._lower is not None:
+            lower, inclusive = self._lower
+            if version < lower or (not inclusive and version == lower):
+                return False
+
+        if self._upper is not None:
+            upper, inclusive = self._upper
+            if version > upper or (not inclusive and version == upper):
+                return False
+
+            if (not inclusive and version.prerelease and not upper.prerelease
+                    and version.major == upper.major
+                    and version.minor == upper.minor
+                    and version.patch == upper.patch):
+                return False
+
+        return version not in self._excluded
+
+    def filter(self, versions):
+        for version in versions:
+            if self.contains(version):
+                yield version
+
+    def intersect(self, other):
+        """
+        Return the constraint satisfied by the versions
+        satisfying both this one and another one.
+
+        :type other: VersionConstraint
+
+        :rtype: VersionConstraint
+        """
+        items = list(self._items)
+        for item in other._items:
+            if item not in items:
+                items.append(item)
+
+        return self.__class__(
+            tuple(items),
+            self._accepts_prereleases or other._accepts_prereleases
+        )
+
+    def to_pep440(self):
+        # The upper bound of compatible releases is implied
+        return ','.join(item[2] for item in self._items if item[2])
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionConstraint):
+            return NotImplemented
+
+        return self._items == other._items
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._items)
+
+    def __str__(self):
+        return self.to_pep440()
+
+    def __repr__(self):
+        return '<VersionConstraint {}>'.format(self.to_pep440() or '*')
+
+    @classmethod
+    def _tightest(cls, current, bound, direction):
+        if current is None:
+            return bound
+
+        if current[0] == bound[0]:
+            # An exclusive bound is tighter
+            return current if not current[1] else bound
+
+        if (bound[0] > current[0]) == (direction > 0):
+            return bound
+
+        return current
+
+    @classmethod
+    def _compile(cls, spec_item):
+        kind = spec_item.kind
+        if kind == SpecItem.KIND_ANY:
+            return []
+
+        version = spec_item.spec
+        major, minor, patch, prerelease = (
+            version.major, version.minor, version.patch, version.prerelease
+        )
+        current = Version('{}.{}.{}'.format(major, minor or 0, patch or 0))
+        pretty = str(current)
+        if prerelease:
+            pretty += ''.join(prerelease)
+            lower = Version('{}-{}'.format(current, '.'.join(prerelease)))
+        else:
+            lower = current
+
+        if kind == SpecItem.KIND_CARET:
+            if current.major != 0 or minor is None:
+                upper = current.next_major()
+            elif current.minor != 0 or patch is None:
+                upper = current.next_minor()
+            else:
+                upper = current.next_patch()
+
+            return [
+                ('>=', lower, '>=' + pretty),
+                ('<', upper, '<{}'.format(upper))
+            ]
+
+        if kind == SpecItem.KIND_TILDE:
+            if minor is None and patch is None:
+                upper = current.next_major()
+            else:
+                upper = current.next_minor()
+
+            # Prereleases are not kept by tilde constraints
+            return [
+                ('>=', current, '>={}'.format(current)),
+                ('<', upper, '<{}'.format(upper))
+            ]
+
+        if kind == SpecItem.KIND_COMPATIBLE:
+            # Like in PEP 440, the last given part is the one
+            # allowed to change so ~=1.4 means >=1.4,<2.0
+            # and is kept as is rather than padded to ~=1.4.0
+            if patch is None:
+                upper = current.next_major()
+                pretty = '{}.{}'.format(major, minor or 0)
+                if prerelease:
+                    pretty += ''.join(prerelease)
+            else:
+                upper = current.next_minor()
+
+            return [
+                ('>=', lower, kind + pretty),
+                ('<', upper, '')
+            ]
+
+        if kind == SpecItem.KIND_SHORTEQ or kind == SpecItem.KIND_EMPTY:
+            kind = SpecItem.KIND_EQUAL
+
+        return [(kind, lower, kind + pretty)]
@@ -4,10 +4,21 @@ import re
 
 from semantic_version import Spec, Version
 
+from .utils.lru import LRUCache
+from .version_constraint import VersionConstraint
+
 
 class VersionParser(object):
 
-    _constraints = {}
+    DEFAULT_CACHE_SIZE = 1024
+
+    # Parsed objects are shared, so they must never be modified.
+    # Caches are bounded since poet can be used as a library
+    # by long-running processes.
+    _constraints = LRUCache(DEFAULT_CACHE_SIZE)
+    _specs = LRUCache(DEFAULT_CACHE_SIZE)
+    _versions = LRUCache(DEFAULT_CACHE_SIZE)
+    _compiled = LRUCache(DEFAULT_CACHE_SIZE)
 
     def parse_constraints(self, constraints):
         if not isinstance(constraints, list):
@@ -15,17 +26,81 @@ class VersionParser(object):
         else:
             constraints = ','.join(constraints)
 
-        if constraints not in self.__class__._constraints:
-            specs = Spec(constraints)
+        return self.__class__._constraints.get(constraints, Spec)
+
+    @classmethod
+    def parse_constraint(cls, constraint):
+        """
+        Parse and compile a version constraint.
+
+        :type constraint: str or VersionConstraint
+
+        :rtype: VersionConstraint
+        """
+        if isinstance(constraint, VersionConstraint):
+            return constraint
+
+        return cls._compiled.get(constraint, cls._compile)
+
+    @classmethod
+    def parse_spec(cls, spec):
+        """
+        Parse a version specification, a version
+        which is not a valid specification being coerced.
+
+        :type spec: str
+
+        :rtype: Spec
+        """
+        return cls._specs.get(spec, cls._make_spec)
+
+    @classmethod
+    def coerce_version(cls, version):
+        """
+        Coerce a version string into a Version.
+
+        :type version: str or Version
 
-            self.__class__._constraints[constraints] = specs
+        :rtype: Version
+        """
+        if isinstance(version, Version):
+            return version
 
-        return self.__class__._constraints[constraints]
+        return cls._versions.get(version, Version.coerce)
+
+    @classmethod
+    def set_cache_size(cls, size):
+        """
+        Change the number of constraints,
+        specifications and versions kept in cache.
+
+        :type size: int
+        """
+        for cache in cls._caches():
+            cache.resize(size)
+
+    @classmethod
+    def cache_info(cls):
+        """
+        Return the statistics of each cache.
+
+        :rtype: dict
+        """
+        return {
+            'constraints': cls._constraints.info(),
+            'specs': cls._specs.info(),
+            'versions': cls._versions.info(),
+            'compiled': cls._compiled.info()
+        }
+
+    @classmethod
+    def clear_cache(cls):
+        for cache in cls._caches():
+            cache.clear()
 
     @classmethod
     def parse_stability(cls, version):
-        if not isinstance(version, Version):
-            version = Version.coerce(version)
+        version = cls.coerce_version(version)
 
         if version.prerelease:
             return 'dev'
@@ -52,3 +127,18 @@ class VersionParser(object):
                 })
 
         return result
+
+    @classmethod
+    def _caches(cls):
+        return cls._constraints, cls._specs, cls._versions, cls._compiled
+
+    @classmethod
+    def _compile(cls, constraint):
+        return VersionConstraint.from_spec(cls.parse_spec(constraint))
+
+    @classmethod
+    def _make_spec(cls, spec):
+        try:
+            return Spec(spec)
+        except ValueError:
+            return Spec(str(cls.coerce_version(spec)))
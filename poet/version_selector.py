@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from .package import Package
 from .version_parser import VersionParser
 
 
@@ -12,23 +13,16 @@ class VersionSelector(object):
     def find_best_candidate(self, package_name, target_package_version=None,
                             preferred_stability='stable'):
         if target_package_version:
-            constraint = self._parser.parse_constraints(target_package_version)
+            constraint = self._parser.parse_constraint(target_package_version)
         else:
             constraint = None
 
-        candidates = self._repository.find_packages(package_name, constraint)
+        version = self._repository.release_index(package_name).best(constraint)
 
-        if not candidates:
+        if version is None:
             return False
 
-        # Select highest version if we have many
-        package = candidates[0]
-        for candidate in candidates:
-            # Select highest version of the two
-            if package.version < candidate.version:
-                package = candidate
-
-        return package
+        return Package(package_name, version)
 
     def find_recommended_require_version(self, package):
         version = package.version
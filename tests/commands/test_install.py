@@ -5,10 +5,12 @@ import tempfile
 import pytest
 
 from cleo import CommandTester
+from packaging.markers import default_environment
 from poet.console import Application
 from poet.console.commands import InstallCommand as BaseCommand
 from poet.poet import Poet as BasePoet
-from pip.req.req_install import InstallRequirement
+from poet.package import PipDependency
+from poet.resolver import Resolution
 
 fd, DUMMY_LOCK = tempfile.mkstemp(prefix='poet_lock_')
 os.close(fd)
@@ -44,12 +46,17 @@ class InstallCommand(BaseCommand):
     def python(self):
         return 'python'
 
+    @property
+    def marker_environment(self):
+        return default_environment()
+
 
 def test_install_default(mocker, check_output):
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve.return_value = [InstallRequirement.from_line('pendulum==1.2.0')]
-    reverse_dependencies.return_value = {}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    resolve.return_value = Resolution({'pendulum': '1.2.0'})
+    mocker.patch('poet.repositories.PyPiRepository.hashes', return_value=[])
+    installed = mocker.patch('poet.installer.Installer._installed_dependencies')
+    installed.return_value = []
     app = Application()
     app.add(InstallCommand())
 
@@ -90,3 +97,36 @@ def test_install_invalid_feature(app):
             ('--features', ['invalid']),
             ('--no-progress', True)
         ])
+
+
+def test_install_already_installed(mocker, check_output):
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    resolve.return_value = Resolution({'pendulum': '1.2.0'})
+    mocker.patch('poet.repositories.PyPiRepository.hashes', return_value=[])
+    installed = mocker.patch('poet.installer.Installer._installed_dependencies')
+    installed.return_value = [PipDependency('pendulum', '1.2.0')]
+    app = Application()
+    app.add(InstallCommand())
+
+    command = app.find('install')
+    command_tester = CommandTester(command)
+    command_tester.execute([('command', command.name), ('--no-progress', True)])
+
+    assert os.path.exists(DUMMY_LOCK)
+    os.remove(DUMMY_LOCK)
+
+    assert 0 == check_output.call_count
+
+    output = command_tester.get_display()
+    expected = """
+Locking dependencies to poetry.lock
+
+ - Resolving dependencies
+ - Writing dependencies
+
+Installing dependencies
+
+ - Dependencies already installed!
+"""
+
+    assert output == expected
@@ -4,8 +4,8 @@ import os
 import shutil
 
 from cleo.testers import CommandTester
-from pip.req.req_install import InstallRequirement
 from poet.poet import Poet
+from poet.resolver import Resolution
 
 
 def test_command(app, mocker, tmp_dir):
@@ -16,10 +16,9 @@ def test_command(app, mocker, tmp_dir):
     shutil.copy(os.path.join(fixtures, 'README.rst'), readme)
     requirements_file = os.path.join(tmp_dir, 'requirements.txt')
 
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve.return_value = [InstallRequirement.from_line('pendulum==1.2.0')]
-    reverse_dependencies.return_value = {}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    resolve.return_value = Resolution({'pendulum': '1.2.0'})
+    mocker.patch('poet.repositories.PyPiRepository.hashes', return_value=[])
     poet = Poet(poetry_file)
     poet_prop = mocker.patch('poet.console.commands.command.Command.poet', poet)
     poet_prop.return_value = poet
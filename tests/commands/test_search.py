@@ -6,55 +6,38 @@ from cleo import CommandTester
 from poet.console import Application
 
 
-RESULTS_RESPONSE = """<?xml version='1.0'?>
-<methodResponse>
-    <params>
-        <param>
-            <value>
-                <array>
-                    <data>
-                        <value>
-                            <struct>
-                                <member>
-                                    <name>_pypi_ordering</name>
-                                    <value>
-                                        <boolean>0</boolean>
-                                    </value>
-                                </member>
-                                <member>
-                                    <name>version</name>
-                                    <value>
-                                        <string>0.6.0</string>
-                                    </value>
-                                </member>
-                                <member>
-                                    <name>name</name>
-                                    <value>
-                                        <string>pendulum</string>
-                                    </value>
-                                </member>
-                                <member>
-                                    <name>summary</name>
-                                    <value>
-                                        <string>Python datetimes made easy.</string>
-                                    </value>
-                                </member>
-                            </struct>
-                        </value>
-                    </data>
-                </array>
-            </value>
-        </param>
-    </params>
-</methodResponse>"""
+SIMPLE_RESPONSE = """<!DOCTYPE html>
+<html>
+  <head>
+    <title>Simple index</title>
+  </head>
+  <body>
+    <a href="/simple/pendulum/">pendulum</a>
+    <a href="/simple/pytzdata/">pytzdata</a>
+    <a href="/simple/requests/">requests</a>
+  </body>
+</html>"""
+
+JSON_RESPONSE = """{
+    "info": {
+        "name": "pendulum",
+        "summary": "Python datetimes made easy.",
+        "version": "0.6.0"
+    }
+}"""
 
 
 @httpretty.activate
 def test_search_with_results():
     httpretty.register_uri(
-        httpretty.POST, 'https://pypi.python.org/pypi',
-        body=RESULTS_RESPONSE,
-        content_type='text/xml'
+        httpretty.GET, 'https://pypi.python.org/simple/',
+        body=SIMPLE_RESPONSE,
+        content_type='text/html'
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/pypi/pendulum/json',
+        body=JSON_RESPONSE,
+        content_type='application/json'
     )
 
     app = Application()
@@ -63,7 +46,8 @@ def test_search_with_results():
     command_tester = CommandTester(command)
     command_tester.execute([
         ('command', command.get_name()),
-        ('tokens', ['pendulum'])
+        ('tokens', ['pendulum']),
+        ('--only-name', True)
     ])
 
     output = command_tester.get_display()
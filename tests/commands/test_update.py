@@ -3,10 +3,27 @@
 import os
 
 from cleo import CommandTester
+from packaging.markers import default_environment
 from poet.console import Application
 from poet.console.commands import UpdateCommand as BaseCommand
 from poet.poet import Poet as BasePoet
-from pip.req.req_install import InstallRequirement
+from poet.resolver import Resolution
+
+
+HASHES = {
+    'pendulum': [
+        "sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52",
+        "sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a"
+    ],
+    'pytest': [
+        "sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017",
+        "sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab"
+    ],
+    'requests': [
+        "sha256:5722cd09762faa01276230270ff16af7acf7c5c45d623868d9ba116f15791ce8",
+        "sha256:1a720e8862a41aa22e339373b526f508ef0c8988baf48b84d3fc891a8e237efb"
+    ]
+}
 
 
 class Poet(BasePoet):
@@ -27,30 +44,21 @@ class UpdateCommand(BaseCommand):
     def pip(self):
         return 'pip'
 
+    @property
+    def marker_environment(self):
+        return default_environment()
+
 
 def test_update_only_update(mocker):
     sub = mocker.patch('subprocess.check_output')
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    get_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    reverse_dependencies.return_value = {}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
     write_lock = mocker.patch('poet.installer.Installer._write_lock')
-    pendulum_req = InstallRequirement.from_line('pendulum==1.3.0')
-    pytest_req = InstallRequirement.from_line('pytest==3.5.0')
-    resolve.return_value = [
-        pendulum_req,
-        pytest_req
-    ]
-    get_hashes.return_value = {
-        pendulum_req: set([
-            "sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52",
-            "sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a"
-        ]),
-        pytest_req: set([
-            "sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017",
-            "sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab"
-        ])
-    }
+    resolve.return_value = Resolution({
+        'pendulum': '1.3.0',
+        'pytest': '3.5.0'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
     app = Application()
     app.add(UpdateCommand())
 
@@ -76,27 +84,14 @@ Updating dependencies
 
 def test_update_specific_packages(mocker):
     sub = mocker.patch('subprocess.check_output')
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    get_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    reverse_dependencies.return_value = {}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
     write_lock = mocker.patch('poet.installer.Installer._write_lock')
-    pendulum_req = InstallRequirement.from_line('pendulum==1.3.0')
-    pytest_req = InstallRequirement.from_line('pytest==3.5.0')
-    resolve.return_value = [
-        pendulum_req,
-        pytest_req
-    ]
-    get_hashes.return_value = {
-        pendulum_req: set([
-            "sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52",
-            "sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a"
-        ]),
-        pytest_req: set([
-            "sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017",
-            "sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab"
-        ])
-    }
+    resolve.return_value = Resolution({
+        'pendulum': '1.3.0',
+        'pytest': '3.5.0'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
     app = Application()
     app.add(UpdateCommand())
 
@@ -119,35 +114,40 @@ Updating dependencies
     assert output == expected
 
 
+def test_update_does_not_reuse_cached_resolutions(mocker):
+    mocker.patch('subprocess.check_output')
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
+    mocker.patch('poet.installer.Installer._write_lock')
+    resolve.return_value = Resolution({
+        'pendulum': '1.3.0',
+        'pytest': '3.5.0'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
+    app = Application()
+    app.add(UpdateCommand())
+
+    command = app.find('update')
+    command_tester = CommandTester(command)
+    command_tester.execute([('command', command.name), ('--no-progress', True)])
+    command_tester.execute([('command', command.name), ('--no-progress', True)])
+    command_tester.execute([('command', command.name), ('packages', ['pendulum']), ('--no-progress', True)])
+    command_tester.execute([('command', command.name), ('packages', ['pendulum']), ('--no-progress', True)])
+
+    assert 4 == resolve.call_count
+
+
 def test_update_with_new_packages(mocker):
     sub = mocker.patch('subprocess.check_output')
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    get_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    reverse_dependencies.return_value = {'requests': set()}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
     write_lock = mocker.patch('poet.installer.Installer._write_lock')
-    pendulum_req = InstallRequirement.from_line('pendulum==1.3.0')
-    pytest_req = InstallRequirement.from_line('pytest==3.5.0')
-    requests_req = InstallRequirement.from_line('requests==2.13.0')
-    resolve.return_value = [
-        pendulum_req,
-        pytest_req,
-        requests_req
-    ]
-    get_hashes.return_value = {
-        pendulum_req: set([
-            "sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52",
-            "sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a"
-        ]),
-        pytest_req: set([
-            "sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017",
-            "sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab"
-        ]),
-        requests_req: set([
-            "sha256:5722cd09762faa01276230270ff16af7acf7c5c45d623868d9ba116f15791ce8",
-            "sha256:1a720e8862a41aa22e339373b526f508ef0c8988baf48b84d3fc891a8e237efb"
-        ])
-    }
+    resolve.return_value = Resolution({
+        'pendulum': '1.3.0',
+        'pytest': '3.5.0',
+        'requests': '2.13.0'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
     app = Application()
     app.add(UpdateCommand())
 
@@ -174,27 +174,14 @@ Updating dependencies
 
 def test_update_with_no_updates(mocker):
     sub = mocker.patch('subprocess.check_output')
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    get_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    reverse_dependencies.return_value = {}
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
     write_lock = mocker.patch('poet.installer.Installer._write_lock')
-    pendulum_req = InstallRequirement.from_line('pendulum==1.2.0')
-    pytest_req = InstallRequirement.from_line('pytest==3.0.7')
-    resolve.return_value = [
-        pendulum_req,
-        pytest_req
-    ]
-    get_hashes.return_value = {
-        pendulum_req: set([
-            "sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52",
-            "sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a"
-        ]),
-        pytest_req: set([
-            "sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017",
-            "sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab"
-        ])
-    }
+    resolve.return_value = Resolution({
+        'pendulum': '1.2.0',
+        'pytest': '3.0.7'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
     app = Application()
     app.add(UpdateCommand())
 
@@ -214,3 +201,51 @@ Updating dependencies
 """
 
     assert output == expected
+
+
+def test_update_dry_run_and_apply_plan(mocker, tmp_dir):
+    sub = mocker.patch('subprocess.check_output')
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
+    write_lock = mocker.patch('poet.installer.Installer._write_lock')
+    resolve.return_value = Resolution({
+        'pendulum': '1.3.0',
+        'pytest': '3.5.0'
+    })
+    hashes.side_effect = lambda name, version: HASHES[name]
+    plan = os.path.join(tmp_dir, 'plan.json')
+    app = Application()
+    app.add(UpdateCommand())
+
+    command = app.find('update')
+    command_tester = CommandTester(command)
+    command_tester.execute([
+        ('command', command.name), ('--dry-run', True), ('--plan', plan),
+        ('--no-progress', True)
+    ])
+
+    assert sub.call_count == 0
+    assert write_lock.call_count == 0
+
+    output = command_tester.get_display()
+    expected = """
+Updating dependencies
+
+ - Resolving dependencies
+ - Summary: 2 updates
+ - Updating pendulum (1.2.0 -> 1.3.0)
+ - Updating pytest (3.0.7 -> 3.5.0)
+ - Plan written to {}
+""".format(plan)
+
+    assert output == expected
+
+    resolve.reset_mock()
+    command_tester.execute([
+        ('command', command.name), ('--plan', plan), ('--no-progress', True)
+    ])
+
+    assert resolve.call_count == 0
+    assert sub.call_count == 2
+    write_lock.assert_called_once()
+    assert ['pendulum', 'pytest'] == [p['name'] for p in write_lock.call_args[0][0]]
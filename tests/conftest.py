@@ -50,6 +50,20 @@ def check_output(mocker):
     return patched
 
 
+@pytest.fixture(autouse=True)
+def metadata_cache(mocker):
+    dir_ = tempfile.mkdtemp(prefix='poet_cache_')
+    mocker.patch('poet.repositories.cache.CACHE_DIR', dir_)
+    mocker.patch('poet.build.file_index.CACHE_DIR', dir_)
+    mocker.patch('poet.build.build_cache.CACHE_DIR', dir_)
+    mocker.patch('poet.utils.readme_cache.CACHE_DIR', dir_)
+    mocker.patch('poet.vcs.git.CACHE_DIR', dir_)
+
+    yield dir_
+
+    shutil.rmtree(dir_)
+
+
 @pytest.fixture
 def tmp_dir():
     dir_ = tempfile.mkdtemp(prefix='poet_')
@@ -141,3 +141,22 @@ def test_python_restricted_dependency():
     assert not dep.is_vcs_dependency()
     assert not dep.accepts_prereleases()
     assert ['~2.7'] == [str(dep.python[0])]
+
+
+def test_dependencies_are_compact():
+    dep = Dependency('foo', '^1.2')
+    other = Dependency(''.join(['f', 'oo']), {'version': '^1.2', 'python': '~2.7'})
+
+    assert not hasattr(dep, '__dict__')
+    assert dep.name is other.name
+    assert dep.python[0] is Dependency('bar', '^1').python[0]
+    assert not dep.is_python_restricted()
+    assert other.is_python_restricted()
+
+
+def test_constraint_is_normalized_lazily():
+    dep = Dependency('foo', '^1.2.0-b1')
+
+    assert dep._normalized_constraint is None
+    assert dep.accepts_prereleases()
+    assert '>=1.2.0b1,<2.0.0' == dep._normalized_constraint
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet.repositories import InstalledRepository
+
+
+def test_packages(tmp_dir):
+    os.mkdir(os.path.join(tmp_dir, 'pendulum-1.2.0.dist-info'))
+    os.mkdir(os.path.join(tmp_dir, 'python_dateutil-2.6.0.dist-info'))
+    os.mkdir(os.path.join(tmp_dir, 'pytzdata-2017.2-py3.6.egg-info'))
+    os.mkdir(os.path.join(tmp_dir, 'pendulum'))
+
+    repository = InstalledRepository([tmp_dir])
+
+    assert {
+        'pendulum': '1.2.0',
+        'python-dateutil': '2.6.0',
+        'pytzdata': '2017.2'
+    } == dict(repository.packages)
+    assert '2.6.0' == repository.version('python_dateutil')
+    assert repository.version('requests') is None
+
+
+def test_packages_without_version_in_directory_name(tmp_dir):
+    egg_info = os.path.join(tmp_dir, 'my_package.egg-info')
+    os.mkdir(egg_info)
+
+    with open(os.path.join(egg_info, 'PKG-INFO'), 'w') as f:
+        f.write('Metadata-Version: 1.1\nName: my-package\nVersion: 0.1.0\n')
+
+    repository = InstalledRepository([tmp_dir])
+
+    assert '0.1.0' == repository.version('my-package')
+
+
+def test_first_path_wins(tmp_dir):
+    first = os.path.join(tmp_dir, 'first')
+    second = os.path.join(tmp_dir, 'second')
+    os.makedirs(os.path.join(first, 'pendulum-1.3.0.dist-info'))
+    os.makedirs(os.path.join(second, 'pendulum-1.2.0.dist-info'))
+
+    repository = InstalledRepository([first, os.path.join(tmp_dir, 'missing'), second])
+
+    assert '1.3.0' == repository.version('pendulum')
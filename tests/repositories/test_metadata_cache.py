@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import time
+
+import pytest
+
+from poet.repositories import PyPiRepository
+from poet.repositories.cache import MetadataCache
+
+
+def test_put_and_get(tmp_dir):
+    cache = MetadataCache(tmp_dir)
+    cache.put('https://pypi.python.org/pypi', ('releases', 'pendulum'), ['1.2.0'])
+
+    entry = cache.get('https://pypi.python.org/pypi', ('releases', 'pendulum'))
+
+    assert ['1.2.0'] == entry['data']
+    assert cache.is_fresh(entry)
+    assert cache.get('https://example.com/simple', ('releases', 'pendulum')) is None
+
+
+def test_entries_expire(tmp_dir):
+    cache = MetadataCache(tmp_dir, ttl=0)
+    cache.put('https://pypi.python.org/pypi', ('releases', 'pendulum'), ['1.2.0'])
+
+    entry = cache.get('https://pypi.python.org/pypi', ('releases', 'pendulum'))
+
+    assert not cache.is_fresh(entry)
+    assert cache.is_fresh(
+        cache.refresh('https://pypi.python.org/pypi', ('releases', 'pendulum'), dict(entry, ttl=60))
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_dir):
+    url = 'https://pypi.python.org/pypi'
+    entry_size = len(json.dumps(MetadataCache(tmp_dir).put(url, ('releases', 'foo'), ['1.0.0'])))
+    cache = MetadataCache(tmp_dir, max_size=int(entry_size * 2.5))
+
+    cache.put(url, ('releases', 'bar'), ['1.0.0'])
+
+    # Making sure "foo" is the most recently used
+    past = time.time() - 100
+    for root, _, files in os.walk(tmp_dir):
+        for filename in files:
+            os.utime(os.path.join(root, filename), (past, past))
+
+    cache.get(url, ('releases', 'foo'))
+    cache.put(url, ('releases', 'baz'), ['1.0.0'])
+
+    assert cache.get(url, ('releases', 'bar')) is None
+    assert cache.get(url, ('releases', 'foo')) is not None
+    assert cache.get(url, ('releases', 'baz')) is not None
+
+
+def test_size_is_tracked_incrementally(mocker, tmp_dir):
+    url = 'https://pypi.python.org/pypi'
+    cache = MetadataCache(tmp_dir)
+    entries = mocker.spy(cache, '_entries')
+
+    for name in ['foo', 'bar', 'baz']:
+        cache.put(url, ('releases', name), ['1.0.0'])
+
+    # Only the first write scans the cache
+    assert 1 == entries.call_count
+
+
+def test_decoded_entries_are_kept(mocker, tmp_dir):
+    url = 'https://pypi.python.org/pypi'
+    MetadataCache(tmp_dir).put(url, ('releases', 'foo'), ['1.0.0'])
+    cache = MetadataCache(tmp_dir)
+    loads = mocker.spy(json, 'loads')
+
+    assert ['1.0.0'] == cache.get(url, ('releases', 'foo'))['data']
+    assert ['1.0.0'] == cache.get(url, ('releases', 'foo'))['data']
+    assert 1 == loads.call_count
+
+    # Entries written again are read again
+    MetadataCache(tmp_dir).put(url, ('releases', 'foo'), ['2.0.0'])
+
+    assert ['2.0.0'] == cache.get(url, ('releases', 'foo'))['data']
+
+
+def test_decoded_entries_are_copied(tmp_dir):
+    url = 'https://pypi.python.org/pypi'
+    cache = MetadataCache(tmp_dir)
+    cache.put(url, ('releases', 'foo'), [['1.0.0', {'url': 'foo'}]])
+
+    entry = cache.get(url, ('releases', 'foo'))
+    entry['data'][0][1]['url'] = 'bar'
+    entry['data'].append(['2.0.0', {}])
+
+    assert [['1.0.0', {'url': 'foo'}]] == cache.get(url, ('releases', 'foo'))['data']
+
+
+def test_memory_hits_are_recently_used(tmp_dir):
+    url = 'https://pypi.python.org/pypi'
+    cache = MetadataCache(tmp_dir)
+    cache.put(url, ('releases', 'foo'), ['1.0.0'])
+    cache.get(url, ('releases', 'foo'))
+
+    path = cache._path(url, ('releases', 'foo'))
+    past = time.time() - 100
+    os.utime(path, (past, os.stat(path).st_mtime))
+
+    cache.get(url, ('releases', 'foo'))
+
+    assert os.stat(path).st_atime > past + 50
+
+
+def test_repository_uses_cache(mocker, tmp_dir):
+    request = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request'
+    )
+    releases = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._releases'
+    )
+    request.return_value.status_code = 200
+    request.return_value.headers = {}
+    releases.return_value = [['1.2.0', []], ['1.3.0', []]]
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+
+    assert ['1.2.0', '1.3.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert ['1.2.0', '1.3.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert 1 == request.call_count
+
+
+def test_release_indexes_follow_cache_freshness(mocker, tmp_dir):
+    request = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request'
+    )
+    request.return_value.status_code = 304
+    request.return_value.headers = {}
+    cache = MetadataCache(tmp_dir, ttl=0)
+    cache.put(PyPiRepository.DEFAULT_URL, ('files', 'pendulum'), [['1.2.0', []]], etag='"abcdef"')
+
+    repository = PyPiRepository(cache=cache)
+
+    # Stale releases are revalidated every time
+    assert ['1.2.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert ['1.2.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert 2 == request.call_count
+
+    # New releases are seen as soon as they are cached
+    cache.put(PyPiRepository.DEFAULT_URL, ('files', 'pendulum'), [['1.2.0', []], ['1.3.0', []]], ttl=60)
+
+    assert ['1.2.0', '1.3.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert ['1.2.0', '1.3.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert 2 == request.call_count
+
+
+def test_repository_offline_uses_stale_entries(mocker, tmp_dir):
+    request = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request'
+    )
+    cache = MetadataCache(tmp_dir, ttl=0)
+    cache.put(PyPiRepository.DEFAULT_URL, ('files', 'pendulum'), [['1.2.0', []]])
+
+    repository = PyPiRepository(cache=cache, offline=True)
+
+    assert ['1.2.0'] == [p.pretty_version for p in repository.find_packages('pendulum')]
+    assert 0 == request.call_count
+
+    with pytest.raises(Exception):
+        repository.find_packages('requests')
+
+
+def test_search_caches_and_revalidates_project_list(mocker, tmp_dir):
+    request = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request'
+    )
+    iter_projects = mocker.patch(
+        'poet.repositories.simple_index.iter_projects',
+        return_value=iter(['pendulum', 'requests', 'pendulum-extra'])
+    )
+    mocker.patch('poet.repositories.pypi_repository.PyPiRepository._details')
+    request.return_value.status_code = 200
+    request.return_value.headers = {'ETag': '"abcdef"'}
+
+    cache = MetadataCache(tmp_dir, ttl=0)
+    repository = PyPiRepository(cache=cache)
+
+    assert ['pendulum', 'pendulum-extra'] == [
+        r['name'] for r in repository.search('pendulum', PyPiRepository.SEARCH_NAME)
+    ]
+    assert 1 == request.call_count
+
+    # The stale list is revalidated rather than downloaded again
+    request.return_value.status_code = 304
+
+    assert ['requests'] == [r['name'] for r in repository.search('requests', PyPiRepository.SEARCH_NAME)]
+    assert 2 == request.call_count
+    assert {'If-None-Match': '"abcdef"'} == request.call_args[1]['headers']
+    assert 1 == iter_projects.call_count
+
+    # Offline searches use the cached list
+    repository = PyPiRepository(cache=cache, offline=True)
+
+    assert ['pendulum-extra'] == [r['name'] for r in repository.search('extra', PyPiRepository.SEARCH_NAME)]
+    assert 2 == request.call_count
+
+
+def test_offline_search_without_cached_project_list(mocker, tmp_dir):
+    request = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request'
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir), offline=True)
+
+    with pytest.raises(Exception):
+        repository.search('pendulum', PyPiRepository.SEARCH_NAME)
+
+    assert 0 == request.call_count
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+from poet.repositories import PyPiRepository
+from poet.repositories.cache import MetadataCache
+
+
+def test_find_packages_many(mocker, tmp_dir):
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'max_in_flight': 0}
+
+    def get(key, url, parse, **kwargs):
+        name = key[-1]
+
+        with lock:
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+
+        time.sleep(0.05)
+
+        with lock:
+            state['in_flight'] -= 1
+
+        return {
+            'pendulum': [['1.2.0', []], ['1.3.0', []]],
+            'requests': [['2.13.0', []]]
+        }.get(name, [])
+
+    mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._get',
+        side_effect=get
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir), max_in_flight=2)
+    packages = repository.find_packages_many(['pendulum', 'requests', 'foo', 'bar'])
+
+    assert ['pendulum', 'requests', 'foo', 'bar'] == list(packages.keys())
+    assert ['1.2.0', '1.3.0'] == [p.pretty_version for p in packages['pendulum']]
+    assert ['2.13.0'] == [p.pretty_version for p in packages['requests']]
+    assert [] == packages['foo']
+    assert 2 == state['max_in_flight']
+
+
+def test_find_projects(mocker, tmp_dir):
+    releases = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository.releases',
+        side_effect=lambda name: {'1.0': []} if name == 'pendulum' else {}
+    )
+    projects = mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository.projects'
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    found = repository.find_projects(['pendulum', 'foo', 'pendulum'])
+
+    assert [('pendulum', True), ('foo', False)] == list(found.items())
+    assert 2 == releases.call_count
+    # The project list is not needed
+    assert 0 == projects.call_count
+
+
+def test_search_details(mocker, tmp_dir):
+    mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository.projects',
+        return_value=['pendulum', 'requests', 'requests-toolbelt']
+    )
+    mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._details',
+        side_effect=lambda name: {'description': name, 'version': '1.0'}
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    results = repository.search('requests', PyPiRepository.SEARCH_NAME)
+
+    assert ['requests', 'requests-toolbelt'] == [r['name'] for r in results]
+    assert '1.0' == results[0]['version']
+
+
+def test_full_text_search_is_not_supported(tmp_dir):
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+
+    with pytest.raises(Exception) as e:
+        repository.search('requests')
+
+    assert 'Full text search is not supported' in str(e.value)
+
+
+def test_projects_are_downloaded_once(mocker, tmp_dir):
+    calls = []
+
+    def request(url, headers=None, stream=False):
+        calls.append(url)
+        time.sleep(0.05)
+
+        response = mocker.MagicMock()
+        response.status_code = 200
+        response.headers = {}
+
+        return response
+
+    mocker.patch(
+        'poet.repositories.pypi_repository.PyPiRepository._request',
+        side_effect=request
+    )
+    mocker.patch(
+        'poet.repositories.simple_index.iter_projects',
+        side_effect=lambda response: iter(['pendulum', 'requests'])
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    threads = [threading.Thread(target=repository.projects) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert 1 == len(calls)
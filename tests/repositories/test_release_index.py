@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from semantic_version import Version
+
+from poet.repositories.release_index import ReleaseIndex
+from poet.version_parser import VersionParser
+from poet.version_selector import VersionSelector
+
+
+class DummyRepository(object):
+
+    def __init__(self, releases):
+        self._index = ReleaseIndex(releases)
+
+    def release_index(self, name):
+        return self._index
+
+
+def test_versions_are_sorted():
+    index = ReleaseIndex([
+        '1.10.0', '1.2.0', 'invalid', '1.2.0-rc.1', '1.2.0-rc.10',
+        '1.2.0-rc.2', '1.2.0-beta', '1.9'
+    ])
+
+    assert 7 == len(index)
+    assert [
+        '1.2.0-beta', '1.2.0-rc.1', '1.2.0-rc.2', '1.2.0-rc.10',
+        '1.2.0', '1.9', '1.10.0'
+    ] == index.candidates()
+
+    versions = [Version(v) for v in ['1.2.0-rc.1', '1.2.0-rc.10', '1.2.0-rc.2', '1.2.0-beta', '1.2.0']]
+    assert sorted(versions) == sorted(versions, key=ReleaseIndex.sort_key)
+
+
+def test_candidates_and_best():
+    index = ReleaseIndex(['0.9.0', '1.0.0', '1.1.0', '1.2.0', '2.0.0-a1', '2.0.0'])
+
+    assert ['1.0.0', '1.2.0'] == index.candidates(
+        VersionParser.parse_constraint('^1.0,!=1.1.0')
+    )
+    assert '1.2.0' == index.best(VersionParser.parse_constraint('^1.0'))
+    assert '1.1.0' == index.best(VersionParser.parse_constraint('>1.0.0,<=1.1.0'))
+    assert '2.0.0' == index.best()
+    assert index.best(VersionParser.parse_constraint('>2.0.0')) is None
+
+
+def test_find_best_candidate():
+    selector = VersionSelector(DummyRepository(['1.0.0', '1.3.0', '1.2.0', '2.0.0']))
+
+    assert '2.0.0' == selector.find_best_candidate('foo').pretty_version
+    assert '1.3.0' == selector.find_best_candidate('foo', '^1.0').pretty_version
+    assert selector.find_best_candidate('foo', '>=3.0') is False
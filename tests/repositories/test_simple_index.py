@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import zipfile
+
+import httpretty
+import pytest
+
+from poet.repositories import PyPiRepository
+from poet.repositories.cache import MetadataCache
+from poet.repositories.simple_index import (
+    iter_html_links, iter_json_array, version_from_filename
+)
+
+
+PROJECT_HTML = """<!DOCTYPE html>
+<html>
+  <body>
+    <h1>Links for pendulum</h1>
+    <a href="../../packages/pendulum-1.2.0.tar.gz#sha256=641140">pendulum-1.2.0.tar.gz</a>
+    <a href="../../packages/pendulum-1.2.0-cp36-cp36m-manylinux1_x86_64.whl#sha256=a97e3e">pendulum-1.2.0-cp36-cp36m-manylinux1_x86_64.whl</a>
+    <a href="../../packages/pendulum-1.3.0.tar.gz#sha256=aaaaaa" data-yanked="">pendulum-1.3.0.tar.gz</a>
+    <a href="../../packages/pendulum-1.3.1.tar.gz#sha256=bbbbbb">pendulum-1.3.1.tar.gz</a>
+  </body>
+</html>"""
+
+PROJECT_JSON = json.dumps({
+    'meta': {'api-version': '1.0'},
+    'name': 'pendulum',
+    'files': [
+        {'filename': 'pendulum-1.2.0.tar.gz', 'url': 'x', 'hashes': {}},
+        {'filename': 'pendulum-1.3.0.tar.gz', 'url': 'x', 'hashes': {}, 'yanked': True},
+        {'filename': 'pendulum-1.3.1-py2.py3-none-any.whl', 'url': 'x', 'hashes': {}}
+    ]
+})
+
+
+@pytest.fixture
+def http():
+    # httpretty.activate would hide the fixtures
+    # of the tests it decorates on Python 2.7
+    httpretty.reset()
+    httpretty.enable()
+
+    yield
+
+    httpretty.disable()
+    httpretty.reset()
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_iter_json_array():
+    document = json.dumps({
+        'meta': {'files': 'not this one'},
+        'files': [{'filename': 'a'}, {'filename': 'b ] , {'}, {'filename': 'c'}],
+        'versions': ['1.0']
+    })
+
+    for size in (1, 3, 7, len(document)):
+        elements = list(iter_json_array(chunked(document, size), 'files'))
+
+        assert ['a', 'b ] , {', 'c'] == [e['filename'] for e in elements]
+
+
+def test_iter_html_links():
+    links = list(iter_html_links(chunked(PROJECT_HTML, 10)))
+
+    assert 4 == len(links)
+    assert 'pendulum-1.2.0.tar.gz' == links[0]['filename']
+    assert not links[0]['yanked']
+    assert links[2]['yanked']
+
+
+def test_version_from_filename():
+    assert '1.2.0' == version_from_filename('pendulum', 'pendulum-1.2.0.tar.gz')
+    assert '2.6.0' == version_from_filename('python-dateutil', 'python_dateutil-2.6.0-py2.py3-none-any.whl')
+    assert '2.6.0' == version_from_filename('python-dateutil', 'python-dateutil-2.6.0.zip')
+    assert '0.8.1' == version_from_filename('requests-toolbelt', 'requests-toolbelt-0.8.1-py2.7.egg')
+    assert version_from_filename('pendulum', 'pendulum-1.2.0.exe') is None
+    assert version_from_filename('pendulum', 'other-1.2.0.tar.gz') is None
+
+
+def test_find_packages_html(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://mirror.example.com/simple/pendulum/',
+        body=PROJECT_HTML,
+        content_type='text/html'
+    )
+
+    repository = PyPiRepository('https://mirror.example.com/simple', cache=MetadataCache(tmp_dir))
+    packages = repository.find_packages('pendulum')
+
+    assert ['1.2.0', '1.3.1'] == [p.pretty_version for p in packages]
+    assert ['1.2.0'] == [p.pretty_version for p in repository.find_packages('pendulum', '<1.3')]
+
+
+def test_find_packages_json(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/pendulum/',
+        body=PROJECT_JSON,
+        content_type='application/vnd.pypi.simple.v1+json'
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    packages = repository.find_packages('pendulum')
+
+    assert ['1.2.0', '1.3.1'] == [p.pretty_version for p in packages]
+    assert 'application/vnd.pypi.simple.v1+json' in httpretty.last_request().headers['Accept']
+
+
+def test_legacy_url_is_converted():
+    assert 'https://pypi.python.org/simple' == PyPiRepository('https://pypi.python.org/pypi').url
+
+
+def test_find_packages_unknown_package(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/unknown/',
+        status=404
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+
+    assert [] == repository.find_packages('unknown')
+
+
+def test_releases_hashes(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://mirror.example.com/simple/pendulum/',
+        body=PROJECT_HTML,
+        content_type='text/html'
+    )
+
+    repository = PyPiRepository('https://mirror.example.com/simple', cache=MetadataCache(tmp_dir))
+    releases = repository.releases('pendulum')
+
+    assert ['1.2.0', '1.3.1'] == list(releases.keys())
+    assert (
+        'https://mirror.example.com/packages/pendulum-1.2.0.tar.gz'
+        == releases['1.2.0'][0]['url']
+    )
+    assert ['sha256:641140', 'sha256:a97e3e'] == repository.hashes('pendulum', '1.2.0')
+
+
+def wheel(metadata):
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, 'w') as archive:
+        archive.writestr('pendulum-1.3.1.dist-info/METADATA', metadata)
+
+    return content.getvalue()
+
+
+METADATA = """Metadata-Version: 2.0
+Name: pendulum
+Version: 1.3.1
+Requires-Dist: python-dateutil
+Requires-Dist: pytzdata (>=2017.2)
+Requires-Dist: tzlocal; platform_system == "Windows"
+"""
+
+
+def test_dependencies_from_core_metadata(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/pendulum/',
+        body=json.dumps({
+            'files': [{
+                'filename': 'pendulum-1.3.1-py2.py3-none-any.whl',
+                'url': 'https://files.example.com/pendulum-1.3.1-py2.py3-none-any.whl',
+                'hashes': {'sha256': 'abcdef'},
+                'core-metadata': {'sha256': '012345'}
+            }]
+        }),
+        content_type='application/vnd.pypi.simple.v1+json'
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://files.example.com/pendulum-1.3.1-py2.py3-none-any.whl.metadata',
+        body=METADATA
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+
+    assert [
+        'python-dateutil',
+        'pytzdata (>=2017.2)',
+        'tzlocal; platform_system == "Windows"'
+    ] == repository.dependencies('pendulum', '1.3.1')
+
+
+def test_dependencies_from_wheel(http, tmp_dir, mocker):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/pendulum/',
+        body=(
+            '<a href="https://files.example.com/pendulum-1.3.1-py2.py3-none-any.whl#sha256=abcdef">'
+            'pendulum-1.3.1-py2.py3-none-any.whl</a>'
+        ),
+        content_type='text/html'
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://files.example.com/pendulum-1.3.1-py2.py3-none-any.whl',
+        body=wheel(METADATA)
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/pypi/pendulum/1.3.1/json',
+        status=404
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    request = mocker.spy(repository, '_request')
+
+    assert 3 == len(repository.dependencies('pendulum', '1.3.1'))
+    # Release metadata is cached
+    assert 3 == len(repository.dependencies('pendulum', '1.3.1'))
+    # Project page, JSON API and wheel
+    assert 3 == request.call_count
+    assert request.call_args[1]['stream']
+
+
+def test_dependencies_from_json_before_wheel(http, tmp_dir, mocker):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/pendulum/',
+        body=(
+            '<a href="https://files.example.com/pendulum-1.3.1-py2.py3-none-any.whl#sha256=abcdef">'
+            'pendulum-1.3.1-py2.py3-none-any.whl</a>'
+        ),
+        content_type='text/html'
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/pypi/pendulum/1.3.1/json',
+        body=json.dumps({'info': {'requires_dist': ['pytzdata']}}),
+        content_type='application/json'
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+    request = mocker.spy(repository, '_request')
+
+    assert ['pytzdata'] == repository.dependencies('pendulum', '1.3.1')
+    assert 2 == request.call_count
+
+
+def test_dependencies_of_source_only_releases(http, tmp_dir):
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/simple/pendulum/',
+        body=PROJECT_HTML,
+        content_type='text/html'
+    )
+    httpretty.register_uri(
+        httpretty.GET, 'https://pypi.python.org/pypi/pendulum/1.3.1/json',
+        body=json.dumps({'info': {'requires_dist': ['pytzdata']}}),
+        content_type='application/json'
+    )
+
+    repository = PyPiRepository(cache=MetadataCache(tmp_dir))
+
+    assert ['pytzdata'] == repository.dependencies('pendulum', '1.3.1')
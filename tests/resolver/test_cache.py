@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from poet.installer import Installer
+from poet.package import PipDependency
+from poet.repositories import PyPiRepository
+from poet.repositories.cache import MetadataCache
+from poet.resolver import ResolutionCache
+
+
+PACKAGES = [{
+    'name': 'pendulum',
+    'version': '1.2.0',
+    'checksum': ['sha256:a97e3e'],
+    'category': 'main',
+    'optional': False,
+    'python': ['*'],
+    'dependencies': []
+}]
+
+
+def test_fingerprint(tmp_dir):
+    cache = ResolutionCache(MetadataCache(tmp_dir))
+    deps = [PipDependency('pendulum', '^1.2'), PipDependency('requests', '^2.13')]
+    fingerprint = cache.fingerprint(deps, index_url='https://pypi.org/simple')
+
+    assert fingerprint == cache.fingerprint(
+        list(reversed(deps)), index_url='https://pypi.org/simple'
+    )
+    assert fingerprint != cache.fingerprint(
+        deps, index_url='https://mirror.example.com/simple'
+    )
+    assert fingerprint != cache.fingerprint(
+        [PipDependency('pendulum', '^1.3'), PipDependency('requests', '^2.13')],
+        index_url='https://pypi.org/simple'
+    )
+    assert fingerprint != cache.fingerprint(
+        deps, index_url='https://pypi.org/simple',
+        environment={'python_version': '2.7'}
+    )
+    assert fingerprint != cache.fingerprint(
+        [PipDependency('pendulum', '^1.2'), PipDependency('requests', '^2.13', category='dev')],
+        index_url='https://pypi.org/simple'
+    )
+
+
+def test_resolutions_expire(tmp_dir):
+    cache = ResolutionCache(MetadataCache(tmp_dir), ttl=0)
+    cache.put('abcdef', PACKAGES)
+
+    assert cache.get('abcdef') is None
+
+
+def test_installer_reuses_resolutions(mocker, command, tmp_dir):
+    resolve = mocker.patch('poet.installer.Installer._resolve', return_value=PACKAGES)
+    deps = [PipDependency('pendulum', '^1.2')]
+
+    installer = Installer(
+        command, PyPiRepository(),
+        resolution_cache=ResolutionCache(MetadataCache(tmp_dir))
+    )
+
+    assert PACKAGES == installer.resolve(deps)
+    assert PACKAGES == installer.resolve(deps)
+    assert 1 == resolve.call_count
+
+    installer.resolve(deps, use_cache=False)
+    assert 2 == resolve.call_count
+
+    installer.resolve([PipDependency('pendulum', '^1.3')])
+    assert 3 == resolve.call_count
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+from poet.package import PipDependency
+from poet.resolver import DependencyGraph
+
+
+def test_graph_propagates_to_children():
+    graph = DependencyGraph(
+        {
+            'pendulum': set(['pytzdata', 'python-dateutil']),
+            'python-dateutil': set(['six']),
+            'pytest': set(['py', 'six'])
+        },
+        [
+            PipDependency('pendulum', {'version': '^1.2', 'python': '~2.7'}),
+            PipDependency('pytest', {'version': '^3.0', 'optional': True}, category='dev')
+        ]
+    )
+
+    assert 'main' == graph.category('pytzdata')
+    assert not graph.optional('pytzdata')
+    assert ['~2.7'] == graph.python('python-dateutil')
+
+    # Required by a main dependency and a dev one
+    assert 'main' == graph.category('six')
+    assert not graph.optional('six')
+    assert ['*'] == graph.python('six')
+
+    assert 'dev' == graph.category('py')
+    assert graph.optional('py')
+    assert ['*'] == graph.python('py')
+
+    # Unknown packages, from VCS dependencies for instance
+    assert 'main' == graph.category('unknown')
+    assert not graph.optional('unknown')
+    assert ['*'] == graph.python('unknown')
+
+
+def test_graph_dev_dependency_required_by_main_one():
+    graph = DependencyGraph(
+        {
+            'pendulum': set(['python-dateutil']),
+            'python-dateutil': set(['six'])
+        },
+        [
+            PipDependency('pendulum', {'version': '^1.2'}),
+            PipDependency('six', {'version': '^1.10'}, category='dev')
+        ]
+    )
+
+    # Main dependencies need it, so it must be installed
+    # even without the dev dependencies
+    assert 'main' == graph.category('six')
+    assert not graph.optional('six')
+
+
+def test_graph_merges_python_restrictions():
+    graph = DependencyGraph(
+        {
+            'pendulum': set(['pytzdata']),
+            'requests': set(['pytzdata'])
+        },
+        [
+            PipDependency('pendulum', {'version': '^1.2', 'python': '~2.7'}),
+            PipDependency('requests', {'version': '^2.13', 'python': '~3.6'})
+        ]
+    )
+
+    assert ['~2.7', '~3.6'] == graph.python('pytzdata')
+
+
+def test_graph_handles_cycles():
+    graph = DependencyGraph(
+        {
+            'a': set(['b']),
+            'b': set(['c']),
+            'c': set(['b', 'd'])
+        },
+        [PipDependency('a', {'version': '^1.0', 'python': '~2.7'}, category='dev')]
+    )
+
+    for name in ['b', 'c', 'd']:
+        assert 'dev' == graph.category(name)
+        assert ['~2.7'] == graph.python(name)
+
+
+def test_graph_handles_deep_trees():
+    depth = 5000
+    graph = DependencyGraph(
+        dict(('p{}'.format(i), set(['p{}'.format(i + 1)])) for i in range(depth)),
+        [PipDependency('p0', {'version': '^1.0', 'optional': True})]
+    )
+
+    assert graph.optional('p{}'.format(depth))
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from collections import OrderedDict
+
+from poet.exceptions.resolver import SolverProblemError
+from poet.package import PipDependency
+from poet.resolver import Resolver
+
+
+ENVIRONMENT = {
+    'python_version': '3.6',
+    'python_full_version': '3.6.0',
+    'sys_platform': 'linux',
+    'platform_system': 'Linux',
+    'os_name': 'posix',
+}
+
+
+class DummyRepository(object):
+
+    def __init__(self, packages):
+        self._packages = packages
+        self.calls = []
+
+    def releases(self, name):
+        return OrderedDict(
+            (version, [{'requires-python': None}])
+            for version in self._packages.get(name, {})
+        )
+
+    def dependencies(self, name, version):
+        self.calls.append((name, version))
+
+        return self._packages[name][version]
+
+
+def resolve(packages, *dependencies, **kwargs):
+    repository = DummyRepository(packages)
+    resolver = Resolver(
+        repository, environment=ENVIRONMENT,
+        prereleases=kwargs.get('prereleases', False)
+    )
+
+    return resolver.resolve(
+        [PipDependency(n, c) for n, c in dependencies],
+        constraints=kwargs.get('constraints')
+    )
+
+
+def test_resolve_highest_versions():
+    resolution = resolve(
+        {
+            'pendulum': {
+                '1.2.0': ['pytzdata (>=2016.10)', 'python-dateutil'],
+                '1.3.0': ['pytzdata (>=2017.2)', 'python-dateutil'],
+                '2.0.0': []
+            },
+            'pytzdata': {'2016.10': [], '2017.2': [], '2017.3b1': []},
+            'python-dateutil': {'2.6.0': ['six (>=1.5)'], '2.6.1': ['six (>=1.5)']},
+            'six': {'1.10.0': [], '1.11.0': []}
+        },
+        ('pendulum', '^1.2')
+    )
+
+    assert OrderedDict([
+        ('pendulum', '1.3.0'),
+        ('python-dateutil', '2.6.1'),
+        ('pytzdata', '2017.2'),
+        ('six', '1.11.0'),
+    ]) == resolution.packages
+    assert {
+        'pytzdata': set(['pendulum']),
+        'python-dateutil': set(['pendulum']),
+        'six': set(['python-dateutil'])
+    } == resolution.reverse_dependencies()
+
+
+def test_resolve_backtracks():
+    resolution = resolve(
+        {
+            'a': {
+                '1.0.0': ['c<2'],
+                '2.0.0': ['c>=2']
+            },
+            'b': {'1.0.0': ['c<2']},
+            'c': {'1.0.0': [], '2.0.0': []}
+        },
+        ('a', '>=0.1'), ('b', '1.0.0')
+    )
+
+    assert {'a': '1.0.0', 'b': '1.0.0', 'c': '1.0.0'} == dict(resolution.packages)
+
+
+def test_resolve_markers_and_extras():
+    resolution = resolve(
+        {
+            'requests': {
+                '2.18.0': [
+                    'idna',
+                    'pyopenssl; extra == "security"',
+                    'win-inet-pton; sys_platform == "win32" and extra == "socks"'
+                ]
+            },
+            'idna': {'2.6': []},
+            'pyopenssl': {'17.0.0': []},
+        },
+        ('requests', '^2.18')
+    )
+
+    assert ['idna', 'requests'] == list(resolution.packages.keys())
+
+    resolution = resolve(
+        {
+            'app': {'1.0.0': ['requests[security]']},
+            'requests': {
+                '2.18.0': ['idna', 'pyopenssl; extra == "security"']
+            },
+            'idna': {'2.6': []},
+            'pyopenssl': {'17.0.0': []},
+        },
+        ('app', '>=0.1')
+    )
+
+    assert ['app', 'idna', 'pyopenssl', 'requests'] == list(resolution.packages.keys())
+
+
+def test_resolve_prereleases():
+    packages = {'pytzdata': {'2017.2': [], '2017.3b1': []}}
+
+    assert '2017.2' == resolve(packages, ('pytzdata', '>=0.1')).packages['pytzdata']
+    assert '2017.3b1' == resolve(
+        packages, ('pytzdata', '>=0.1'), prereleases=True
+    ).packages['pytzdata']
+
+
+def test_resolve_constraints():
+    packages = {
+        'pendulum': {'1.2.0': ['pytzdata'], '1.3.0': ['pytzdata']},
+        'pytzdata': {'2017.2': [], '2017.3': []},
+        'requests': {'2.13.0': []}
+    }
+
+    resolution = resolve(
+        packages, ('pendulum', '^1.2'),
+        constraints={'pytzdata': '2017.2', 'requests': '2.13.0'}
+    )
+
+    # Constraints do not add packages
+    assert {'pendulum': '1.3.0', 'pytzdata': '2017.2'} == dict(resolution.packages)
+
+
+def test_resolve_explains_conflicts():
+    with pytest.raises(SolverProblemError) as e:
+        resolve(
+            {
+                'pendulum': {'1.2.0': ['pytzdata>=2017.2']},
+                'pytzdata': {'2016.10': [], '2017.2': []}
+            },
+            ('pendulum', '^1.2'), ('pytzdata', '<2017')
+        )
+
+    assert 'pytzdata' == e.value.name
+    assert 'pendulum (1.2.0) requires pytzdata>=2017.2' in str(e.value)
+    assert 'Your project requires pytzdata<2017' in str(e.value)
+
+
+def test_resolve_fetches_metadata_once():
+    packages = {
+        'a': {'1.0.0': ['c<2'], '2.0.0': ['c>=2']},
+        'b': {'1.0.0': ['c<2']},
+        'c': {'1.0.0': [], '2.0.0': []}
+    }
+    repository = DummyRepository(packages)
+    resolver = Resolver(repository, environment=ENVIRONMENT)
+
+    resolver.resolve([PipDependency('a', '>=0.1'), PipDependency('b', '>=0.1')])
+    resolver.resolve([PipDependency('a', '>=0.1'), PipDependency('b', '>=0.1')])
+
+    assert len(repository.calls) == len(set(repository.calls))
+
+
+def test_resolve_deep_dependency_trees():
+    packages = dict(
+        ('package-{}'.format(i), {'1.0.0': ['package-{}'.format(i + 1)]})
+        for i in range(1500)
+    )
+    packages['package-1500'] = {'1.0.0': []}
+
+    resolution = resolve(packages, ('package-0', '*'))
+
+    assert 1501 == len(resolution.packages)
+
+
+def test_resolve_explains_pinned_conflicts():
+    with pytest.raises(SolverProblemError) as e:
+        resolve(
+            {
+                'pendulum': {'1.2.0': ['pytzdata<2017']},
+                'pytzdata': {'2016.10': [], '2017.2': []}
+            },
+            ('pendulum', '^1.2'), ('pytzdata', '>=2016'),
+            constraints={'pendulum': '1.2.0', 'pytzdata': '2017.2'}
+        )
+
+    assert ['pendulum', 'pytzdata'] == e.value.pinned
+    assert 'pendulum (1.2.0, pinned) requires pytzdata<2017' in str(e.value)
+    assert 'pytzdata is pinned to 2017.2' in str(e.value)
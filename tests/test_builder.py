@@ -2,8 +2,13 @@
 
 import os
 import pytest
+import shutil
+import stat
+import tarfile
+import zipfile
 
 from poet.build import Builder
+from poet.build.ignore import IgnoreMatcher
 from poet.poet import Poet
 
 
@@ -86,3 +91,311 @@ This is an example of a package dir Poet project.
     assert [] == setup_kwargs['py_modules']
     assert {'': 'src'} == setup_kwargs['package_dir']
 
+
+
+def test_packages_follow_gitignore(tmp_dir):
+    for path in ['pkg/__init__.py', 'pkg/a.py', 'pkg/secret.py', 'pkg/build/__init__.py',
+                 'pkg/data.json', 'pkg/data.tmp', 'other/__init__.py']:
+        path = os.path.join(tmp_dir, path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        with open(path, 'w') as f:
+            f.write('')
+
+    with open(os.path.join(tmp_dir, '.gitignore'), 'w') as f:
+        f.write('build/\n*.tmp\n')
+
+    with open(os.path.join(tmp_dir, 'pkg', '.gitignore'), 'w') as f:
+        f.write('secret.py\n')
+
+    class DummyPoet(object):
+        base_dir = tmp_dir
+        include = ['pkg/**/*']
+        exclude = []
+        ignore = IgnoreMatcher(tmp_dir)
+
+    builder = Builder()
+    settings = builder._packages(DummyPoet())
+
+    assert [] == settings['packages']
+    assert ['pkg.__init__', 'pkg.a'] == settings['py_modules']
+    assert ['include pkg/.gitignore\n', 'include pkg/data.json\n'] == builder._manifest
+
+
+def test_build_writes_sdist_and_wheel(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    with open(os.path.join(base_dir, 'basic_example', 'data.json'), 'w') as f:
+        f.write('{}')
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    sdist, wheel = Builder().build(poet)
+
+    assert os.path.join(base_dir, 'dist', 'basic-example-0.1.0.tar.gz') == sdist
+    assert os.path.join(base_dir, 'dist', 'basic_example-0.1.0-py2.py3-none-any.whl') == wheel
+
+    with tarfile.open(sdist) as tar:
+        names = tar.getnames()
+        manifest = tar.extractfile('basic-example-0.1.0/MANIFEST.in').read()
+        pkg_info = tar.extractfile('basic-example-0.1.0/PKG-INFO').read().decode('utf-8')
+
+    assert sorted([
+        'basic-example-0.1.0/MANIFEST.in',
+        'basic-example-0.1.0/PKG-INFO',
+        'basic-example-0.1.0/README.rst',
+        'basic-example-0.1.0/basic_example/__init__.py',
+        'basic-example-0.1.0/basic_example/data.json',
+        'basic-example-0.1.0/basic_example/sub_package/__init__.py',
+        'basic-example-0.1.0/basic_example/sub_package/sub_module.py',
+        'basic-example-0.1.0/my_module.py',
+        'basic-example-0.1.0/setup.py',
+    ]) == sorted(names)
+    assert b'include basic_example/data.json\n' == manifest
+    assert 'Name: basic-example\n' in pkg_info
+    assert 'Requires-Dist: requests>=2.13.0,<3.0.0\n' in pkg_info
+
+    with zipfile.ZipFile(wheel) as z:
+        names = z.namelist()
+        record = z.read('basic_example-0.1.0.dist-info/RECORD').decode('utf-8')
+        wheel_info = z.read('basic_example-0.1.0.dist-info/WHEEL').decode('utf-8')
+
+    assert [
+        'basic_example/__init__.py',
+        'basic_example/data.json',
+        'basic_example/sub_package/__init__.py',
+        'basic_example/sub_package/sub_module.py',
+        'my_module.py',
+        'basic_example-0.1.0.dist-info/METADATA',
+        'basic_example-0.1.0.dist-info/WHEEL',
+        'basic_example-0.1.0.dist-info/top_level.txt',
+        'basic_example-0.1.0.dist-info/RECORD',
+    ] == names
+    assert 'Tag: py2-none-any\nTag: py3-none-any\n' in wheel_info
+    assert 'basic_example/data.json,sha256=RBNvo1WzZ4oRRq0W9-hknpT7T8If536DEMBg9hyq_4o,2\n' in record
+    assert record.endswith('basic_example-0.1.0.dist-info/RECORD,,\n')
+
+
+def test_build_package_dir_wheel(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'package_dir')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'package_dir'),
+        base_dir
+    )
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    artifacts = Builder().build(poet, universal=False)
+
+    assert 2 == len(artifacts)
+    assert artifacts[1].endswith('-none-any.whl')
+    assert 'py2.py3' not in artifacts[1]
+
+    with zipfile.ZipFile(artifacts[1]) as z:
+        assert 'my_package/module.py' in z.namelist()
+        assert 'my_package\n' == z.read(
+            'package_dir_example-0.1.0.dist-info/top_level.txt'
+        ).decode('utf-8')
+
+
+def test_build_compression_level(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    sdist, wheel = Builder().build(poet, compression_level=0, jobs=1)
+
+    with zipfile.ZipFile(wheel) as z:
+        assert all(i.compress_type == zipfile.ZIP_STORED for i in z.infolist())
+        assert b'' == z.read('basic_example/__init__.py')
+
+    with tarfile.open(sdist) as tar:
+        assert 7 == len(tar.getnames())
+
+
+def test_build_archives_follow_umask(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    umask = os.umask(0o022)
+    try:
+        artifacts = Builder().build(poet, jobs=1)
+    finally:
+        os.umask(umask)
+
+    for artifact in artifacts:
+        assert 0o644 == stat.S_IMODE(os.stat(artifact).st_mode)
+
+    assert [] == [f for f in os.listdir(os.path.dirname(artifacts[0]))
+                  if f.endswith('.tmp')]
+
+
+def test_build_reuses_up_to_date_archives(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    builder = Builder()
+    sdist, wheel = builder.build(poet)
+
+    run = mocker.spy(builder, '_run')
+    assert [sdist, wheel] == builder.build(poet)
+    assert [] == run.call_args[0][0]
+
+    # Only the wheel depends on the universal option
+    sdist, other_wheel = builder.build(poet, universal=False)
+    assert [os.path.basename(other_wheel)] == [
+        b.filename for b in run.call_args[0][0]
+    ]
+
+    with open(os.path.join(base_dir, 'my_module.py'), 'a') as f:
+        f.write('# Changed\n')
+
+    assert [sdist, wheel] == builder.build(poet)
+    assert 2 == len(run.call_args[0][0])
+
+    # Modified archives are built again
+    with open(wheel, 'ab') as f:
+        f.write(b'\0')
+
+    builder.build(poet)
+    assert 1 == len(run.call_args[0][0])
+
+    builder.build(poet, force=True)
+    assert 2 == len(run.call_args[0][0])
+
+
+def test_build_reproducible(tmp_dir, mocker):
+    getcwd = mocker.patch('os.getcwd')
+    archives = []
+
+    for name in ['first', 'second']:
+        base_dir = os.path.join(tmp_dir, name)
+        shutil.copytree(
+            os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+            base_dir
+        )
+
+        # Same content, different modification time and mode
+        module = os.path.join(base_dir, 'my_module.py')
+        os.utime(module, (1000000000, 1000000000 * len(name)))
+        os.chmod(module, 0o600 if name == 'first' else 0o664)
+
+        getcwd.return_value = base_dir
+        poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+        archives.append(Builder().build(poet, reproducible=True))
+
+    for first, second in zip(*archives):
+        with open(first, 'rb') as f:
+            first_content = f.read()
+
+        with open(second, 'rb') as f:
+            assert first_content == f.read()
+
+    with tarfile.open(archives[0][0]) as tar:
+        member = tar.getmember('basic-example-0.1.0/my_module.py')
+
+    assert Builder.SOURCE_DATE_EPOCH == member.mtime
+    assert 0o644 == member.mode
+    assert 0 == member.uid
+
+    with zipfile.ZipFile(archives[0][1]) as z:
+        assert (1980, 1, 1, 0, 0, 0) == z.getinfo('my_module.py').date_time
+
+
+def test_build_reproducible_uses_source_date_epoch(tmp_dir, mocker):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    getcwd = mocker.patch('os.getcwd')
+    getcwd.return_value = base_dir
+    mocker.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '1500000000'})
+    poet = Poet(os.path.join(base_dir, 'poetry.toml'))
+
+    sdist, wheel = Builder().build(poet, reproducible=True)
+
+    with tarfile.open(sdist) as tar:
+        assert set([1500000000]) == set(m.mtime for m in tar.getmembers())
+
+    with zipfile.ZipFile(wheel) as z:
+        assert (2017, 7, 14, 2, 40, 0) == z.getinfo('my_module.py').date_time
+
+
+def fixture_extension(tmp_dir):
+    base_dir = os.path.join(tmp_dir, 'basic')
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'basic'),
+        base_dir
+    )
+
+    with open(os.path.join(base_dir, 'poetry.toml'), 'a') as f:
+        f.write('\n[extensions]\n"basic_example.ext" = "basic_example/ext.c"\n')
+
+    return Poet(os.path.join(base_dir, 'poetry.toml'))
+
+
+def test_build_extensions(tmp_dir, mocker):
+    poet = fixture_extension(tmp_dir)
+    dest = os.path.join(poet.base_dir, 'dist')
+    distribution = mocker.patch('poet.build.builder.Distribution')
+    wheel_command = mocker.patch('poet.build.builder.WheelCommand')
+    wheel_command.return_value.main.return_value = 0
+
+    os.makedirs(dest)
+    with open(os.path.join(dest, 'basic_example-0.1.0-cp36-cp36m-linux_x86_64.whl'), 'w'):
+        pass
+
+    sdist, wheel = Builder().build(poet, force=True)
+
+    assert os.path.join(dest, 'basic-example-0.1.0.tar.gz') == sdist
+    assert os.path.join(dest, 'basic_example-0.1.0-cp36-cp36m-linux_x86_64.whl') == wheel
+    distribution.return_value.get_option_dict.return_value.__setitem__.assert_called_once_with(
+        'dist_dir', ('poet', dest)
+    )
+    assert sdist in wheel_command.return_value.main.call_args[0][0]
+
+
+@pytest.mark.parametrize('options', [
+    {'reproducible': True},
+    {'compression_level': 0}
+])
+def test_build_extensions_unsupported_options(tmp_dir, mocker, options):
+    poet = fixture_extension(tmp_dir)
+    distribution = mocker.patch('poet.build.builder.Distribution')
+
+    with pytest.raises(Exception):
+        Builder().build(poet, **options)
+
+    assert 0 == distribution.call_count
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet._compat import Path
+from poet.build.file_index import FileIndex
+
+
+def make_tree(root, paths):
+    for path in paths:
+        path = os.path.join(root, path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        with open(path, 'w') as f:
+            f.write('')
+
+
+def test_glob_matches_path_glob(tmp_dir):
+    make_tree(tmp_dir, [
+        'pkg/__init__.py', 'pkg/a.py', 'pkg/data/file.txt',
+        'pkg/sub/__init__.py', 'module.py', '.git/config'
+    ])
+    root = Path(tmp_dir)
+    index = FileIndex(root, cache_dir=os.path.join(tmp_dir, 'cache'))
+
+    for pattern in ['pkg/**/*', '*.py', '**/*.py', 'pkg/**', 'module.py', 'missing/*']:
+        assert sorted(root.glob(pattern)) == index.glob(root, pattern)
+
+    assert [root / 'pkg' / 'a.py'] == index.glob(root / 'pkg', 'a.py')
+    assert (
+        [Path('data'), Path('sub')],
+        [Path('__init__.py'), Path('a.py'), Path('data/file.txt'), Path('sub/__init__.py')]
+    ) == index.select(root / 'pkg', '**/*')
+    assert ([], [Path('pkg/sub/__init__.py')]) == index.select(
+        root / 'pkg' / 'sub', '*.py', relative_to=root
+    )
+    assert [] == index.glob(root, '.git/*')
+    assert index.is_dir(root / 'pkg' / 'sub')
+    assert not index.is_dir(root / 'module.py')
+    assert index.exists(root / 'pkg' / '__init__.py')
+    assert not index.exists(root / 'pkg' / 'missing.py')
+
+
+def test_listings_are_reused_until_a_directory_changes(tmp_dir, metadata_cache, mocker):
+    make_tree(tmp_dir, ['pkg/__init__.py', 'pkg/sub/a.py'])
+    root = Path(tmp_dir)
+    cache_dir = os.path.join(metadata_cache, 'index')
+
+    index = FileIndex(root, cache_dir=cache_dir)
+    index.RACY_DELAY = -60
+    index.glob(root, 'pkg/**/*.py')
+    index.save()
+
+    listdir = mocker.spy(os, 'listdir')
+    index = FileIndex(root, cache_dir=cache_dir)
+
+    assert [root / 'pkg' / '__init__.py', root / 'pkg' / 'sub' / 'a.py'] == index.glob(root, 'pkg/**/*.py')
+    assert 0 == listdir.call_count
+
+    make_tree(tmp_dir, ['pkg/sub/b.py'])
+    os.utime(os.path.join(tmp_dir, 'pkg', 'sub'), (0, 0))
+    index = FileIndex(root, cache_dir=cache_dir)
+
+    assert [
+        root / 'pkg' / '__init__.py',
+        root / 'pkg' / 'sub' / 'a.py',
+        root / 'pkg' / 'sub' / 'b.py'
+    ] == index.glob(root, 'pkg/**/*.py')
+    assert 1 == listdir.call_count
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pytest
+import subprocess
+
+from poet.vcs import GitMirrors
+
+
+def git(repository, *args):
+    return subprocess.check_output(
+        ['git', '-C', repository, '-c', 'user.name=poet', '-c', 'user.email=poet@example.com']
+        + list(args)
+    ).decode().strip()
+
+
+def commit(repository, message):
+    with open(os.path.join(repository, 'file.txt'), 'a') as f:
+        f.write(message + '\n')
+
+    git(repository, 'add', 'file.txt')
+    git(repository, 'commit', '-q', '-m', message)
+
+    return git(repository, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def repository(tmp_dir):
+    path = os.path.join(tmp_dir, 'repository')
+    os.makedirs(path)
+    git(path, 'init', '-q')
+    git(path, 'checkout', '-q', '-b', 'master')
+
+    return path
+
+
+def test_resolve_branches_and_tags_without_cloning(repository, tmp_dir):
+    first = commit(repository, 'first')
+    git(repository, 'tag', '-a', '1.0', '-m', 'Version 1.0')
+    second = commit(repository, 'second')
+
+    mirrors = GitMirrors(os.path.join(tmp_dir, 'mirrors'))
+
+    assert second == mirrors.resolve('git+file://' + repository, 'master')
+    assert first == mirrors.resolve(repository, '1.0')
+    assert not os.path.exists(mirrors.directory)
+
+
+def test_resolve_commits_from_mirror(repository, tmp_dir, mocker):
+    first = commit(repository, 'first')
+    mirrors = GitMirrors(os.path.join(tmp_dir, 'mirrors'))
+
+    assert first == mirrors.resolve(repository, first[:7])
+    assert os.path.isdir(mirrors.mirror_path(repository))
+
+    # New commits are fetched
+    second = commit(repository, 'second')
+    assert second == mirrors.resolve(repository, second[:7])
+
+    # Known commits do not need the remote
+    spy = mocker.spy(mirrors, '_git')
+    assert first == mirrors.resolve(repository, first)
+    assert ['rev-parse'] == [c[0][2] for c in spy.call_args_list]
+
+
+def test_resolve_unknown_revision(repository, tmp_dir):
+    commit(repository, 'first')
+    mirrors = GitMirrors(os.path.join(tmp_dir, 'mirrors'))
+
+    with pytest.raises(Exception):
+        mirrors.resolve(repository, 'unknown')
+
+
+def test_clone_when_another_process_created_the_mirror(repository, tmp_dir, mocker):
+    first = commit(repository, 'first')
+    mirrors = GitMirrors(os.path.join(tmp_dir, 'mirrors'))
+    mirror = mirrors.mirror_path(repository)
+
+    clone = mirrors._clone
+
+    def concurrent_clone(url, path):
+        # The other process finishes its clone first
+        subprocess.check_output(['git', 'clone', '--mirror', '--quiet', url, path])
+
+        clone(url, path)
+
+    mocker.patch.object(mirrors, '_clone', side_effect=concurrent_clone)
+
+    assert first == mirrors.resolve(repository, first[:7])
+    # The temporary clone is removed
+    assert [os.path.basename(mirror)] == os.listdir(mirrors.directory)
+
+
+def test_clone_failing_to_create_the_mirror(repository, tmp_dir):
+    commit(repository, 'first')
+    mirrors = GitMirrors(os.path.join(tmp_dir, 'mirrors'))
+    mirror = mirrors.mirror_path(repository)
+
+    # Not a mirror
+    os.makedirs(os.path.join(mirror, 'something'))
+
+    with pytest.raises(OSError):
+        mirrors._clone(repository, mirror)
+
+    assert ['something'] == os.listdir(mirror)
+    assert [os.path.basename(mirror)] == os.listdir(mirrors.directory)
+
+
+def test_mirrors_are_kept_in_the_cache_directory(metadata_cache):
+    assert GitMirrors().directory.startswith(metadata_cache)
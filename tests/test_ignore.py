@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet.build.ignore import IgnoreMatcher, IgnoreRule
+
+
+def write(root, path, content=''):
+    path = os.path.join(root, path)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_parse():
+    assert IgnoreRule.parse('# comment') is None
+    assert IgnoreRule.parse('   \n') is None
+
+    rule = IgnoreRule.parse('!build/\n')
+    assert rule.negated
+    assert rule.directory_only
+
+    rule = IgnoreRule.parse('\\#file')
+    assert not rule.negated
+
+
+def test_gitignore_semantics(tmp_dir):
+    write(tmp_dir, '.gitignore', '\n'.join([
+        '*.pyc',
+        'build/',
+        '/dist',
+        'docs/*.txt',
+        '**/generated',
+        'logs/**',
+        '*.log',
+        '!keep.log',
+        'secret.py',
+        '[Tt]emp?',
+        '\\!important'
+    ]))
+    matcher = IgnoreMatcher(tmp_dir)
+
+    assert matcher.ignored('a/b/c.pyc')
+    assert matcher.ignored('pkg/build', is_dir=True)
+    assert not matcher.ignored('pkg/build')
+    assert matcher.ignored('pkg/build/module.py')
+    assert matcher.ignored('dist', is_dir=True)
+    assert not matcher.ignored('pkg/dist', is_dir=True)
+    assert matcher.ignored('docs/a.txt')
+    assert not matcher.ignored('docs/sub/a.txt')
+    assert matcher.ignored('a/b/generated/x.py')
+    assert matcher.ignored('logs/a/b')
+    assert not matcher.ignored('logs', is_dir=True)
+    assert matcher.ignored('debug.log')
+    assert not matcher.ignored('keep.log')
+    assert matcher.ignored('pkg/secret.py')
+    assert matcher.ignored('temp1')
+    assert matcher.ignored('Temp2')
+    assert not matcher.ignored('temp12')
+    assert matcher.ignored('!important')
+
+
+def test_nested_ignore_files(tmp_dir):
+    write(tmp_dir, '.gitignore', '*.txt\nignored/\n')
+    write(tmp_dir, 'pkg/.gitignore', '!data.txt\n/local.py\n')
+    write(tmp_dir, 'ignored/.gitignore', '!*.py\n')
+    write(tmp_dir, '.git/info/exclude', 'excluded.py\n')
+    matcher = IgnoreMatcher(tmp_dir)
+
+    assert matcher.ignored('notes.txt')
+    assert not matcher.ignored('pkg/data.txt')
+    assert matcher.ignored('pkg/other.txt')
+    assert matcher.ignored('pkg/local.py')
+    assert not matcher.ignored('pkg/sub/local.py')
+    assert not matcher.ignored('local.py')
+    # Files of an ignored directory cannot be included again
+    assert matcher.ignored('ignored/module.py')
+    assert matcher.ignored('excluded.py')
+
+
+def test_many_rules(tmp_dir):
+    write(tmp_dir, '.gitignore', '\n'.join('file{}.py'.format(i) for i in range(250)))
+    matcher = IgnoreMatcher(tmp_dir)
+
+    assert matcher.ignored('file0.py')
+    assert matcher.ignored('a/file249.py')
+    assert not matcher.ignored('file250.py')
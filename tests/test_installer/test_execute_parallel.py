@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+from poet.installer import Installer
+from poet.repositories import PyPiRepository
+from poet.package import PipDependency
+
+
+def operation(name, dependencies=None):
+    dep = PipDependency(name, '1.0.0', dependencies=dependencies)
+    cmd = ['pip', 'install', name]
+
+    return (
+        dep, cmd,
+        'Installing {}'.format(name),
+        'Installed {}'.format(name),
+        ' - Installing {}'.format(name),
+        'Error while installing [{}]'.format(name)
+    )
+
+
+def test_execute_parallel_respects_dependencies(mocker, command):
+    installed = []
+    lock = threading.Lock()
+
+    def call(cmd, error_message):
+        time.sleep(0.01)
+
+        with lock:
+            installed.append(cmd[2])
+
+    mocker.patch('poet.installer.Installer._call', side_effect=call)
+
+    installer = Installer(command, PyPiRepository(), jobs=4)
+    installer._execute_parallel([
+        operation('pendulum', ['pytzdata', 'python-dateutil']),
+        operation('python-dateutil', ['six']),
+        operation('pytzdata'),
+        operation('six'),
+        operation('requests')
+    ])
+
+    assert 5 == len(installed)
+    assert installed.index('six') < installed.index('python-dateutil')
+    assert installed.index('python-dateutil') < installed.index('pendulum')
+    assert installed.index('pytzdata') < installed.index('pendulum')
+
+
+def test_execute_parallel_handles_circular_dependencies(mocker, command):
+    call = mocker.patch('poet.installer.Installer._call')
+
+    installer = Installer(command, PyPiRepository(), jobs=2)
+    installer._execute_parallel([
+        operation('foo', ['bar']),
+        operation('bar', ['foo'])
+    ])
+
+    assert 2 == call.call_count
+
+
+def test_execute_parallel_stops_on_error(mocker, command):
+    def call(cmd, error_message):
+        if cmd[2] == 'six':
+            raise Exception(error_message)
+
+    mocker.patch('poet.installer.Installer._call', side_effect=call)
+
+    installer = Installer(command, PyPiRepository(), jobs=2)
+
+    with pytest.raises(Exception) as e:
+        installer._execute_parallel([
+            operation('python-dateutil', ['six']),
+            operation('six')
+        ])
+
+    assert 'Error while installing [six]' == str(e.value)
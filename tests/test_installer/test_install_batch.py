@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet.installer import Installer
+from poet.repositories import PyPiRepository
+from poet.package import PipDependency
+
+pendulum_hashes = [
+    'sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52',
+    'sha256:641140a05f959b37a177866e263f6f53a53b711fae6355336ee832ec1a59da8a'
+]
+pytzdata_hashes = [
+    'sha256:a4d11b8123d00e947fac88508292b9e148da884fc64b884d9da3897a35fa2ab0'
+]
+
+
+def test_install_batch(mocker, command):
+    calls = []
+
+    def call(cmd, error_message):
+        with open(cmd[-1]) as f:
+            calls.append((cmd, f.read()))
+
+    mocker.patch('poet.installer.Installer._call', side_effect=call)
+    mocker.patch.object(command, 'pip', return_value='pip')
+
+    installer = Installer(command, PyPiRepository(), batch=True)
+    installer._install_batch([
+        PipDependency('pendulum', '1.2.0', checksum=pendulum_hashes),
+        PipDependency('pytzdata', '2017.2', checksum=pytzdata_hashes)
+    ])
+
+    assert 1 == len(calls)
+
+    cmd, content = calls[0]
+    assert ['pip', 'install', '--require-hashes', '--no-deps', '-r'] == cmd[:-1]
+    assert not os.path.exists(cmd[-1])
+
+    expected = (
+        'pendulum==1.2.0 --hash={} --hash={}\n'
+        'pytzdata==2017.2 --hash={}\n'
+    ).format(pendulum_hashes[0], pendulum_hashes[1], pytzdata_hashes[0])
+
+    assert expected == content
+
+
+def test_execute_batch_actions(mocker, command):
+    install_batch = mocker.patch('poet.installer.Installer._install_batch')
+    call = mocker.patch('poet.installer.Installer._call')
+    mocker.patch.object(command, 'pip', return_value='pip')
+
+    installer = Installer(command, PyPiRepository(), batch=True)
+    pendulum = PipDependency('pendulum', '1.2.0', checksum=pendulum_hashes)
+    requests = PipDependency('requests', '2.13.0', checksum=[])
+    pytzdata = PipDependency('pytzdata', '2017.2', checksum=pytzdata_hashes)
+
+    actions = installer._execute_batch_actions([
+        ('update', PipDependency('pendulum', '1.1.0'), pendulum),
+        ('install', None, requests),
+        ('remove', None, pytzdata)
+    ])
+
+    install_batch.assert_called_once_with([pendulum])
+    call.assert_called_once_with(
+        ['pip', 'uninstall', '-y', 'pytzdata'],
+        'Error while removing packages'
+    )
+    assert [('install', None, requests)] == actions
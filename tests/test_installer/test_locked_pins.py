@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from poet.installer import Installer
+from poet.repositories import PyPiRepository
+from poet.package import PipDependency
+from poet.resolver import Resolution
+
+
+class DummyLock(object):
+
+    def __init__(self, dependencies, dev_dependencies=None):
+        self.pip_dependencies = dependencies
+        self.pip_dev_dependencies = dev_dependencies or []
+        self.features = {}
+
+
+def locked(name, version, dependencies=None, checksum=None):
+    return PipDependency(
+        name, {'version': version, 'optional': False, 'python': ['*']},
+        checksum=checksum or ['sha256:{}'.format(name)],
+        dependencies=dependencies
+    )
+
+
+lock = DummyLock([
+    locked('pendulum', '1.2.0', ['python-dateutil', 'pytzdata']),
+    locked('python-dateutil', '2.6.0', ['six']),
+    locked('pytzdata', '2017.2'),
+    locked('requests', '2.13.0', ['six']),
+    locked('six', '1.10.0')
+])
+
+
+def test_locked_pins_unchanged(command):
+    installer = Installer(command, PyPiRepository())
+
+    pins, changed = installer._locked_pins([
+        PipDependency('pendulum', '^1.2'),
+        PipDependency('requests', '^2.13')
+    ], lock)
+
+    assert set() == changed
+    assert ['pendulum', 'python-dateutil', 'pytzdata', 'requests', 'six'] == sorted(pins.keys())
+
+
+def test_locked_pins_changed_constraint(command):
+    installer = Installer(command, PyPiRepository())
+
+    pins, changed = installer._locked_pins([
+        PipDependency('pendulum', '^1.3'),
+        PipDependency('requests', '^2.13')
+    ], lock)
+
+    assert set(['pendulum']) == changed
+    # six is shared with python-dateutil so it is resolved again
+    assert ['requests'] == sorted(pins.keys())
+
+
+def test_locked_pins_new_and_removed_dependencies(command):
+    installer = Installer(command, PyPiRepository())
+
+    pins, changed = installer._locked_pins([
+        PipDependency('pendulum', '^1.2'),
+        PipDependency('cleo', '^0.6')
+    ], lock)
+
+    assert set(['cleo']) == changed
+    assert ['pendulum', 'python-dateutil', 'pytzdata', 'six'] == sorted(pins.keys())
+
+
+def test_locked_pins_refresh(command):
+    installer = Installer(command, PyPiRepository())
+
+    pins, changed = installer._locked_pins([
+        PipDependency('pendulum', '^1.2'),
+        PipDependency('requests', '^2.13')
+    ], lock, refresh=['requests'])
+
+    assert set(['requests']) == changed
+    assert ['pendulum', 'python-dateutil', 'pytzdata'] == sorted(pins.keys())
+
+
+def test_resolve_with_pins_reuses_hashes(mocker, command):
+    resolve = mocker.patch('poet.resolver.Resolver.resolve')
+    hashes = mocker.patch('poet.repositories.PyPiRepository.hashes')
+    resolve.return_value = Resolution({'pendulum': '1.2.0', 'requests': '2.14.0'})
+    hashes.return_value = ['sha256:new']
+
+    installer = Installer(command, PyPiRepository())
+    packages = installer._resolve(
+        [PipDependency('pendulum', '^1.2'), PipDependency('requests', '^2.14')],
+        pins={'pendulum': locked('pendulum', '1.2.0', checksum=['sha256:locked'])}
+    )
+
+    assert {'pendulum': '1.2.0'} == resolve.call_args[1]['constraints']
+    hashes.assert_called_once_with('requests', '2.14.0')
+    assert ['sha256:locked'] == packages[0]['checksum']
+    assert ['sha256:new'] == packages[1]['checksum']
+
+
+def test_locked_pins_ignore_propagated_markers(command):
+    installer = Installer(command, PyPiRepository())
+
+    # six is a dev dependency but required by main ones
+    pins, changed = installer._locked_pins([
+        PipDependency('pendulum', '^1.2'),
+        PipDependency('requests', '^2.13'),
+        PipDependency('six', {'version': '^1.10', 'optional': True}, category='dev')
+    ], lock)
+
+    assert set() == changed
+    assert 'six' in pins
+
+
+class DummyRepository(object):
+
+    def __init__(self, packages):
+        self._packages = packages
+
+    def releases(self, name):
+        return dict(
+            (version, [{'requires-python': None}])
+            for version in self._packages.get(name, {})
+        )
+
+    def dependencies(self, name, version):
+        return self._packages[name][version]
+
+    def hashes(self, name, version):
+        return ['sha256:{}-{}'.format(name, version)]
+
+
+def test_resolve_releases_conflicting_pins(command):
+    repository = DummyRepository({
+        'a': {'1.0': ['b'], '2.0': ['b', 'c>=2.0']},
+        'b': {'1.0': ['c<2.0'], '2.0': ['c']},
+        'c': {'1.0': [], '2.0': []}
+    })
+    installer = Installer(command, repository)
+
+    packages = installer._resolve(
+        [PipDependency('a', '^2.0')],
+        pins={'b': locked('b', '1.0', ['c']), 'c': locked('c', '1.0')}
+    )
+
+    assert [('a', '2.0'), ('b', '2.0'), ('c', '2.0')] == [
+        (p['name'], p['version']) for p in packages
+    ]
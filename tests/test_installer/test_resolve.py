@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from pip.req.req_install import InstallRequirement
+import platform
+import sys
+
+from packaging.markers import default_environment
 
 from poet.installer import Installer
 from poet.repositories import PyPiRepository
 from poet.package.pip_dependency import PipDependency
+from poet.resolver import Resolution, ResolutionCache
 
-pendulum_req = InstallRequirement.from_line('pendulum==1.2.0')
-pytzdata_req = InstallRequirement.from_line('pytzdata==2017.2')
-requests_req = InstallRequirement.from_line('requests==2.13.0')
+versions = {'pendulum': '1.2.0', 'pytzdata': '2017.2', 'requests': '2.13.0'}
 
 pendulum_hashes = [
     'sha256:a97e3ed9557ac0c5c3742f21fa4d852d7a050dd9b1b517e993aebef2dd2eea52',
@@ -22,25 +24,28 @@ requests_hashes = [
     'sha256:66f332ae62593b874a648b10a8cb106bfdacd2c6288ed7dec3713c3a808a6017',
     'sha256:b70696ebd1a5e6b627e7e3ac1365a4bc60aaf3495e843c1e70448966c5224cab'
 ]
+hashes = {
+    'pendulum': pendulum_hashes,
+    'pytzdata': pytzdata_hashes,
+    'requests': requests_hashes
+}
+
+
+def mock_resolution(mocker, dependencies):
+    mocker.patch(
+        'poet.resolver.Resolver.resolve',
+        return_value=Resolution(versions, dependencies)
+    )
+    mocker.patch(
+        'poet.repositories.PyPiRepository.hashes',
+        side_effect=lambda name, version: hashes[name]
+    )
 
 
 def test_resolve(mocker, command):
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    resolve.return_value = [
-        pendulum_req,
-        pytzdata_req,
-        requests_req,
-    ]
-    reverse_dependencies.return_value = {
-        'pytzdata': set(['pendulum'])
-    }
-    resolve_hashes.return_value = {
-        pendulum_req: set(pendulum_hashes),
-        requests_req: set(requests_hashes),
-        pytzdata_req: set(pytzdata_hashes),
-    }
+    mock_resolution(mocker, {
+        'pendulum': set(['pytzdata'])
+    })
 
     installer = Installer(command, PyPiRepository())
 
@@ -85,22 +90,9 @@ def test_resolve(mocker, command):
 
 
 def test_resolve_specific_python(mocker, command):
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    resolve.return_value = [
-        pendulum_req,
-        pytzdata_req,
-        requests_req,
-    ]
-    reverse_dependencies.return_value = {
-        'pytzdata': set(['pendulum'])
-    }
-    resolve_hashes.return_value = {
-        pendulum_req: set(pendulum_hashes),
-        requests_req: set(requests_hashes),
-        pytzdata_req: set(pytzdata_hashes),
-    }
+    mock_resolution(mocker, {
+        'pendulum': set(['pytzdata'])
+    })
 
     installer = Installer(command, PyPiRepository())
 
@@ -145,22 +137,9 @@ def test_resolve_specific_python(mocker, command):
 
 
 def test_resolve_specific_python_parent(mocker, command):
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    resolve.return_value = [
-        pendulum_req,
-        pytzdata_req,
-        requests_req,
-    ]
-    reverse_dependencies.return_value = {
-        'pytzdata': set(['pendulum'])
-    }
-    resolve_hashes.return_value = {
-        pendulum_req: set(pendulum_hashes),
-        requests_req: set(requests_hashes),
-        pytzdata_req: set(pytzdata_hashes),
-    }
+    mock_resolution(mocker, {
+        'pendulum': set(['pytzdata'])
+    })
 
     installer = Installer(command, PyPiRepository())
 
@@ -205,22 +184,10 @@ def test_resolve_specific_python_parent(mocker, command):
 
 
 def test_resolve_specific_python_and_wildcard_multiple_parent(mocker, command):
-    resolve = mocker.patch('piptools.resolver.Resolver.resolve')
-    reverse_dependencies = mocker.patch('piptools.resolver.Resolver.reverse_dependencies')
-    resolve_hashes = mocker.patch('piptools.resolver.Resolver.resolve_hashes')
-    resolve.return_value = [
-        pendulum_req,
-        pytzdata_req,
-        requests_req,
-    ]
-    reverse_dependencies.return_value = {
-        'pytzdata': set(['pendulum', 'requests'])
-    }
-    resolve_hashes.return_value = {
-        pendulum_req: set(pendulum_hashes),
-        requests_req: set(requests_hashes),
-        pytzdata_req: set(pytzdata_hashes),
-    }
+    mock_resolution(mocker, {
+        'pendulum': set(['pytzdata']),
+        'requests': set(['pytzdata'])
+    })
 
     installer = Installer(command, PyPiRepository())
 
@@ -262,3 +229,27 @@ def test_resolve_specific_python_and_wildcard_multiple_parent(mocker, command):
     assert ['~2.7'] == pendulum['python']
     assert ['*'] == pytzdata['python']
     assert ['*'] == requests['python']
+
+
+def test_marker_environment_of_target_python(mocker, command):
+    mocker.patch.object(command, 'python', return_value=sys.executable)
+
+    environment = command.marker_environment
+
+    assert platform.python_version() == environment['python_full_version']
+    assert sys.platform == environment['sys_platform']
+
+
+def test_resolve_for_target_python(mocker, command):
+    environment = dict(default_environment(), python_version='2.7')
+    command._marker_environment = environment
+    resolver = mocker.patch('poet.installer.Resolver')
+    resolver.return_value.resolve.return_value = Resolution({'pendulum': '1.2.0'})
+    mocker.patch('poet.repositories.PyPiRepository.hashes', return_value=[])
+    fingerprint = mocker.spy(ResolutionCache, 'fingerprint')
+
+    installer = Installer(command, PyPiRepository())
+    installer._cached_resolve([PipDependency('pendulum', '^1.2')])
+
+    assert environment is resolver.call_args[1]['environment']
+    assert environment is fingerprint.call_args[1]['environment']
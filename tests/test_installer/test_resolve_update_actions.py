@@ -110,3 +110,35 @@ def test_resolve_update_actions_all(command):
         ('remove', None, bar_dependency_321)
     ]
     assert expected == actions
+
+
+def test_resolve_update_actions_unparsable_installed_version(mocker, command):
+    mocker.patch(
+        'poet.repositories.InstalledRepository.packages',
+        new_callable=mocker.PropertyMock,
+        return_value={'foo': 'not a version', 'bar': '3.2.1'}
+    )
+    command._virtual_env = 'site-packages'
+    installer = Installer(command, PyPiRepository())
+
+    actions = installer._resolve_update_actions(
+        [foo_dependency_123, bar_dependency_321],
+        installer._installed_dependencies(),
+        delete=False
+    )
+
+    assert [('update', 'foo')] == [(action, dep.name) for action, _, dep in actions]
+
+
+def test_installed_dependencies_without_virtual_env(mocker, command):
+    call = mocker.patch(
+        'poet.installer.call',
+        return_value='[{"name": "Foo", "version": "1.2.3"}, {"name": "bar", "version": "3.2.1"}]\n'
+    )
+    mocker.patch.object(command, 'pip', return_value='/usr/bin/pip')
+    installer = Installer(command, PyPiRepository())
+
+    installed = installer._installed_dependencies()
+
+    assert [('foo', '1.2.3'), ('bar', '3.2.1')] == [(dep.name, dep.pretty_constraint) for dep in installed]
+    call.assert_called_once_with(['/usr/bin/pip', 'list', '--format=json'])
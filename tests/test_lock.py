@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+from poet.lock import Lock
+
+
+def fixture_lock(tmp_dir):
+    lock_file = os.path.join(tmp_dir, 'poetry.lock')
+    shutil.copy(
+        os.path.join(os.path.dirname(__file__), 'fixtures', 'poetry.lock'),
+        lock_file
+    )
+
+    return lock_file
+
+
+def test_lock_packages(tmp_dir):
+    lock = Lock.read(fixture_lock(tmp_dir))
+
+    assert 'pypoet' == lock.name
+    assert ['pendulum', 'pytest'] == [p.name for p in lock.packages]
+    assert ['pendulum', 'pytest'] == [d.name for d in lock.pip_dependencies]
+    assert [] == lock.pip_dev_dependencies
+    assert '1.2.0' == lock.pip_dependencies[0].constraint
+
+
+def test_lock_builds_dependencies_lazily(tmp_dir, mocker):
+    pip_dependency = mocker.patch('poet.lock.PipDependency')
+    lock = Lock.read(fixture_lock(tmp_dir))
+
+    assert ['1.2.0', '3.0.7'] == [p.version for p in lock.packages]
+    assert 0 == pip_dependency.call_count
+
+    lock.pip_dependencies
+    lock.pip_dependencies
+
+    assert 2 == pip_dependency.call_count
+
+
+def test_lock_is_read_again_when_modified(tmp_dir):
+    lock_file = fixture_lock(tmp_dir)
+    lock = Lock.read(lock_file)
+
+    assert lock is Lock.read(lock_file)
+
+    with open(lock_file) as f:
+        content = f.read()
+
+    with open(lock_file, 'w') as f:
+        f.write(content.replace('3.0.7', '3.1.0'))
+
+    # Making sure the modification time differs
+    stat = os.stat(lock_file)
+    os.utime(lock_file, (stat.st_atime, stat.st_mtime + 1))
+
+    updated = Lock.read(lock_file)
+
+    assert updated is not lock
+    assert '3.1.0' == updated.packages[1].version
+
+    # Returned lists can be modified safely
+    dependencies = updated.pip_dependencies
+    dependencies += updated.pip_dev_dependencies
+    dependencies.append(None)
+
+    assert 2 == len(updated.pip_dependencies)
+
+
+def test_read_locks_are_bounded(tmp_dir):
+    for i in range(Lock._locks.max_size + 4):
+        directory = os.path.join(tmp_dir, str(i))
+        os.mkdir(directory)
+
+        Lock.read(fixture_lock(directory))
+
+    assert Lock._locks.max_size == len(Lock._locks)
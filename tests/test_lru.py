@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from poet.utils.lru import LRUCache
+
+
+def test_get_creates_once():
+    cache = LRUCache(2)
+    calls = []
+
+    def factory(key):
+        calls.append(key)
+
+        return key.upper()
+
+    assert 'A' == cache.get('a', factory)
+    assert 'A' == cache.get('a', factory)
+    assert ['a'] == calls
+    assert 1 == cache.hits
+    assert 1 == cache.misses
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+
+    cache.get('a', str.upper)
+    cache.get('b', str.upper)
+    cache.get('a', str.upper)
+    cache.get('c', str.upper)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+    cache.resize(1)
+
+    assert 1 == len(cache)
+    assert 'c' in cache
+    assert {'hits': 1, 'misses': 3, 'max_size': 1, 'size': 1} == cache.info()
+
+
+def test_failures_are_not_cached():
+    cache = LRUCache(2)
+
+    def factory(key):
+        raise ValueError(key)
+
+    for _ in range(2):
+        try:
+            cache.get('a', factory)
+        except ValueError:
+            pass
+
+    assert 'a' not in cache
+    assert 2 == cache.misses
+
+
+def test_concurrent_access():
+    cache = LRUCache(10)
+    results = []
+
+    def work():
+        for i in range(100):
+            results.append(cache.get(i % 20, lambda k: (k,)))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert 400 == len(results)
+    assert all(r == (r[0],) for r in results)
+    assert 10 == len(cache)
+    assert 400 == cache.hits + cache.misses
+
+
+def test_discard():
+    cache = LRUCache(2)
+
+    cache.get('a', str.upper)
+    cache.discard('a')
+    cache.discard('b')
+
+    assert 'a' not in cache
+    assert 0 == len(cache)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet.poet import Poet
+from poet.utils.readme_cache import ReadmeCache, pandoc_fingerprint
+
+
+def test_get_and_put(tmp_dir):
+    cache = ReadmeCache(tmp_dir)
+
+    assert cache.get(b'# Title\n', '1.19') is None
+
+    cache.put(b'# Title\n', '1.19', u'Title\n=====\n\nÉté\r\n')
+
+    assert u'Title\n=====\n\nÉté\r\n' == cache.get(b'# Title\n', '1.19')
+    assert cache.get(b'# Title\n', '2.0') is None
+    assert cache.get(b'# Other title\n', '1.19') is None
+
+
+def test_markdown_readme_is_converted_lazily_and_once(tmp_dir, mocker):
+    with open(os.path.join(tmp_dir, 'poetry.toml'), 'w') as f:
+        f.write("""[package]
+name = "markdown"
+version = "0.1.0"
+description = "Markdown README"
+authors = ["John Doe <john@doe.com>"]
+readme = "README.md"
+python = ["^3.5"]
+""")
+
+    with open(os.path.join(tmp_dir, 'README.md'), 'w') as f:
+        f.write('# Markdown\n')
+
+    pandoc = os.path.join(tmp_dir, 'pandoc')
+    with open(pandoc, 'w') as f:
+        f.write('')
+
+    mocker.patch.dict(os.environ, {'PYPANDOC_PANDOC': pandoc})
+    pypandoc = mocker.patch('poet.poet.pypandoc')
+    pypandoc.convert_file.return_value = u'Markdown\n========\n'
+
+    poet = Poet(os.path.join(tmp_dir, 'poetry.toml'))
+
+    assert not pypandoc.convert_file.called
+
+    assert u'Markdown\n========\n' == poet.readme
+    assert u'Markdown\n========\n' == poet.readme
+    assert 1 == pypandoc.convert_file.call_count
+
+    # The conversion is reused by the next runs
+    poet = Poet(os.path.join(tmp_dir, 'poetry.toml'))
+
+    assert u'Markdown\n========\n' == poet.readme
+    assert 1 == pypandoc.convert_file.call_count
+
+    with open(os.path.join(tmp_dir, 'README.md'), 'w') as f:
+        f.write('# Changed\n')
+
+    pypandoc.convert_file.return_value = u'Changed\n=======\n'
+    poet = Poet(os.path.join(tmp_dir, 'poetry.toml'))
+
+    assert u'Changed\n=======\n' == poet.readme
+    assert 2 == pypandoc.convert_file.call_count
+
+    # Another pandoc converts it again
+    with open(pandoc, 'w') as f:
+        f.write('#!/bin/sh\n')
+
+    poet = Poet(os.path.join(tmp_dir, 'poetry.toml'))
+
+    assert u'Changed\n=======\n' == poet.readme
+    assert 3 == pypandoc.convert_file.call_count
+
+    # Finding the version would run pandoc
+    assert not pypandoc.get_pandoc_version.called
+
+
+def test_pandoc_fingerprint(tmp_dir, mocker):
+    mocker.patch.dict(os.environ, {'PYPANDOC_PANDOC': ''})
+    mocker.patch('poet.utils.readme_cache.which', return_value=None)
+
+    assert pandoc_fingerprint() is None
+
+    pandoc = os.path.join(tmp_dir, 'pandoc')
+    with open(pandoc, 'w') as f:
+        f.write('pandoc')
+
+    mocker.patch('poet.utils.readme_cache.which', return_value=pandoc)
+    fingerprint = pandoc_fingerprint()
+
+    assert fingerprint.startswith(os.path.realpath(pandoc) + ':')
+    assert fingerprint.endswith(':6')
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from poet.utils import transport
+
+
+def test_session_is_shared():
+    session = transport.session()
+
+    assert session is transport.session()
+    assert transport.adapter() is session.get_adapter('https://pypi.python.org')
+
+
+def test_configure_creates_new_session():
+    session = transport.session()
+    pool_size = transport.POOL_SIZE
+    timeout = transport.TIMEOUT
+
+    try:
+        transport.configure(pool_size=2, timeout=5)
+
+        assert session is not transport.session()
+        assert 5 == transport.session().timeout
+        assert 2 == transport.adapter()._pool_maxsize
+    finally:
+        transport.configure(pool_size=pool_size, timeout=timeout)
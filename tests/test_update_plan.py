@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from poet.package import PipDependency
+from poet.update_plan import UpdatePlan
+
+
+def test_plan_orders_actions_by_dependencies():
+    current_deps = [
+        PipDependency('pendulum', '1.2.0', dependencies=['pytzdata']),
+        PipDependency('pytzdata', '2017.2'),
+        PipDependency('requests', '2.13.0', dependencies=['idna']),
+        PipDependency('idna', '2.5'),
+    ]
+    deps = [
+        PipDependency('pendulum', '1.3.0', dependencies=['pytzdata', 'python-dateutil']),
+        PipDependency('python-dateutil', '2.6.0', dependencies=['six']),
+        PipDependency('pytzdata', '2017.3'),
+        PipDependency('six', '1.11.0'),
+    ]
+
+    plan = UpdatePlan.compute(deps, current_deps)
+
+    assert [
+        ('update', 'pytzdata'),
+        ('install', 'six'),
+        ('install', 'python-dateutil'),
+        ('update', 'pendulum'),
+        ('remove', 'requests'),
+        ('remove', 'idna'),
+    ] == [(action, dep.name) for action, _, dep in plan]
+    assert 2 == plan.count(UpdatePlan.UPDATE)
+
+
+def test_plan_handles_cycles():
+    deps = [
+        PipDependency('a', '1.0', dependencies=['b']),
+        PipDependency('b', '1.0', dependencies=['a']),
+        PipDependency('c', '1.0'),
+    ]
+
+    plan = UpdatePlan.compute(deps, [])
+
+    assert ['c', 'a', 'b'] == [dep.name for _, _, dep in plan]
+
+
+def test_plan_can_be_dumped_and_loaded(tmp_dir):
+    path = os.path.join(tmp_dir, 'plan.json')
+    plan = UpdatePlan.compute(
+        [
+            PipDependency('pendulum', '1.3.0', checksum=['sha256:abcdef']),
+            PipDependency('foo', {'git': 'https://github.com/foo/foo.git', 'rev': '123456'})
+        ],
+        [PipDependency('pendulum', '1.2.0')],
+        packages=[{'name': 'pendulum', 'version': '1.3.0'}],
+        features={},
+        lock_hash='0123'
+    )
+
+    plan.dump(path)
+    loaded = UpdatePlan.load(path)
+
+    assert [('update', '1.2.0', 'pendulum', '1.3.0'), ('install', None, 'foo', None)] == [
+        (
+            action,
+            from_.constraint if from_ else None,
+            dep.name,
+            None if dep.is_vcs_dependency() else dep.constraint
+        )
+        for action, from_, dep in loaded
+    ]
+    assert ['sha256:abcdef'] == loaded.actions[0][2].checksum
+    assert 'rev 123456' == loaded.actions[1][2].pretty_constraint
+    assert plan.packages == loaded.packages
+    assert '0123' == loaded.lock_hash
+
+
+def test_plan_compares_exact_versions():
+    current_deps = [
+        PipDependency('typing-extensions', '3.7.4.2'),
+        PipDependency('foo', '1.0'),
+        PipDependency('bar', '1.0'),
+    ]
+    deps = [
+        PipDependency('typing-extensions', '3.7.4.3'),
+        PipDependency('foo', '1.0.post1'),
+        PipDependency('bar', '1.0.0'),
+    ]
+
+    plan = UpdatePlan.compute(deps, current_deps)
+
+    assert [
+        ('update', 'typing-extensions'),
+        ('update', 'foo'),
+    ] == [(action, dep.name) for action, _, dep in plan]
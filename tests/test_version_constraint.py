@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from semantic_version import Version
+
+from poet.version_parser import VersionParser
+
+
+def test_constraints_are_compiled_once():
+    assert VersionParser.parse_constraint('^1.2') is VersionParser.parse_constraint('^1.2')
+
+
+def test_contains():
+    constraint = VersionParser.parse_constraint('~2.7,!=2.7.6,>=2.7.5')
+
+    assert constraint.contains(Version('2.7.5'))
+    assert constraint.contains(Version('2.7.12'))
+    assert not constraint.contains(Version('2.7.4'))
+    assert not constraint.contains(Version('2.7.6'))
+    assert not constraint.contains(Version('2.8.0'))
+
+    assert [Version('1.2.0'), Version('1.9.9')] == list(
+        VersionParser.parse_constraint('^1.2').filter([
+            Version('1.1.0'), Version('1.2.0'), Version('1.9.9'),
+            Version('2.0.0-b1'), Version('2.0.0')
+        ])
+    )
+
+
+def test_intersect():
+    constraint = VersionParser.parse_constraint('^1.2').intersect(
+        VersionParser.parse_constraint('<1.5')
+    )
+
+    assert '>=1.2.0,<2.0.0,<1.5.0' == constraint.to_pep440()
+    assert (Version('1.5.0'), False) == constraint.upper
+    assert not constraint.is_empty()
+    assert VersionParser.parse_constraint('<1').intersect(
+        VersionParser.parse_constraint('>=1')
+    ).is_empty()
+
+
+def test_to_pep440():
+    assert '>=1.2.0b1,<2.0.0' == VersionParser.parse_constraint('^1.2.0-b1').to_pep440()
+    assert '~=1.2' == VersionParser.parse_constraint('~=1.2').to_pep440()
+    assert '~=1.0' == VersionParser.parse_constraint('~=1').to_pep440()
+    assert '~=1.2.3' == VersionParser.parse_constraint('~=1.2.3').to_pep440()
+    assert '' == VersionParser.parse_constraint('*').to_pep440()
+    assert VersionParser.parse_constraint('^1.2.0-b1').accepts_prereleases()
+
+
+def test_compatible_release():
+    constraint = VersionParser.parse_constraint('~=1.4')
+
+    assert constraint.contains(Version('1.4.0'))
+    assert constraint.contains(Version('1.9.0'))
+    assert not constraint.contains(Version('2.0.0'))
+    assert not constraint.contains(Version('1.3.0'))
+
+    constraint = VersionParser.parse_constraint('~=1.4.2')
+
+    assert constraint.contains(Version('1.4.5'))
+    assert not constraint.contains(Version('1.5.0'))
@@ -14,3 +14,29 @@ def test_parse_constraints():
 def test_parse_stability():
     assert 'stable' == VersionParser.parse_stability('1.2.3')
     assert 'dev' == VersionParser.parse_stability('1.2.3b1')
+
+
+def test_parsed_objects_are_cached():
+    parser = VersionParser()
+    parser.clear_cache()
+
+    assert parser.parse_constraints('>=1.2.3,<2') is parser.parse_constraints('>=1.2.3, <2')
+    assert VersionParser.parse_spec('^1.2') is VersionParser.parse_spec('^1.2')
+    assert Spec('1.2') == VersionParser.parse_spec('1.2')
+    assert VersionParser.coerce_version('1.2') is VersionParser.coerce_version('1.2')
+
+    info = VersionParser.cache_info()
+    assert 1 == info['constraints']['hits']
+    assert 1 == info['constraints']['misses']
+
+
+def test_cache_size_is_configurable():
+    try:
+        VersionParser.set_cache_size(2)
+
+        for version in ['1.0', '1.1', '1.2']:
+            VersionParser.coerce_version(version)
+
+        assert 2 == VersionParser.cache_info()['versions']['size']
+    finally:
+        VersionParser.set_cache_size(VersionParser.DEFAULT_CACHE_SIZE)